@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Capture Queue Benchmark
+Runs a queue of books captured with the replay backend and compares the time it
+took with the time capture and processing would have taken back to back: every
+book but the last one is processed while the next one is captured
+
+Usage: python benchmarks/bench_capture_queue.py [--books 4] [--spreads 10] [--jobs 1]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', 'src'))
+
+import capture_queue
+import synthetic
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Capture queue: processing overlapped with capture")
+    parser.add_argument('--books', type=int, default=4)
+    parser.add_argument('--spreads', type=int, default=10, help="spreads per book")
+    parser.add_argument('--jobs', type=int, default=1, help="books processed at the same time")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Frame folders are written under ~/Documents, keep them in the temporary folder
+        os.environ['HOME'] = tmp
+        replay_dir = os.path.join(tmp, 'replay')
+        os.makedirs(replay_dir)
+        for i in range(args.spreads):
+            synthetic.make_screenshot(seed=i).save(os.path.join(replay_dir, f"pages_{2 * i + 1:03d}-{2 * i + 2:03d}.png"))
+
+        queue_path = os.path.join(tmp, 'books.json')
+        with open(queue_path, 'w') as f:
+            json.dump([{'title': f"Book {n}", 'pages': args.spreads * 2, 'output': os.path.join(tmp, 'pdf'),
+                        'split': True, 'compact': True} for n in range(1, args.books + 1)], f)
+
+        books = capture_queue.load_books(queue_path)
+        state = capture_queue.QueueState(capture_queue.state_path(queue_path))
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            done = capture_queue.run_queue(books, state, os.path.join(tmp, 'screenshots'), 'replay',
+                                           replay_dir, args.jobs, start_delay=0)
+        elapsed = time.perf_counter() - start
+
+    entries = [state.get(book['title']) for book in books]
+    capture_seconds = sum(entry['capture_seconds'] for entry in entries)
+    process_seconds = sum(entry.get('process_seconds', 0) for entry in entries)
+    print(f"📚 {args.books} books of {args.spreads} spreads, {done} done")
+    print(f"   capture {capture_seconds:.1f}s + processing {process_seconds:.1f}s "
+          f"= {capture_seconds + process_seconds:.1f}s back to back")
+    print(f"   queue:  {elapsed:.1f}s ({capture_seconds + process_seconds - elapsed:.1f}s of processing "
+          f"hidden behind capture)")
+
+
+if __name__ == "__main__":
+    main()
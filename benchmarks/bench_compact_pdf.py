@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Compact PDF Benchmark
+Output size and encode time per page class: the default RGB JPEG encoding
+against the compact per-page encoding, on synthetic text, gray and color pages
+
+Usage: python benchmarks/bench_compact_pdf.py [--pages 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', 'src'))
+
+import synthetic
+from pdf_writer import classify_page, encode_page
+
+
+def measure(pages, compact):
+    """Total encoded bytes and seconds per page for a list of images"""
+    start = time.perf_counter()
+    size = sum(len(encode_page(page, compact).data) for page in pages)
+    return size, (time.perf_counter() - start) / len(pages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact PDF page encoding")
+    parser.add_argument('--pages', type=int, default=5)
+    args = parser.parse_args()
+
+    samples = {
+        'text': [synthetic.make_frame(seed=i) for i in range(args.pages)],
+        'gray photo': [synthetic.make_photo_frame(seed=i, color=False) for i in range(args.pages)],
+        'color photo': [synthetic.make_photo_frame(seed=i) for i in range(args.pages)],
+    }
+
+    width, height = synthetic.FRAME_SIZE
+    print(f"📄 {args.pages} pages of {width}x{height} per class")
+    for name, pages in samples.items():
+        start = time.perf_counter()
+        kinds = {classify_page(page) for page in pages}
+        classify_ms = 1000 * (time.perf_counter() - start) / len(pages)
+
+        plain_size, plain_time = measure(pages, compact=False)
+        compact_size, compact_time = measure(pages, compact=True)
+        print(f"{name:>12}: classified as {', '.join(sorted(kinds))} in {classify_ms:.1f} ms/page | "
+              f"RGB JPEG {plain_size / len(pages) / 1024:.0f} KB/page, {1000 * plain_time:.0f} ms | "
+              f"compact {compact_size / len(pages) / 1024:.0f} KB/page, {1000 * compact_time:.0f} ms "
+              f"({plain_size / compact_size:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
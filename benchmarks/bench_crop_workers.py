@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Crop Throughput Benchmark
+Shows how process_screenshots' cropping scales from 1 to N worker processes
+on a folder of synthetic 2880x1800 screenshots
+
+Usage: python benchmarks/bench_crop_workers.py [--images 48] [--max-workers N]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', 'src'))
+
+import process
+import synthetic
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crop throughput for 1..N workers")
+    parser.add_argument('--images', type=int, default=48)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"🖼️  Generating {args.images} synthetic screenshots...")
+        image_files = synthetic.write_screenshots(os.path.join(tmp, 'book'), args.images)
+
+        print(f"{'workers':>8} {'time s':>8} {'img/s':>8} {'speedup':>8}")
+        # 1, 2, 4, ... plus the maximum itself
+        counts = sorted({2 ** i for i in range(args.max_workers.bit_length())} | {args.max_workers})
+
+        baseline = None
+        for workers in counts:
+            output_dir = os.path.join(tmp, f"out_{workers}")
+            os.makedirs(output_dir)
+
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = list(process.crop_images(image_files, synthetic.FRAME_BOX, output_dir, workers))
+            elapsed = time.perf_counter() - start
+
+            failed = sum(1 for _, frame_files, _, _ in results if not frame_files)
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>8.2f} {args.images / elapsed:>8.1f} {baseline / elapsed:>7.2f}x"
+                  + (f"  ({failed} failed)" if failed else ""))
+
+
+if __name__ == "__main__":
+    main()
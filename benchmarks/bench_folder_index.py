@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Folder Index Benchmark
+Creates many small book folders and times listing them: the old listdir + isdir
+scan, building the folder index from scratch, and refreshing it when nothing or
+one folder changed
+Also checks that screenshots past page 999 are listed in page order
+
+Usage: python benchmarks/bench_folder_index.py [--books 300] [--screenshots 20]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from PIL import Image
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', 'src'))
+
+from folder_index import FolderIndex
+from raw_store import list_screenshots
+
+
+def old_listing(base_dir):
+    """How find_screenshot_folders used to list the folders"""
+    folders = []
+    for item in os.listdir(base_dir):
+        if os.path.isdir(os.path.join(base_dir, item)) and item.startswith('book_'):
+            folders.append(item)
+    return sorted(folders)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, 1000 * (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Folder index vs listing every folder")
+    parser.add_argument('--books', type=int, default=300)
+    parser.add_argument('--screenshots', type=int, default=20, help="screenshots per book")
+    args = parser.parse_args()
+
+    # Tiny screenshots: the listing cost doesn't depend on the image size
+    screenshot = Image.new('RGB', (64, 40), (200, 200, 200))
+    with tempfile.TemporaryDirectory() as base_dir:
+        for book in range(args.books):
+            folder_path = os.path.join(base_dir, f"book_20250101_{book:06d}")
+            os.makedirs(folder_path)
+            for i in range(args.screenshots):
+                screenshot.save(os.path.join(folder_path, f"pages_{2 * i + 1:03d}-{2 * i + 2:03d}.png"))
+
+        _, old_ms = timed(lambda: old_listing(base_dir))
+        folders, cold_ms = timed(lambda: FolderIndex(base_dir).refresh())
+        _, warm_ms = timed(lambda: FolderIndex(base_dir).refresh())
+
+        changed_path = os.path.join(base_dir, f"book_20250101_{args.books // 2:06d}", "pages_999-1000.png")
+        screenshot.save(changed_path)
+        folders, one_changed_ms = timed(lambda: FolderIndex(base_dir).refresh())
+
+        # Page order past 999, where the zero-padded names stop sorting as text
+        long_book = os.path.join(base_dir, "long_book")
+        os.makedirs(long_book)
+        for first in (997, 999, 1001, 1003):
+            screenshot.save(os.path.join(long_book, f"pages_{first:03d}-{first + 1:03d}.png"))
+        order = [os.path.basename(path) for path in list_screenshots(long_book)]
+
+    print(f"📚 {args.books} books of {args.screenshots} screenshots")
+    print(f"   old listing (names only)      {old_ms:>8.1f} ms")
+    print(f"   index, first build            {cold_ms:>8.1f} ms")
+    print(f"   index, nothing changed        {warm_ms:>8.1f} ms")
+    print(f"   index, one folder changed     {one_changed_ms:>8.1f} ms")
+    changed = next(folder for folder in folders if folder['last_page'] == 1000)
+    print(f"   changed folder: {changed['images']} screenshots, pages "
+          f"{changed['first_page']}-{changed['last_page']}")
+
+    if order != ["pages_997-998.png", "pages_999-1000.png", "pages_1001-1002.png", "pages_1003-1004.png"]:
+        print(f"❌ Screenshots out of page order: {order}")
+        sys.exit(1)
+    print("✅ Screenshots past page 999 listed in page order")
+
+
+if __name__ == "__main__":
+    main()
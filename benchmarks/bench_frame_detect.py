@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Frame Detection Benchmark
+Generates synthetic screenshots with known frame positions at several resolutions,
+then reports detection time per screenshot and the largest edge error in pixels,
+for a full detection and for detect_frame_near given a box a few pixels off
+The accuracy itself is checked by tests/test_frame_detect.py
+
+Usage: python benchmarks/bench_frame_detect.py [--per-size 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', 'src'))
+
+import synthetic
+from frame_detect import detect_frame, detect_frame_near, consensus_frame
+
+SIZES = [(1920, 1080), (2560, 1600), (2880, 1800), (3840, 2160), (5120, 2880)]
+
+
+def random_frame_box(size, rng):
+    """Random frame position with a navigation panel on the left and chrome on top"""
+    width, height = size
+    left = rng.randint(width // 20, width // 6)
+    top = rng.randint(height // 40, height // 12)
+    right = width - rng.randint(width // 60, width // 15)
+    bottom = height - rng.randint(height // 40, height // 8)
+    return left, top, right, bottom
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Speed and accuracy of frame detection")
+    parser.add_argument('--per-size', type=int, default=5, help="screenshots per resolution")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    print(f"{'resolution':>11} {'ms/img':>8} {'max err px':>11} {'consensus err':>14} "
+          f"{'near ms':>8} {'near err':>9}")
+    for size in SIZES:
+        box = random_frame_box(size, rng)
+        elapsed = near_elapsed = 0.0
+        max_error = near_error = 0
+        boxes = []
+
+        for i in range(args.per_size):
+            img = synthetic.make_screenshot(size, box, seed=rng.randint(0, 10 ** 6))
+            start = time.perf_counter()
+            detected = detect_frame(img)
+            elapsed += time.perf_counter() - start
+
+            boxes.append(detected)
+            error = max(abs(a - b) for a, b in zip(detected, box)) if detected else max(size)
+            max_error = max(max_error, error)
+
+            # The previous page's frame, slightly off as after a small window move
+            expected = tuple(value + rng.randint(-4, 4) for value in box)
+            start = time.perf_counter()
+            near = detect_frame_near(img, expected)
+            near_elapsed += time.perf_counter() - start
+            error = max(abs(a - b) for a, b in zip(near, box)) if near else max(size)
+            near_error = max(near_error, error)
+
+        agreed = consensus_frame(boxes)
+        consensus_error = max(abs(a - b) for a, b in zip(agreed, box)) if agreed else max(size)
+        print(f"{size[0]:>5}x{size[1]:<5} {1000 * elapsed / args.per_size:>8.1f} "
+              f"{max_error:>11} {consensus_error:>14} "
+              f"{1000 * near_elapsed / args.per_size:>8.1f} {near_error:>9}")
+
+
+if __name__ == "__main__":
+    main()
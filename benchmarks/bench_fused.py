@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Fused vs Two-Pass Benchmark
+Compares wall time and bytes written for:
+  two-pass: crop to *_frame.png files, then read them back into the PDF
+  fused:    crop straight into the PDF writer, optionally keeping the frame PNGs
+
+Usage: python benchmarks/bench_fused.py [--images 40] [--workers N]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', 'src'))
+
+import process
+import synthetic
+from pdf_writer import PdfWriter
+
+
+def folder_size(path):
+    """Total size of all files directly inside path"""
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+def run_two_pass(image_files, output_dir, workers):
+    results = list(process.crop_images(image_files, synthetic.FRAME_BOX, output_dir, workers))
+    cropped_files = [os.path.join(output_dir, frame_file)
+                     for _, frame_files, _, _ in results for frame_file in frame_files or []]
+    process.create_pdf_from_images(cropped_files, os.path.join(output_dir, 'book.pdf'), "Benchmark")
+
+
+def run_fused(image_files, output_dir, workers, save_frames):
+    with PdfWriter(os.path.join(output_dir, 'book.pdf'), title="Benchmark") as writer:
+        for _, _, pages, _ in process.crop_images(image_files, synthetic.FRAME_BOX, output_dir, workers,
+                                               save_frames=save_frames, encode=True):
+            for page in pages or []:
+                writer.add_encoded_page(page)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fused crop→PDF vs two-pass pipeline")
+    parser.add_argument('--images', type=int, default=40)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    modes = [
+        ("two-pass", lambda files, out: run_two_pass(files, out, args.workers)),
+        ("fused+frames", lambda files, out: run_fused(files, out, args.workers, True)),
+        ("fused", lambda files, out: run_fused(files, out, args.workers, False)),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"🖼️  Generating {args.images} synthetic screenshots...")
+        image_files = synthetic.write_screenshots(os.path.join(tmp, 'book'), args.images)
+
+        print(f"{'mode':>13} {'time s':>8} {'img/s':>8} {'written MB':>11}")
+        for name, run in modes:
+            output_dir = os.path.join(tmp, name)
+            os.makedirs(output_dir)
+
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                run(image_files, output_dir)
+            elapsed = time.perf_counter() - start
+
+            written = folder_size(output_dir) / (1024 * 1024)
+            print(f"{name:>13} {elapsed:>8.2f} {args.images / elapsed:>8.1f} {written:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
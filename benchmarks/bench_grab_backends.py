@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Grab Latency Benchmark
+Measures screenshot latency per backend (replay always, mss when installed and a
+display is available) and the cost of looking up the window bounds on every
+grab versus once with the cached WindowLocator
+
+Usage: python benchmarks/bench_grab_backends.py [--grabs 30] [--lookup-cost 0.15]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', 'src'))
+
+import synthetic
+from backends import MssBackend, ReplayBackend, WindowCapture, WindowLocator
+
+REGION = (200, 100, 1600, 1000)
+
+
+def time_grabs(backend, grabs, region=None):
+    """Average milliseconds per grab, pressing 'right' between grabs when the backend can"""
+    press = getattr(backend, 'press', None)
+    start = time.perf_counter()
+    for _ in range(grabs):
+        backend.grab(region)
+        if press:
+            press('right')
+    return 1000 * (time.perf_counter() - start) / grabs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Screen grab latency per backend")
+    parser.add_argument('--grabs', type=int, default=30)
+    parser.add_argument('--lookup-cost', type=float, default=0.15,
+                        help="simulated window lookup time in seconds (osascript takes 0.1-0.3)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic.write_screenshots(tmp, 10)
+        backends = [("replay", lambda: ReplayBackend(tmp))]
+        backends.append(("mss", MssBackend))
+
+        print(f"{'backend':>9} {'full ms':>8} {'region ms':>10}")
+        for name, factory in backends:
+            try:
+                results = []
+                for region in (None, REGION):
+                    backend = factory()
+                    results.append(time_grabs(backend, args.grabs, region))
+                    backend.close()
+                full, region = results
+            except Exception as e:
+                print(f"{name:>9}  skipped ({e.__class__.__name__}: {e})")
+                continue
+            print(f"{name:>9} {full:>8.1f} {region:>10.1f}")
+
+        # Window bounds lookup: on every grab (old behaviour) vs cached
+        def slow_lookup():
+            time.sleep(args.lookup_cost)
+            return REGION
+
+        print(f"\n{'lookup':>9} {'ms/grab':>8} {'lookups':>8}")
+        for name, recheck in (("per grab", 1), ("cached", 50)):
+            locator = WindowLocator(system='Darwin', resolver=slow_lookup, recheck_grabs=recheck)
+            window_capture = WindowCapture(ReplayBackend(tmp), locator)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(args.grabs):
+                    window_capture.grab()
+            per_grab = 1000 * (time.perf_counter() - start) / args.grabs
+            print(f"{name:>9} {per_grab:>8.1f} {locator.lookups:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Instrumentation Overhead Benchmark
+Cost of recording one stage event, to check tracing is cheap enough to leave on
+(a page goes through about 10 stages that each take milliseconds or more)
+
+Usage: python benchmarks/bench_instrument.py [--events 200000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', 'src'))
+
+from instrument import Tracer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of stage tracing")
+    parser.add_argument('--events', type=int, default=200000)
+    args = parser.parse_args()
+
+    for name, tracer in (("disabled", Tracer(enabled=False)), ("enabled", Tracer())):
+        start = time.perf_counter()
+        for _ in range(args.events):
+            with tracer.stage('crop'):
+                pass
+        stage_us = 1e6 * (time.perf_counter() - start) / args.events
+
+        start = time.perf_counter()
+        for _ in range(args.events):
+            tracer.record('save', 0.1, 1000)
+        record_us = 1e6 * (time.perf_counter() - start) / args.events
+
+        start = time.perf_counter()
+        tracer.summary()
+        summary_ms = 1000 * (time.perf_counter() - start)
+        print(f"{name:>9}: stage() {stage_us:.2f} µs, record() {record_us:.2f} µs per event, "
+              f"summary of {len(tracer.events)} events {summary_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Page Hash Benchmark
+1. Time of the perceptual hash per screenshot at several resolutions (budget: 20 ms)
+2. A headless capture run with a fake screen that sometimes lags behind the
+   key press, checking that no duplicate spread is saved
+
+Usage: python benchmarks/bench_page_hash.py [--pages 20] [--lag 0.3]
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', 'src'))
+
+import capture
+import synthetic
+from PIL import Image
+from pagehash import dhash, hamming
+
+SIZES = [(1920, 1080), (2880, 1800), (5120, 2880)]
+
+
+class LaggingScreen:
+    """Fake screen: after a key press the old spread stays visible for a random number of grabs"""
+
+    def __init__(self, pages, lag, seed=0):
+        self.pages = pages
+        self.lag = lag
+        self.rng = random.Random(seed)
+        self.current = 0
+        self.stale_grabs = 0
+
+    def press(self, key):
+        self.current = min(self.current + 1, len(self.pages) - 1)
+        self.stale_grabs = 0
+        while self.rng.random() < self.lag:
+            self.stale_grabs += 1
+
+    def grab(self):
+        if self.stale_grabs:
+            self.stale_grabs -= 1
+            return self.pages[self.current - 1]
+        return self.pages[self.current]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Page hash speed and duplicate detection")
+    parser.add_argument('--pages', type=int, default=20, help="spreads in the fake book")
+    parser.add_argument('--lag', type=float, default=0.3, help="chance the screen lags one more grab")
+    args = parser.parse_args()
+
+    print(f"{'resolution':>11} {'ms/hash':>8}")
+    for size in SIZES:
+        img = synthetic.make_screenshot(size, synthetic.scaled_frame_box(size))
+        start = time.perf_counter()
+        for _ in range(10):
+            dhash(img)
+        print(f"{size[0]:>5}x{size[1]:<5} {100 * (time.perf_counter() - start):>8.1f}")
+
+    pages = [synthetic.make_screenshot(seed=i) for i in range(args.pages)]
+    screen = LaggingScreen(pages, args.lag)
+    iterations = len(pages)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            captured = capture.capture_pages(tmp, iterations * 2, iterations, grab=screen.grab,
+                                             press_key=screen.press, sleep=lambda seconds: None,
+                                             adaptive=False)
+
+        saved = sorted(glob.glob(os.path.join(tmp, "*.png")))
+        hashes = []
+        for path in saved:
+            with Image.open(path) as img:
+                hashes.append(dhash(img))
+        duplicates = sum(1 for a, b in zip(hashes, hashes[1:]) if hamming(a, b) <= capture.DUPLICATE_THRESHOLD)
+
+    print(f"\n📸 Fake capture: {captured}/{iterations} spreads saved, {duplicates} consecutive duplicates")
+    if duplicates:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+PDF Checkpoint Benchmark
+Writes a large book of small pages with and without checkpoints and compares the
+time and file size they cost, then cuts the checkpointed file off at random points
+(as a killed run would) and checks that each cut leaves the pages up to the last
+checkpoint readable and appendable
+
+Usage: python benchmarks/bench_pdf_checkpoint.py [--pages 1000] [--every 20] [--cuts 20]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', 'src'))
+
+import synthetic
+from pdf_writer import PdfWriter, encode_page
+
+
+def write_book(path, page, pages, every):
+    """Write the same encoded page `pages` times; returns (seconds, end offset of every checkpoint)"""
+    ends = []
+    start = time.perf_counter()
+    with PdfWriter(path, title="Benchmark", checkpoint_pages=every) as writer:
+        for _ in range(pages):
+            checkpoints = writer.checkpoints
+            writer.add_encoded_page(page)
+            if writer.checkpoints > checkpoints:
+                ends.append((writer.bytes_written, writer.total_pages))
+    return time.perf_counter() - start, ends
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of PDF checkpoints and recovery after a cut")
+    parser.add_argument('--pages', type=int, default=1000)
+    parser.add_argument('--every', type=int, default=20, help="pages between checkpoints")
+    parser.add_argument('--cuts', type=int, default=20, help="random cuts to recover from")
+    args = parser.parse_args()
+
+    # A small page keeps the benchmark about the PDF structure rather than disk speed
+    page = encode_page(synthetic.make_screenshot(seed=1).resize((640, 400)))
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plain_path = os.path.join(tmp, 'plain.pdf')
+        checkpoint_path = os.path.join(tmp, 'checkpoints.pdf')
+        plain_seconds, _ = write_book(plain_path, page, args.pages, None)
+        checkpoint_seconds, ends = write_book(checkpoint_path, page, args.pages, args.every)
+        plain_size = os.path.getsize(plain_path)
+        checkpoint_size = os.path.getsize(checkpoint_path)
+
+        failures = 0
+        cut_path = os.path.join(tmp, 'cut.pdf')
+        for _ in range(args.cuts):
+            cut = rng.randrange(ends[0][0], checkpoint_size)
+            expected = max(count for end, count in ends if end <= cut)
+            shutil.copyfile(checkpoint_path, cut_path)
+            with open(cut_path, 'r+b') as f:
+                f.truncate(cut)
+            with PdfWriter(cut_path, append=True) as writer:
+                recovered = writer.existing_pages
+                writer.add_encoded_page(page)
+            with PdfWriter(cut_path, append=True) as writer:
+                appended = writer.existing_pages
+            if recovered != expected or appended != expected + 1:
+                failures += 1
+                print(f"❌ Cut at byte {cut}: recovered {recovered} pages, expected {expected}")
+
+    print(f"📄 {args.pages} pages of {len(page.data) / 1024:.0f} KB")
+    print(f"   no checkpoints:          {plain_seconds:>6.2f}s  {plain_size / 1e6:>8.2f} MB")
+    print(f"   checkpoint every {args.every:<4d}    {checkpoint_seconds:>6.2f}s  {checkpoint_size / 1e6:>8.2f} MB "
+          f"(+{(checkpoint_size - plain_size) / 1024:.0f} KB for {len(ends)} checkpoints)")
+    if failures:
+        sys.exit(1)
+    print(f"✅ {args.cuts} random cuts recovered to their last checkpoint and appended to")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+PDF Memory Benchmark
+Measures peak RSS of create_pdf_from_images for a growing number of synthetic pages
+Each run happens in a fresh subprocess so the peaks don't influence each other
+
+Usage: python benchmarks/bench_pdf_memory.py [--pages 50 500 2000] [--width W --height H]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', 'src'))
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_single(pages, width, height):
+    """Build one PDF and print 'seconds peak_mb size_mb' for the parent process"""
+    import process
+    import synthetic
+
+    with tempfile.TemporaryDirectory() as tmp:
+        image_files = synthetic.write_frames(os.path.join(tmp, 'frames'), pages, (width, height))
+        baseline = peak_rss_mb()
+
+        pdf_path = os.path.join(tmp, 'book.pdf')
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ok = process.create_pdf_from_images(image_files, pdf_path, "Benchmark")
+        elapsed = time.perf_counter() - start
+
+        if not ok:
+            sys.exit(1)
+        size_mb = os.path.getsize(pdf_path) / (1024 * 1024)
+        print(f"{elapsed:.2f} {baseline:.1f} {peak_rss_mb():.1f} {size_mb:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of streaming PDF creation")
+    parser.add_argument('--pages', type=int, nargs='+', default=[50, 500, 2000])
+    parser.add_argument('--width', type=int, default=2570)
+    parser.add_argument('--height', type=int, default=1612)
+    parser.add_argument('--single', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        run_single(args.pages[0], args.width, args.height)
+        return
+
+    print(f"📊 PDF memory benchmark ({args.width}x{args.height} pages)")
+    print(f"{'pages':>7} {'time s':>8} {'base MB':>8} {'peak MB':>8} {'pdf MB':>8}")
+    for pages in args.pages:
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--single', '--pages', str(pages),
+             '--width', str(args.width), '--height', str(args.height)],
+            capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"{pages:>7} ❌ failed: {result.stderr.strip()}")
+            continue
+        elapsed, baseline, peak, size = result.stdout.split()
+        print(f"{pages:>7} {elapsed:>8} {baseline:>8} {peak:>8} {size:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Capture Pipeline Benchmark
+Runs the capture loop in real time against a simulated screen with a fixed
+page-turn delay, once followed by a separate processing run and once with the
+pipeline cropping and writing the PDF during capture, and compares how long it
+takes until the PDF is ready
+
+Usage: python benchmarks/bench_pipeline.py [--spreads 20] [--delay 0.3] [--compact]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', 'src'))
+
+import capture
+import process
+import synthetic
+from instrument import tracer
+from pipeline import CapturePipeline
+from raw_store import list_screenshots
+from simulate import SimulatedReader
+
+
+def capture_book(screenshots_dir, pages, args, pipeline=None):
+    reader = SimulatedReader(pages, turn_time=0)
+    capture.capture_pages(screenshots_dir, args.spreads * 2, args.spreads, grab=reader.grab,
+                          press_key=reader.press, adaptive=False, pipeline=pipeline)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time to PDF: capture then process vs pipelined")
+    parser.add_argument('--spreads', type=int, default=20)
+    parser.add_argument('--delay', type=float, default=0.3, help="fixed page-turn delay in seconds")
+    parser.add_argument('--compact', action='store_true')
+    args = parser.parse_args()
+
+    pages = [synthetic.make_screenshot(seed=i) for i in range(args.spreads)]
+    capture.DELAY_TIMEOUT = args.delay
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sequential_dir = os.path.join(tmp, 'sequential')
+        os.makedirs(sequential_dir)
+        start = time.perf_counter()
+        tracer.reset()
+        with contextlib.redirect_stdout(io.StringIO()):
+            capture_book(sequential_dir, pages, args)
+            captured = time.perf_counter() - start
+            output_dir = os.path.join(tmp, 'frames')
+            os.makedirs(output_dir)
+            crop_coords = process.analyze_content_frame_consensus(list_screenshots(sequential_dir))
+            process.extract_book(list_screenshots(sequential_dir), crop_coords, output_dir,
+                                 os.path.join(tmp, 'sequential.pdf'), "Benchmark", save_frames=False,
+                                 compact=args.compact)
+        sequential = time.perf_counter() - start
+
+        pipelined_dir = os.path.join(tmp, 'pipelined')
+        os.makedirs(pipelined_dir)
+        start = time.perf_counter()
+        tracer.reset()
+        with contextlib.redirect_stdout(io.StringIO()):
+            pipeline = CapturePipeline(os.path.join(tmp, 'pipelined.pdf'), "Benchmark", compact=args.compact)
+            capture_book(pipelined_dir, pages, args, pipeline)
+        pipelined = time.perf_counter() - start
+
+    print(f"📸 {args.spreads} spreads, {args.delay}s page-turn delay")
+    print(f"   capture, then process:  {sequential:>6.1f}s  (PDF {sequential - captured:.1f}s after the last page)")
+    print(f"   pipelined:              {pipelined:>6.1f}s  (PDF {pipeline.finish_seconds:.1f}s after the last page)")
+    print(f"   {pipeline.page_count} PDF pages, {len(pipeline.failed)} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Crop Preview Benchmark
+Time to the first crop preview on 5K screenshots: the old full-resolution preview
+(decode, copy, write a full-size PNG) against the thumbnail kept from frame detection
+
+Usage: python benchmarks/bench_preview.py [--resolution 5120x2880]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from PIL import Image, ImageDraw
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', 'src'))
+
+import process
+import synthetic
+
+
+def full_resolution_preview(image_path, crop_coords, output_dir):
+    """The preview as it was made before: full decode, copy and full-size PNG"""
+    img = Image.open(image_path)
+    preview_img = img.copy()
+    ImageDraw.Draw(preview_img).rectangle(crop_coords, outline='green', width=3)
+    preview_img.save(os.path.join(output_dir, "crop_preview.png"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crop preview latency")
+    parser.add_argument('--resolution', default="5120x2880")
+    args = parser.parse_args()
+    size = tuple(int(value) for value in args.resolution.split('x'))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        image_files = synthetic.write_screenshots(os.path.join(tmp, 'book'), 7, size,
+                                                  synthetic.scaled_frame_box(size))
+        first_image = image_files[1]
+
+        thumbnails = {}
+        start = time.perf_counter()
+        crop_coords = process.analyze_content_frame_consensus(image_files, thumbnails=thumbnails)
+        detect = time.perf_counter() - start
+
+        timings = []
+        start = time.perf_counter()
+        full_resolution_preview(first_image, crop_coords, tmp)
+        timings.append(("full resolution", time.perf_counter() - start))
+
+        start = time.perf_counter()
+        process.create_preview_image(first_image, crop_coords, tmp, thumbnails[first_image])
+        timings.append(("thumbnail", time.perf_counter() - start))
+
+        start = time.perf_counter()
+        process.create_preview_image(first_image, crop_coords, tmp)
+        timings.append(("cold thumbnail", time.perf_counter() - start))
+
+        start = time.perf_counter()
+        process.create_contact_sheet(thumbnails, crop_coords, tmp)
+        timings.append(("contact sheet", time.perf_counter() - start))
+
+    print(f"\n🖼️  {args.resolution} screenshots, frame detection on {len(thumbnails)} samples "
+          f"took {detect:.2f}s")
+    for name, seconds in timings:
+        print(f"{name:>16}: {1000 * seconds:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
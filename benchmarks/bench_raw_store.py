@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Raw Store Benchmark
+Writes the same synthetic screenshots as PNG files and into a raw store, then reads
+every one back and crops the frame, and compares CPU time and disk space
+Also checks that both ways give identical frames
+
+Usage: python benchmarks/bench_raw_store.py [--spreads 20] [--resolution 2880x1800] [--rendered]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', 'src'))
+
+import synthetic
+from raw_store import RAW_STORE_NAME, RawStore, list_screenshots, open_screenshot, stored_crop
+
+
+def folder_size(path):
+    """Total size of all files directly inside path"""
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PNG files vs the raw screenshot store")
+    parser.add_argument('--spreads', type=int, default=20)
+    parser.add_argument('--resolution', default="%dx%d" % synthetic.SCREENSHOT_SIZE)
+    parser.add_argument('--rendered', action='store_true',
+                        help="draw real words with a font instead of word blocks")
+    args = parser.parse_args()
+
+    size = tuple(int(value) for value in args.resolution.lower().split('x'))
+    frame_box = synthetic.scaled_frame_box(size)
+    pages = [synthetic.make_screenshot(size, frame_box, seed=i, rendered=args.rendered)
+             for i in range(args.spreads)]
+    names = [f"pages_{2 * i + 1:03d}-{2 * i + 2:03d}.png" for i in range(args.spreads)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        png_dir = os.path.join(tmp, 'png')
+        raw_dir = os.path.join(tmp, 'raw')
+        os.makedirs(png_dir)
+        os.makedirs(raw_dir)
+
+        start = time.perf_counter()
+        for name, page in zip(names, pages):
+            page.save(os.path.join(png_dir, name))
+        png_write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store = RawStore(os.path.join(raw_dir, RAW_STORE_NAME))
+        for name, page in zip(names, pages):
+            store.append(name, page)
+        raw_write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        png_frames = []
+        for path in list_screenshots(png_dir):
+            with open_screenshot(path) as img:
+                png_frames.append(img.crop(frame_box))
+        png_read = time.perf_counter() - start
+
+        start = time.perf_counter()
+        raw_frames = [stored_crop(path, frame_box) for path in list_screenshots(raw_dir)]
+        raw_read = time.perf_counter() - start
+
+        identical = all(np.array_equal(np.asarray(a), np.asarray(b)) for a, b in zip(png_frames, raw_frames))
+        png_bytes = folder_size(png_dir)
+        raw_bytes = folder_size(raw_dir)
+
+    per_spread = 1000 / args.spreads
+    print(f"📸 {args.spreads} spreads of {args.resolution}")
+    print(f"{'':>6} {'write ms':>9} {'read+crop ms':>13} {'MB/spread':>10}")
+    print(f"{'PNG':>6} {png_write * per_spread:>9.1f} {png_read * per_spread:>13.1f} "
+          f"{png_bytes / 1e6 / args.spreads:>10.2f}")
+    print(f"{'raw':>6} {raw_write * per_spread:>9.1f} {raw_read * per_spread:>13.1f} "
+          f"{raw_bytes / 1e6 / args.spreads:>10.2f}")
+    print(f"⚡ {(png_write + png_read) / (raw_write + raw_read):.1f}x less time from capture to crop, "
+          f"{raw_bytes / png_bytes:.1f}x the disk space")
+    if not identical:
+        print("❌ Frames from the raw store differ from the PNG frames")
+        sys.exit(1)
+    print("✅ Identical frames")
+
+
+if __name__ == "__main__":
+    main()
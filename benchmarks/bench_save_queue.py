@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Background Save Benchmark
+Runs the capture loop in real time against a simulated screen with a short fixed
+page-turn delay, and shows how much PNG encoding the save queue hides from the loop
+
+Usage: python benchmarks/bench_save_queue.py [--spreads 20] [--delay 0.3] [--workers 2]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', 'src'))
+
+import capture
+import synthetic
+from simulate import SimulatedReader
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PNG encoding hidden by the save queue")
+    parser.add_argument('--spreads', type=int, default=20)
+    parser.add_argument('--delay', type=float, default=0.3, help="fixed page-turn delay in seconds")
+    parser.add_argument('--workers', type=int, default=2, help="background save threads")
+    args = parser.parse_args()
+
+    pages = [synthetic.make_screenshot(seed=i) for i in range(args.spreads)]
+    reader = SimulatedReader(pages, turn_time=0)
+
+    # Measure synchronous encoding of the same screenshots for reference
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        for i, page in enumerate(pages):
+            page.save(os.path.join(tmp, f"{i}.png"))
+        inline_encode = time.perf_counter() - start
+
+    capture.DELAY_TIMEOUT = args.delay
+    output = io.StringIO()
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            captured = capture.capture_pages(tmp, args.spreads * 2, args.spreads, grab=reader.grab,
+                                             press_key=reader.press, adaptive=False,
+                                             save_workers=args.workers)
+        elapsed = time.perf_counter() - start
+
+    waits = args.delay * (args.spreads - 1)
+    print(f"📸 {captured}/{args.spreads} spreads, {args.delay}s page-turn delay")
+    print(f"   inline saving would take ~{waits + inline_encode:.1f}s "
+          f"({waits:.1f}s waiting + {inline_encode:.1f}s encoding)")
+    print(f"   with the save queue: {elapsed:.1f}s")
+    print(output.getvalue()[output.getvalue().find("💾 Saved"):].strip())
+
+
+if __name__ == "__main__":
+    main()
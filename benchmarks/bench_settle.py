@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Page Turn Wait Benchmark
+Runs the capture loop against a simulated reader (virtual clock, no display)
+and compares the time spent waiting with the adaptive settle detector
+against the fixed DELAY_TIMEOUT sleep
+
+Usage: python benchmarks/bench_settle.py [--spreads 30] [--turn 0.3] [--jitter 0.9]
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+import tempfile
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', 'src'))
+
+import capture
+import synthetic
+from PIL import Image, ImageChops
+from instrument import tracer
+from simulate import SimulatedReader
+
+
+def run(pages, args, adaptive):
+    """
+    Capture the simulated book
+    Returns (virtual seconds, spreads saved, spreads caught mid-turn, real seconds, output)
+    """
+    reader = SimulatedReader(pages, turn_time=args.turn, turn_jitter=args.jitter,
+                             grab_time=args.grab, seed=args.seed)
+    output = io.StringIO()
+    start = time.perf_counter()
+    tracer.reset()
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(output):
+            captured = capture.capture_pages(tmp, len(pages) * 2, len(pages), grab=reader.grab,
+                                             press_key=reader.press, sleep=reader.sleep,
+                                             clock=reader.clock, adaptive=adaptive)
+        real = time.perf_counter() - start
+
+        # Every saved screenshot must be a fully turned page, not an animation frame
+        mid_turn = 0
+        for page, path in zip(pages, sorted(glob.glob(os.path.join(tmp, "*.png")))):
+            with Image.open(path) as img:
+                if ImageChops.difference(img.convert('RGB'), page).getbbox():
+                    mid_turn += 1
+
+    return reader.clock(), captured, mid_turn, real, output.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Adaptive vs fixed page-turn wait")
+    parser.add_argument('--spreads', type=int, default=30)
+    parser.add_argument('--turn', type=float, default=0.3, help="minimum page turn time in seconds")
+    parser.add_argument('--jitter', type=float, default=0.9, help="random extra page turn time")
+    parser.add_argument('--grab', type=float, default=0.05, help="simulated grab latency in seconds")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    size = (1440, 900)
+    pages = [synthetic.make_screenshot(size, synthetic.scaled_frame_box(size), seed=i)
+             for i in range(args.spreads)]
+
+    print(f"{'mode':>9} {'captured':>9} {'mid-turn':>9} {'virtual s':>10} {'s/spread':>9} {'real s':>7}")
+    for name, adaptive in (("fixed", False), ("adaptive", True)):
+        virtual, captured, mid_turn, real, output = run(pages, args, adaptive)
+        print(f"{name:>9} {captured:>9} {mid_turn:>9} {virtual:>10.1f} {virtual / args.spreads:>9.2f} {real:>7.1f}")
+
+    # The adaptive run's settle summary
+    print(output[output.find("⏱️"):].rstrip())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Spread Split Benchmark
+Spreads per second for gutter detection, splitting and trimming on one core
+(images are already decoded, so this is the cost of the split stage alone)
+
+Usage: python benchmarks/bench_split.py [--spreads 40]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', 'src'))
+
+import synthetic
+from spread import split_spread
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spread splitting throughput")
+    parser.add_argument('--spreads', type=int, default=40)
+    args = parser.parse_args()
+
+    frames = [synthetic.make_frame(seed=i) for i in range(min(args.spreads, 10))]
+
+    start = time.perf_counter()
+    single = 0
+    for i in range(args.spreads):
+        pages = split_spread(frames[i % len(frames)], 2 * i + 1, 2 * i + 2)
+        single += len(pages) == 1
+    elapsed = time.perf_counter() - start
+
+    width, height = synthetic.FRAME_SIZE
+    print(f"✂️  {args.spreads} spreads of {width}x{height} in {elapsed:.2f}s: "
+          f"{args.spreads / elapsed:.1f} spreads/s ({1000 * elapsed / args.spreads:.1f} ms each)")
+    if single:
+        print(f"⚠️  No gutter found in {single} spreads")
+
+
+if __name__ == "__main__":
+    main()
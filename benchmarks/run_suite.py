@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+Runs the whole pipeline on a synthetic book and stores the results, so a slowdown
+between commits shows up as a regression against the previous run:
+  crop        - cropping every screenshot to frame PNGs
+  pdf         - building a PDF from the frame PNGs
+  end_to_end  - frame detection, cropping and PDF in one pass (what process.py does)
+  capture     - capture.main on a fake screen that replays the book (no display,
+                key presses only move the replay to the next screenshot)
+
+Results go to benchmarks/results/<date>_<commit>.json
+
+Usage: python benchmarks/run_suite.py [--spreads 20] [--resolution 2880x1800] [--rendered]
+                                      [--workers 1] [--repeat 1] [--threshold 0.15] [--check]
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, '..', 'src'))
+
+import capture
+import process
+import synthetic
+
+RESULTS_DIR = os.path.join(script_dir, 'results')
+
+
+def parse_resolution(text):
+    width, height = (int(value) for value in text.lower().split('x'))
+    return width, height
+
+
+def current_commit():
+    """Short hash of the checked out commit, or 'unknown' outside a git checkout"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=script_dir,
+                                capture_output=True, text=True)
+        return result.stdout.strip() or 'unknown'
+    except OSError:
+        return 'unknown'
+
+
+def timed(func, repeat):
+    """Best wall time of func over repeat runs (output silenced)"""
+    best = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_benchmarks(tmp, args):
+    """Run every stage on a fresh synthetic book, returns {stage: seconds}"""
+    size = parse_resolution(args.resolution)
+    frame_box = synthetic.scaled_frame_box(size)
+    book_dir = os.path.join(tmp, 'book_bench')
+    image_files = synthetic.write_screenshots(book_dir, args.spreads, size, frame_box, args.rendered)
+
+    frames_dir = os.path.join(tmp, 'frames')
+    os.makedirs(frames_dir, exist_ok=True)
+
+    def crop():
+        for _ in process.crop_images(image_files, frame_box, frames_dir, args.workers):
+            pass
+
+    def pdf():
+        frame_files = sorted(glob.glob(os.path.join(frames_dir, "*_frame.png")))
+        process.create_pdf_from_images(frame_files, os.path.join(tmp, 'frames.pdf'), "Benchmark")
+
+    def end_to_end():
+        # A fresh output folder each time, so the manifest can't reuse earlier results
+        output_dir = tempfile.mkdtemp(dir=tmp)
+        crop_coords = process.analyze_content_frame_consensus(image_files)
+        process.extract_book(image_files, crop_coords, output_dir, os.path.join(output_dir, 'book.pdf'),
+                             "Benchmark", save_frames=False, workers=args.workers)
+
+    def capture_book():
+        capture.main(['--backend', 'replay', '--replay-dir', book_dir, '--pages', str(2 * args.spreads),
+                      '--start-delay', '0', '--output-dir', tempfile.mkdtemp(dir=tmp)])
+
+    results = {}
+    for name, func in (('crop', crop), ('pdf', pdf), ('end_to_end', end_to_end), ('capture', capture_book)):
+        results[name] = timed(func, args.repeat)
+        print(f"   {name:<11} {results[name]:>7.2f}s  {1000 * results[name] / args.spreads:>7.1f} ms/spread")
+    return results
+
+
+def previous_result(config, exclude):
+    """The most recent stored result with the same configuration, or None"""
+    for path in sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")), reverse=True):
+        if path == exclude:
+            continue
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if data.get('config') == config:
+            return path, data
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the whole pipeline on a synthetic book")
+    parser.add_argument('--spreads', type=int, default=20)
+    parser.add_argument('--resolution', default="%dx%d" % synthetic.SCREENSHOT_SIZE,
+                        help="screenshot size as WIDTHxHEIGHT (default: %(default)s)")
+    parser.add_argument('--rendered', action='store_true',
+                        help="draw real words with a font instead of word blocks")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=1, help="runs per stage, the best one counts")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="slowdown against the previous result that counts as a regression")
+    parser.add_argument('--check', action='store_true', help="exit with status 1 on a regression")
+    args = parser.parse_args()
+
+    config = {'spreads': args.spreads, 'resolution': args.resolution,
+              'rendered': args.rendered, 'workers': args.workers}
+    commit = current_commit()
+    print(f"🏁 Benchmark suite at {commit}: {args.spreads} spreads of {args.resolution}, "
+          f"{args.workers} worker(s)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run_benchmarks(tmp, args)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    result_path = os.path.join(RESULTS_DIR, f"{stamp}_{commit}.json")
+    with open(result_path, 'w') as f:
+        json.dump({'commit': commit, 'date': stamp, 'python': sys.version.split()[0],
+                   'config': config, 'seconds': results}, f, indent=1)
+    print(f"💾 Results saved to {os.path.relpath(result_path)}")
+
+    previous = previous_result(config, result_path)
+    if previous is None:
+        print("📊 No earlier result with the same settings to compare with")
+        return
+
+    path, data = previous
+    print(f"\n📊 Compared with {data['commit']} ({os.path.basename(path)}):")
+    regressions = 0
+    for name, seconds in results.items():
+        before = data['seconds'].get(name)
+        if not before:
+            continue
+        change = seconds / before - 1
+        flag = "⚠️  regression" if change > args.threshold else ""
+        regressions += change > args.threshold
+        print(f"   {name:<11} {before:>7.2f}s → {seconds:>7.2f}s  {100 * change:+6.1f}%  {flag}")
+
+    if regressions and args.check:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
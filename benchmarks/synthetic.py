@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Synthetic Book Generator
+Creates fake cropped book frames for benchmarks, so no real capture is needed
+"""
+
+import os
+import random
+from PIL import Image, ImageDraw, ImageFont
+
+# Full-screen screenshot size and the gray reading frame inside it
+SCREENSHOT_SIZE = (2880, 1800)
+FRAME_BOX = (215, 48, 2785, 1660)
+
+# Size of one cropped frame from the default crop box
+FRAME_SIZE = (FRAME_BOX[2] - FRAME_BOX[0], FRAME_BOX[3] - FRAME_BOX[1])
+
+
+def _text_font(size):
+    """Pillow's built-in font at a pixel size (older Pillow only has a small bitmap font)"""
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def _random_word(rng):
+    return ''.join(rng.choice('etaoinshrdlucmfwypvbgk') for _ in range(rng.randint(2, 9)))
+
+
+def make_frame(size=FRAME_SIZE, seed=0, rendered=False):
+    """
+    Create a two-page spread with text-like lines on white pages
+    With rendered=True the lines are real words drawn with a font (slower, but with
+    glyph edges and anti-aliasing like a real book); otherwise words are dark blocks
+    """
+    rng = random.Random(seed)
+    width, height = size
+    img = Image.new('RGB', size, (230, 230, 230))
+    draw = ImageDraw.Draw(img)
+    font = _text_font(height // 70) if rendered else None
+
+    margin = width // 40
+    page_width = (width - 3 * margin) // 2
+    for page in range(2):
+        left = margin + page * (page_width + margin)
+        draw.rectangle([left, margin, left + page_width, height - margin], fill='white')
+
+        # Text lines made of short dark "words"
+        y = margin * 2
+        while y < height - margin * 2:
+            x = left + margin
+            while x < left + page_width - margin:
+                if rendered:
+                    word = _random_word(rng)
+                    word_width = draw.textlength(word, font=font)
+                    if x + word_width > left + page_width - margin:
+                        break
+                    draw.text((x, y), word, fill=(20, 20, 20), font=font)
+                    x += word_width + width // 200
+                    continue
+                word = rng.randint(width // 160, width // 40)
+                draw.rectangle([x, y, min(x + word, left + page_width - margin), y + height // 100],
+                               fill=(20, 20, 20))
+                x += word + width // 200
+            y += height // 40
+
+    return img
+
+
+def make_photo_frame(size=FRAME_SIZE, seed=0, color=True):
+    """Create a spread filled with a smooth photo-like picture (color or grayscale)"""
+    rng = random.Random(seed)
+    width, height = size
+    small = Image.new('RGB', (32, 20))
+    small.putdata([(rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255))
+                   for _ in range(32 * 20)])
+    img = small.resize(size, Image.BICUBIC)
+    return img if color else img.convert('L').convert('RGB')
+
+
+def write_frames(output_dir, count, size=FRAME_SIZE, unique=10):
+    """
+    Write synthetic frames to output_dir and return the list of paths for count pages
+    Only `unique` distinct files are written; the list cycles through them
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for i in range(min(count, unique)):
+        path = os.path.join(output_dir, f"frame_{i:03d}.png")
+        make_frame(size, seed=i).save(path)
+        paths.append(path)
+    return [paths[i % len(paths)] for i in range(count)]
+
+
+def scaled_frame_box(size):
+    """FRAME_BOX scaled from the default screenshot size to another resolution"""
+    sx = size[0] / SCREENSHOT_SIZE[0]
+    sy = size[1] / SCREENSHOT_SIZE[1]
+    left, top, right, bottom = FRAME_BOX
+    return round(left * sx), round(top * sy), round(right * sx), round(bottom * sy)
+
+
+def make_screenshot(size=SCREENSHOT_SIZE, frame_box=FRAME_BOX, seed=0, rendered=False):
+    """Create a full screenshot: browser chrome, navigation panel and a spread inside the frame"""
+    width, height = size
+    left, top, right, bottom = frame_box
+    img = Image.new('RGB', size, (250, 250, 250))
+    draw = ImageDraw.Draw(img)
+
+    # Browser chrome along the top and a navigation panel on the left
+    draw.rectangle([0, 0, width, top - 1], fill=(53, 54, 58))
+    draw.rectangle([0, top, left - 1, height], fill=(245, 245, 247))
+    for y in range(top + 40, height - 40, 60):
+        draw.rectangle([20, y, left - 30, y + 18], fill=(120, 120, 130))
+
+    img.paste(make_frame((right - left, bottom - top), seed, rendered), (left, top))
+    return img
+
+
+def write_screenshots(output_dir, count, size=SCREENSHOT_SIZE, frame_box=FRAME_BOX, rendered=False):
+    """Write count synthetic screenshots named like capture.py does"""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for i in range(1, count + 1):
+        path = os.path.join(output_dir, f"pages_{2 * i - 1:03d}-{2 * i:03d}.png")
+        make_screenshot(size, frame_box, seed=i, rendered=rendered).save(path)
+        paths.append(path)
+    return paths
@@ -51,11 +51,22 @@ def run_full_workflow():
     print("FULL WORKFLOW: Capture → Process → PDF")
     print("=" * 50)
 
+    # The PDF can be built during capture, using the waits between page turns
+    pipelined = input("\n⚡ Build the PDF while capturing? (y/n): ").lower().strip() == 'y'
+    capture_args = []
+    if pipelined:
+        book_title = process.get_book_title()
+        pdf_output_dir = process.get_pdf_output_directory()
+        if pdf_output_dir is None:
+            print("⚠️  Cancelled")
+            return
+        capture_args = ['--pdf', pdf_output_dir] + (['--title', book_title] if book_title else [])
+
     # Step 1: Capture
     print("\n📸 STEP 1: Capture Screenshots")
     print("-" * 50)
     try:
-        capture.main()
+        capture.main(sys.argv[1:] + capture_args)
     except KeyboardInterrupt:
         print("\n\n⚠️  Capture interrupted. You can process existing screenshots using option 3.")
         return
@@ -63,6 +74,11 @@ def run_full_workflow():
         print(f"\n❌ Error during capture: {e}")
         return
 
+    if pipelined:
+        print("\n\n✨ Full workflow completed successfully!")
+        print("   The screenshots are kept, so you can still run option 3 for other settings")
+        return
+
     # Step 2: Process
     print("\n\n🔄 STEP 2: Process Screenshots")
     print("-" * 50)
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Screen Grab Backends
+One interface for the different ways of taking a screenshot, chosen once at startup:
+  pyautogui - the default, works wherever pyautogui does
+  mss       - faster grabs if the optional mss package is installed
+  replay    - plays back the screenshots of an earlier capture, for testing without a display
+The active window's bounds are looked up once and cached, instead of on every page
+"""
+
+import platform
+import subprocess
+
+from PIL import Image
+
+from raw_store import list_screenshots, open_screenshot
+
+# Re-check the cached window bounds after this many grabs, in case the window moved
+WINDOW_RECHECK_GRABS = 50
+
+BACKEND_NAMES = ['auto', 'pyautogui', 'mss', 'replay']
+
+# Height of the strip through the middle of the page grabbed to watch page turns, as a
+# fraction of the captured area
+PREVIEW_STRIP = 0.25
+
+
+class GrabBackend:
+    """Takes screenshots of the whole screen or of a (left, top, width, height) region"""
+
+    name = None
+
+    def grab(self, region=None):
+        raise NotImplementedError
+
+    def screen_size(self):
+        """(width, height) of the screen in the coordinates used for regions"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PyAutoGUIBackend(GrabBackend):
+    """Screenshots through pyautogui"""
+
+    name = 'pyautogui'
+
+    def __init__(self):
+        import pyautogui
+        self._pyautogui = pyautogui
+
+    def grab(self, region=None):
+        return self._pyautogui.screenshot(region=region)
+
+    def screen_size(self):
+        return tuple(self._pyautogui.size())
+
+
+class MssBackend(GrabBackend):
+    """Screenshots through mss, which skips pyautogui's temporary files on macOS and Linux"""
+
+    name = 'mss'
+
+    def __init__(self):
+        import mss
+        self._mss = mss.mss()
+
+    def grab(self, region=None):
+        if region:
+            left, top, width, height = region
+            area = {'left': left, 'top': top, 'width': width, 'height': height}
+        else:
+            area = self._mss.monitors[1]
+        shot = self._mss.grab(area)
+        return Image.frombytes('RGB', shot.size, shot.bgra, 'raw', 'BGRX')
+
+    def screen_size(self):
+        monitor = self._mss.monitors[1]
+        return monitor['width'], monitor['height']
+
+    def close(self):
+        self._mss.close()
+
+
+class ReplayBackend(GrabBackend):
+    """
+    Plays back the screenshots of an earlier capture folder
+    grab() shows the current file, press('right') moves to the next one and press('left') back
+    """
+
+    name = 'replay'
+
+    def __init__(self, folder):
+        self.files = list_screenshots(folder)
+        if not self.files:
+            raise ValueError(f"No screenshots to replay in {folder}")
+        self.index = 0
+        self._current = None
+
+    def press(self, key):
+        if key == 'right' and self.index < len(self.files) - 1:
+            self.index += 1
+            self._current = None
+        elif key == 'left' and self.index > 0:
+            self.index -= 1
+            self._current = None
+
+    def grab(self, region=None):
+        if self._current is None:
+            with open_screenshot(self.files[self.index]) as img:
+                self._current = img.convert('RGB')
+
+        if region:
+            left, top, width, height = region
+            return self._current.crop((left, top, left + width, top + height))
+        return self._current.copy()
+
+    def screen_size(self):
+        with open_screenshot(self.files[0]) as img:
+            return img.size
+
+
+def create_backend(name='auto', replay_dir=None):
+    """Create the screen grab backend by name; 'auto' prefers mss when it is installed"""
+    if name == 'replay':
+        return ReplayBackend(replay_dir)
+    if name == 'mss':
+        return MssBackend()
+    if name == 'pyautogui':
+        return PyAutoGUIBackend()
+
+    try:
+        return MssBackend()
+    except ImportError:
+        return PyAutoGUIBackend()
+
+
+def _macos_window_bounds():
+    """Bounds of the frontmost window on macOS using AppleScript"""
+    applescript = '''
+    tell application "System Events"
+        set frontApp to first application process whose frontmost is true
+        tell frontApp
+            try
+                set windowBounds to bounds of window 1
+                return windowBounds
+            on error
+                return "0,0,800,600"
+            end try
+        end tell
+    end tell
+    '''
+
+    result = subprocess.run(['osascript', '-e', applescript],
+                            capture_output=True, text=True)
+
+    if result.returncode == 0:
+        bounds = result.stdout.strip().split(', ')
+        if len(bounds) == 4:
+            x1, y1, x2, y2 = map(int, bounds)
+            return x1, y1, x2 - x1, y2 - y1
+    return None
+
+
+def _windows_window_bounds():
+    """Bounds of the active window on Windows using pygetwindow"""
+    try:
+        import pygetwindow as gw
+    except ImportError:
+        print("Note: pygetwindow not installed, taking full screen screenshot")
+        print("For better window detection, install: pip install pygetwindow")
+        return None
+
+    active_window = gw.getActiveWindow()
+    if active_window:
+        return active_window.left, active_window.top, active_window.width, active_window.height
+    return None
+
+
+def _macos_activate_window(title):
+    """Bring the first window whose title contains `title` to the front on macOS"""
+    applescript = f'''
+    tell application "System Events"
+        repeat with proc in (application processes whose visible is true)
+            repeat with win in (windows of proc)
+                if name of win contains "{title.replace('"', '')}" then
+                    set frontmost of proc to true
+                    perform action "AXRaise" of win
+                    return "ok"
+                end if
+            end repeat
+        end repeat
+    end tell
+    return "missing"
+    '''
+    result = subprocess.run(['osascript', '-e', applescript], capture_output=True, text=True)
+    return result.returncode == 0 and result.stdout.strip() == "ok"
+
+
+def _windows_activate_window(title):
+    """Bring the first window whose title contains `title` to the front on Windows"""
+    import pygetwindow as gw
+    windows = gw.getWindowsWithTitle(title)
+    if not windows:
+        return False
+    windows[0].activate()
+    return True
+
+
+def activate_window(title=None, tab=None, system=None):
+    """
+    Bring a book to the front: the window whose title contains `title`, then browser tab
+    number `tab` (1-8) of it with Cmd/Ctrl+number
+    Returns False if the window wasn't found or can't be activated on this system
+    """
+    system = system or platform.system()
+    if title:
+        activate = {'Darwin': _macos_activate_window, 'Windows': _windows_activate_window}.get(system)
+        try:
+            if activate is None or not activate(title):
+                return False
+        except Exception as e:
+            print(f"Warning: Could not activate window '{title}' ({e})")
+            return False
+    if tab:
+        import pyautogui
+        pyautogui.hotkey('command' if system == 'Darwin' else 'ctrl', str(tab))
+    return True
+
+
+class WindowLocator:
+    """
+    Finds the active window's (left, top, width, height) once and caches it
+    The bounds are looked up again after a failed grab, or every WINDOW_RECHECK_GRABS
+    grabs to notice a window that was moved
+    """
+
+    def __init__(self, system=None, resolver=None, recheck_grabs=WINDOW_RECHECK_GRABS):
+        self.system = system or platform.system()
+        if resolver is None:
+            resolver = {'Darwin': _macos_window_bounds,
+                        'Windows': _windows_window_bounds}.get(self.system)
+        self._resolver = resolver
+        self.recheck_grabs = recheck_grabs
+        self.lookups = 0
+        self._bounds = None
+        self._grabs_since_lookup = 0
+
+    def bounds(self):
+        """Cached window bounds, or None to grab the full screen"""
+        if self._resolver is None:
+            return None
+        if self.lookups == 0 or self._grabs_since_lookup >= self.recheck_grabs:
+            self.refresh()
+        self._grabs_since_lookup += 1
+        return self._bounds
+
+    def refresh(self):
+        """Look the window bounds up again"""
+        self.lookups += 1
+        self._grabs_since_lookup = 0
+        try:
+            self._bounds = self._resolver()
+        except Exception as e:
+            print(f"Warning: Could not get window bounds ({e}), taking full screen")
+            self._bounds = None
+            return
+
+        if self._bounds is None:
+            print("Warning: Could not get window bounds, taking full screen")
+
+
+class WindowCapture:
+    """Grabs the active window with a backend, using the cached window bounds"""
+
+    def __init__(self, backend, locator=None):
+        self.backend = backend
+        self.locator = locator or WindowLocator()
+
+    def grab(self):
+        region = self.locator.bounds()
+        try:
+            return self.backend.grab(region)
+        except Exception as e:
+            if region is None:
+                raise
+            # The window may have moved or closed: look it up again, then fall back to full screen
+            print(f"Error getting window screenshot: {e}")
+            self.locator.refresh()
+            try:
+                return self.backend.grab(self.locator.bounds())
+            except Exception:
+                print("Falling back to full screen screenshot")
+                return self.backend.grab()
+
+
+class CroppedCapture:
+    """
+    Grabs only the crop box of the active window instead of the whole window
+    The crop box is given in window screenshot pixels, like process.py's crop coordinates,
+    so it is scaled to screen coordinates (e.g. on Retina displays) before grabbing
+    If the backend's region grabs don't line up with the crop box, it falls back to
+    grabbing the window and cropping in memory
+    """
+
+    def __init__(self, window_capture, crop_box):
+        self.window_capture = window_capture
+        self.backend = window_capture.backend
+        self.crop_box = tuple(crop_box)
+        self._scale = None
+        self._region_grabs = True
+
+    def _screen_region(self):
+        """The crop box as a (left, top, width, height) region in screen coordinates"""
+        bounds = self.window_capture.locator.bounds()
+        if self._scale is None:
+            # Screenshot pixels per screen coordinate, measured once on a full window grab
+            full = self.backend.grab(bounds)
+            window_width = bounds[2] if bounds else self.backend.screen_size()[0]
+            self._scale = full.width / window_width
+
+        origin_x, origin_y = bounds[:2] if bounds else (0, 0)
+        left, top, right, bottom = self.crop_box
+        return (origin_x + round(left / self._scale), origin_y + round(top / self._scale),
+                round((right - left) / self._scale), round((bottom - top) / self._scale))
+
+    def grab(self):
+        left, top, right, bottom = self.crop_box
+        if self._region_grabs:
+            try:
+                img = self.backend.grab(self._screen_region())
+                if abs(img.width - (right - left)) <= 2 and abs(img.height - (bottom - top)) <= 2:
+                    return img
+                print(f"Warning: region grab returned {img.width}x{img.height} instead of "
+                      f"{right - left}x{bottom - top}, cropping full window screenshots instead")
+            except Exception as e:
+                print(f"Warning: region grab failed ({e}), cropping full window screenshots instead")
+            self._region_grabs = False
+
+        return self.window_capture.grab().crop(self.crop_box)
+
+
+class PreviewCapture:
+    """
+    Grabs a strip through the middle of what a WindowCapture or CroppedCapture grabs,
+    to watch page turns with a fraction of the pixels of a full grab
+    The strip runs across both pages of a spread; if region grabs fail it grabs everything
+    """
+
+    def __init__(self, capture, fraction=PREVIEW_STRIP):
+        self.capture = capture
+        self.backend = capture.backend
+        self.fraction = fraction
+        self._region_grabs = True
+
+    def _screen_region(self):
+        if isinstance(self.capture, CroppedCapture):
+            left, top, width, height = self.capture._screen_region()
+        else:
+            bounds = self.capture.locator.bounds()
+            left, top, width, height = bounds if bounds else (0, 0, *self.backend.screen_size())
+        strip = max(1, round(height * self.fraction))
+        return left, top + (height - strip) // 2, width, strip
+
+    def grab(self):
+        if self._region_grabs:
+            try:
+                return self.backend.grab(self._screen_region())
+            except Exception as e:
+                print(f"Warning: preview grab failed ({e}), watching page turns on full grabs")
+                self._region_grabs = False
+        return self.capture.grab()
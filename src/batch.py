@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Batch Book Processing
+Non-interactive version of process.py for cron jobs and job runners: takes
+screenshot folders (or glob patterns) and all settings as arguments, processes
+several books at once and writes a JSON summary for every book
+
+Usage: python3 src/batch.py ~/Documents/ebook_suite/book_* --output ~/Documents/ebooks --jobs 2
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ocr import tesseract_available
+from process import (analyze_content_frame_consensus, extract_book, get_output_dir,
+                     get_pdf_path, parse_crop_box)
+from raw_store import list_screenshots
+
+SUMMARY_FILENAME = "batch_summary.json"
+LOG_FILENAME = "batch.log"
+
+
+def expand_folders(patterns):
+    """Expand folder arguments and glob patterns into a sorted list of unique directories"""
+    folders = []
+    for pattern in patterns:
+        matches = glob.glob(os.path.expanduser(pattern)) or [os.path.expanduser(pattern)]
+        for path in matches:
+            path = os.path.abspath(path)
+            if os.path.isdir(path) and path not in folders:
+                folders.append(path)
+    return sorted(folders)
+
+
+def book_title(template, folder_path):
+    """PDF title for a book: the --title template with {folder} replaced, or None"""
+    if not template:
+        return None
+    return template.replace('{folder}', os.path.basename(folder_path))
+
+
+def process_book(folder_path, options):
+    """
+    Process one book without any prompts and write its JSON summary
+    All progress output goes to a log file next to the summary, so parallel books don't mix
+    """
+    output_dir = get_output_dir(folder_path)
+    os.makedirs(output_dir, exist_ok=True)
+    summary = {
+        'folder': folder_path,
+        'status': 'failed',
+        'started': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'settings': {key: options[key] for key in ('crop', 'split', 'compact', 'ocr', 'track_frame',
+                                                        'keep_frames')},
+        'timings': {},
+    }
+
+    start = time.perf_counter()
+    with open(os.path.join(output_dir, LOG_FILENAME), 'w') as log, contextlib.redirect_stdout(log):
+        try:
+            image_files = list_screenshots(folder_path)
+            if not image_files:
+                raise ValueError(f"No screenshots found in {folder_path}")
+
+            crop_coords = options['crop']
+            if crop_coords == 'auto':
+                crop_coords = analyze_content_frame_consensus(image_files)
+            summary['crop_coords'] = list(crop_coords)
+            summary['timings']['frame_detect'] = round(time.perf_counter() - start, 3)
+
+            title = book_title(options['title'], folder_path)
+            pdf_path = None
+            if options['output']:
+                os.makedirs(options['output'], exist_ok=True)
+                pdf_path = get_pdf_path(folder_path, options['output'], title)
+
+            crop_start = time.perf_counter()
+            result = extract_book(image_files, crop_coords, output_dir, pdf_path, title,
+                                  save_frames=options['keep_frames'] or not pdf_path,
+                                  workers=options['workers'], split=options['split'],
+                                  compact=options['compact'], ocr_lang=options['ocr'],
+                                  track_frame=options['track_frame'])
+            summary['timings']['process'] = round(time.perf_counter() - crop_start, 3)
+            summary.update(result)
+            summary['status'] = 'ok' if not result['failed'] else 'partial'
+
+        except Exception as e:
+            print(f"❌ Error processing {folder_path}: {e}")
+            summary['error'] = str(e)
+
+    summary['timings']['total'] = round(time.perf_counter() - start, 3)
+    if options['summary_dir']:
+        os.makedirs(options['summary_dir'], exist_ok=True)
+        summary_path = os.path.join(options['summary_dir'], f"{os.path.basename(folder_path)}.json")
+    else:
+        summary_path = os.path.join(output_dir, SUMMARY_FILENAME)
+    with open(summary_path, 'w') as f:
+        json.dump(summary, f, indent=1)
+    summary['summary_path'] = summary_path
+    return summary
+
+
+def _book_task(args):
+    """Process pool entry point for process_book"""
+    return process_book(*args)
+
+
+def run_batch(folders, options, jobs=1):
+    """Process books, up to `jobs` at once; yields each book's summary as it finishes, in order"""
+    tasks = [(folder_path, options) for folder_path in folders]
+    if jobs <= 1:
+        for task in tasks:
+            yield _book_task(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(_book_task, tasks)
+
+
+def main(argv=None):
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Process book screenshot folders without prompts")
+    parser.add_argument('folders', nargs='+',
+                        help="screenshot folders or glob patterns (e.g. '~/Documents/ebook_suite/book_*')")
+    parser.add_argument('--crop', type=parse_crop_box, default='auto',
+                        help="frame to keep: 'auto' to detect it (default) or left,top,right,bottom")
+    parser.add_argument('--output', metavar='DIR',
+                        help="folder for the PDFs; without it only the frame images are written")
+    parser.add_argument('--title',
+                        help="PDF title, '{folder}' is replaced by the folder name (default: none)")
+    parser.add_argument('--keep-frames', action='store_true',
+                        help="also keep the cropped frame images when writing PDFs")
+    parser.add_argument('--split', action='store_true',
+                        help="split two-page spreads into single pages trimmed to their content")
+    parser.add_argument('--compact', action='store_true',
+                        help="encode each PDF page to match its content (black and white, gray or color)")
+    parser.add_argument('--ocr', nargs='?', const='eng', metavar='LANG',
+                        help="add a searchable text layer with Tesseract (language, default: eng)")
+    parser.add_argument('--track-frame', action='store_true',
+                        help="detect the frame on every screenshot and report pages where it moved")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="number of books processed at the same time (default: 1)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="worker processes per book, only used with --jobs 1 (default: 1)")
+    parser.add_argument('--summary-dir', metavar='DIR',
+                        help="write all JSON summaries here (default: each book's frame folder)")
+    args = parser.parse_args(argv)
+
+    folders = expand_folders(args.folders)
+    if not folders:
+        print("❌ No screenshot folders match the given paths")
+        sys.exit(1)
+
+    if args.ocr and not tesseract_available():
+        print("❌ Error: tesseract not found, needed for --ocr")
+        sys.exit(1)
+
+    jobs = max(1, min(args.jobs, len(folders)))
+    options = {
+        'crop': args.crop,
+        'output': os.path.expanduser(args.output) if args.output else None,
+        'title': args.title,
+        'keep_frames': args.keep_frames,
+        'split': args.split,
+        'compact': args.compact,
+        'ocr': args.ocr,
+        'track_frame': args.track_frame,
+        # Parallel books crop on one core each, so --jobs alone sets the number of processes
+        'workers': max(1, args.workers) if jobs == 1 else 1,
+        'summary_dir': os.path.expanduser(args.summary_dir) if args.summary_dir else None,
+    }
+
+    print(f"📚 Processing {len(folders)} books, {jobs} at a time")
+    problems = 0
+    start = time.perf_counter()
+    for summary in run_batch(folders, options, jobs):
+        name = os.path.basename(summary['folder'])
+        if summary['status'] != 'ok':
+            problems += 1
+        if summary['status'] == 'failed':
+            print(f"❌ {name}: {summary.get('error')} ({summary['summary_path']})")
+        else:
+            pdf = f", {summary['pages']} PDF pages" if summary['pdf'] else ""
+            failed = f", {len(summary['failed'])} failed" if summary['failed'] else ""
+            print(f"{'✅' if summary['status'] == 'ok' else '⚠️ '} {name}: "
+                  f"{summary['processed']}/{summary['images']} images{pdf}{failed} "
+                  f"in {summary['timings']['total']:.1f}s ({summary['summary_path']})")
+
+    print(f"\n📊 {len(folders) - problems}/{len(folders)} books processed without errors "
+          f"in {time.perf_counter() - start:.1f}s")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
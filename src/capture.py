@@ -6,15 +6,48 @@ Calculates iterations based on total pages and navigates with right arrow key
 Supports: macOS, Windows
 """
 
-import pyautogui
+import argparse
 import time
 import os
 from datetime import datetime
 import sys
 import platform
 
+try:
+    import pyautogui
+except Exception:
+    # Not installed, or no display to connect to (headless Linux); main() reports it
+    pyautogui = None
+
+from instrument import tracer
+from pagehash import dhash, hamming, signature, is_still
+from pipeline import CapturePipeline
+from process import get_pdf_path, parse_crop_box, parse_page_count
+from raw_store import RAW_STORE_NAME, RawStore, open_screenshot
+from save_queue import SaveQueue, SAVE_WORKERS
+from session import CaptureSession, find_unfinished_session, spread_filename
+from backends import BACKEND_NAMES, CroppedCapture, PreviewCapture, WindowCapture, WindowLocator, create_backend
+
 DELAY_TIMEOUT = 3
 
+# Screenshots whose hashes differ by at most this many bits show the same spread
+DUPLICATE_THRESHOLD = 4
+
+# How many times to wait longer for a page turn before giving up
+DUPLICATE_RETRIES = 3
+
+# Adaptive page-turn wait: poll the screen every SETTLE_INTERVAL seconds after
+# waiting at least SETTLE_MIN, until SETTLE_POLLS grabs in a row match (at most SETTLE_MAX)
+SETTLE_MIN = 0.2
+SETTLE_MAX = DELAY_TIMEOUT
+SETTLE_INTERVAL = 0.1
+
+# A slow page-turn animation changes little between two polls, but adds up over three
+SETTLE_POLLS = 3
+
+# Stage timings of a capture run are written next to the screenshots (.json and .csv)
+CAPTURE_TRACE = "capture_trace"
+
 def get_platform():
     """Detect the operating system"""
     system = platform.system()
@@ -49,7 +82,7 @@ def get_user_input():
             print(f"Pages per screenshot: 2")
             print(f"Screenshots needed: {iterations}")
 
-            confirm = input(f"\nThis will take approximately {iterations * DELAY_TIMEOUT / 60:.1f} minutes. Continue? (y/n): ")
+            confirm = input(f"\nThis will take up to {iterations * DELAY_TIMEOUT / 60:.1f} minutes. Continue? (y/n): ")
             if confirm.lower() in ['y', 'yes']:
                 return total_pages, iterations
             else:
@@ -63,146 +96,290 @@ def get_user_input():
             sys.exit(0)
 
 
-def create_screenshots_directory(total_pages):
+def create_screenshots_directory(total_pages, base_dir=None):
     """Create a directory to store book screenshots"""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
     # Base directory for all ebook suite files
-    base_dir = os.path.expanduser("~/Documents/ebook_suite")
+    base_dir = base_dir or os.path.expanduser("~/Documents/ebook_suite")
     screenshots_dir = os.path.join(base_dir, f"book_{timestamp}")
 
+    # Books captured back to back (capture_queue.py) may start within the same second
+    number = 1
+    while os.path.exists(screenshots_dir) and os.listdir(screenshots_dir):
+        number += 1
+        screenshots_dir = os.path.join(base_dir, f"book_{timestamp}_{number}")
+
     if not os.path.exists(screenshots_dir):
         os.makedirs(screenshots_dir, exist_ok=True)
 
     return screenshots_dir
 
 
+# Window capture used by get_active_window_screenshot, created on first use
+_default_capture = None
+
+
+def create_window_capture(backend_name='auto', replay_dir=None):
+    """
+    Choose the screen grab backend once and wrap it in a window capture
+    that caches the active window's bounds
+    """
+    backend = create_backend(backend_name, replay_dir)
+    system = 'replay' if backend.name == 'replay' else get_platform()
+    if system not in ('Darwin', 'Windows', 'replay'):
+        print(f"Warning: {system} detected, taking full screen screenshots")
+    return WindowCapture(backend, WindowLocator(system=system))
+
+
+def add_missing_spreads(pipeline, session, first_spread):
+    """Queue the spreads captured before a resume that aren't in the pipeline's PDF yet"""
+    names = [spread_filename(spread, session.total_pages) for spread in range(1, first_spread)]
+    start = names.index(pipeline.last_screenshot) + 1 if pipeline.last_screenshot in names else 0
+    if start < len(names):
+        print(f"📄 Adding {len(names) - start} spreads captured earlier to the PDF...")
+    for name in names[start:]:
+        with open_screenshot(os.path.join(session.screenshots_dir, name)) as img:
+            pipeline.put(img.convert('RGB'), name)
+
+
+def load_session(resume, output_dir=None):
+    """The capture session to resume: the one in the given folder, or the latest unfinished one"""
+    if resume is True:
+        base_dir = output_dir or os.path.expanduser("~/Documents/ebook_suite")
+        session = find_unfinished_session(base_dir)
+        if session is None:
+            print(f"❌ No unfinished capture found in {base_dir}")
+            sys.exit(1)
+        return session
+
+    session = CaptureSession.load(os.path.expanduser(resume))
+    if session is None:
+        print(f"❌ {resume} has no capture session to resume (only captures started with this version can be)")
+        sys.exit(1)
+    return session
+
+
+def detect_crop_box(window_capture):
+    """Detect the reading frame on a full window screenshot, or None if there is none"""
+    from frame_detect import detect_frame
+    return detect_frame(window_capture.grab())
+
+
 def get_active_window_screenshot():
     """
     Take a screenshot of the active window (cross-platform)
     Returns the screenshot as a PIL Image object
     """
-    system = get_platform()
+    global _default_capture
+    if _default_capture is None:
+        _default_capture = create_window_capture()
+    return _default_capture.grab()
 
-    try:
-        if system == 'Darwin':  # macOS
-            return _get_active_window_macos()
-        elif system == 'Windows':
-            return _get_active_window_windows()
-        else:
-            # Linux or other - fallback to full screen
-            print(f"Warning: {system} detected, taking full screen screenshot")
-            return pyautogui.screenshot()
-    except Exception as e:
-        print(f"Error getting window screenshot: {e}")
-        print("Falling back to full screen screenshot")
-        return pyautogui.screenshot()
-
-
-def _get_active_window_macos():
-    """Get active window screenshot on macOS using AppleScript"""
-    import subprocess
-
-    # AppleScript to get active window bounds
-    applescript = '''
-    tell application "System Events"
-        set frontApp to first application process whose frontmost is true
-        tell frontApp
-            try
-                set windowBounds to bounds of window 1
-                return windowBounds
-            on error
-                return "0,0,800,600"
-            end try
-        end tell
-    end tell
-    '''
-
-    result = subprocess.run(['osascript', '-e', applescript],
-                            capture_output=True, text=True)
-
-    if result.returncode == 0:
-        bounds = result.stdout.strip().split(', ')
-        if len(bounds) == 4:
-            x1, y1, x2, y2 = map(int, bounds)
-            width = x2 - x1
-            height = y2 - y1
-
-            # Take screenshot of the specified region
-            screenshot = pyautogui.screenshot(region=(x1, y1, width, height))
-            return screenshot
-
-    # Fallback: take full screen screenshot
-    print("Warning: Could not get window bounds, taking full screen")
-    return pyautogui.screenshot()
-
-
-def _get_active_window_windows():
-    """Get active window screenshot on Windows"""
-    try:
-        # Try using pygetwindow if available
-        import pygetwindow as gw
-
-        # Get the active window
-        active_window = gw.getActiveWindow()
-
-        if active_window:
-            # Get window position and size
-            left = active_window.left
-            top = active_window.top
-            width = active_window.width
-            height = active_window.height
-
-            # Take screenshot of the window region
-            screenshot = pyautogui.screenshot(region=(left, top, width, height))
-            return screenshot
+
+def grab_new_page(grab, previous_hash, sleep=time.sleep, screenshot=None):
+    """
+    Grab a screenshot that differs from the previous page
+    If the screen still shows the previous spread, wait progressively longer and retry
+    An already grabbed screenshot can be passed in to be checked first
+    Returns (screenshot, hash, retries); screenshot is None if the page never changed
+    """
+    if screenshot is None:
+        screenshot = grab()
+    with tracer.stage('hash'):
+        page_hash = dhash(screenshot)
+
+    retries = 0
+    while previous_hash is not None and hamming(page_hash, previous_hash) <= DUPLICATE_THRESHOLD:
+        if retries == DUPLICATE_RETRIES:
+            return None, page_hash, retries
+
+        retries += 1
+        wait = DELAY_TIMEOUT * retries
+        print(f"🔁 Page hasn't changed yet, waiting {wait} more seconds...", end=" - ")
+        sleep(wait)
+        screenshot = grab()
+        with tracer.stage('hash'):
+            page_hash = dhash(screenshot)
+
+    return screenshot, page_hash, retries
+
+
+def wait_for_settle(poll, previous_hash, sleep=time.sleep, clock=time.monotonic,
+                    min_wait=SETTLE_MIN, max_wait=SETTLE_MAX, interval=SETTLE_INTERVAL, polls=SETTLE_POLLS):
+    """
+    Wait until a page turn has finished instead of sleeping a fixed time
+    Polls the screen until `polls` grabs in a row show no visible change, neither from one
+    to the next nor from the first of them, and differ from the previous page
+    Returns (last polled image, seconds waited, whether the screen settled before max_wait)
+    """
+    start = clock()
+    sleep(min_wait)
+    first_signature = last_signature = signature(poll())
+    still_polls = 1
+
+    while clock() - start < max_wait:
+        sleep(interval)
+        image = poll()
+        current_signature = signature(image)
+
+        if is_still(current_signature, last_signature) and is_still(current_signature, first_signature):
+            still_polls += 1
         else:
-            print("Warning: Could not get active window, taking full screen")
-            return pyautogui.screenshot()
+            first_signature, still_polls = current_signature, 1
+        last_signature = current_signature
 
-    except ImportError:
-        # pygetwindow not available, try alternative method
-        print("Note: pygetwindow not installed, taking full screen screenshot")
-        print("For better window detection, install: pip install pygetwindow")
-        return pyautogui.screenshot()
-    except Exception as e:
-        print(f"Warning: Could not get window bounds ({e}), taking full screen")
-        return pyautogui.screenshot()
+        if still_polls >= polls:
+            turned = previous_hash is None or hamming(dhash(image), previous_hash) > DUPLICATE_THRESHOLD
+            if turned:
+                return image, clock() - start, True
 
+    return None, clock() - start, False
 
-def main():
-    """Main function to execute the book screenshot process"""
-    system = get_platform()
-    print(f"📚 Book Screenshot Tool ({system})")
-    print("=" * 40)
-    print("This script will help you capture screenshots of book pages")
-    print("from a browser where each screenshot shows 2 pages.")
-    print()
 
-    # Check if required modules are available
-    try:
-        import pyautogui
-        from PIL import Image
-    except ImportError as e:
-        print(f"Error: Required module not found - {e}")
-        print("Please install required modules:")
-        print("pip install pyautogui pillow")
-        sys.exit(1)
+def print_settle_summary(settle_times, timeouts):
+    """Print statistics about how long page turns took to settle"""
+    if not settle_times:
+        return
 
-    # Get user input
-    total_pages, iterations = get_user_input()
+    ordered = sorted(settle_times)
+    median = ordered[len(ordered) // 2]
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    total = sum(ordered)
+    fixed_total = DELAY_TIMEOUT * len(ordered)
 
-    # Setup
-    setup_pyautogui()
-    screenshots_dir = create_screenshots_directory(total_pages)
+    print(f"\n⏱️  Page turn settle time over {len(ordered)} turns:")
+    print(f"   median {median:.2f}s, p95 {p95:.2f}s, max {ordered[-1]:.2f}s")
+    print(f"   total waiting {total:.0f}s instead of {fixed_total:.0f}s with a fixed {DELAY_TIMEOUT}s delay")
+    if timeouts:
+        print(f"   {timeouts} turn(s) did not settle within {SETTLE_MAX}s")
 
-    print(f"\n📁 Screenshots will be saved to: {screenshots_dir}")
-    print("🌐 Make sure your browser window is active and on the first page...")
-    print("⏰ Starting in 15 seconds...")
-    time.sleep(15)
 
-    # Main loop
-    for i in range(1, iterations + 1):
+def _timed(stage, func):
+    """Wrap func so that every call is recorded as an event of the given stage"""
+    def timed(*args):
+        with tracer.stage(stage):
+            return func(*args)
+    return timed
+
+
+def locate_screen(session, grab):
+    """The recorded spread the screen shows, or None; returns (spread, screenshot, its hash)"""
+    screenshot = grab()
+    with tracer.stage('hash'):
+        page_hash = dhash(screenshot)
+    return session.locate(page_hash, DUPLICATE_THRESHOLD), screenshot, page_hash
+
+
+def return_to_spread(session, spread, grab, turn_page):
+    """
+    Turn the book to the spread a resumed capture starts at
+    The screen is matched against every recorded spread. Spreads recorded but never saved
+    (the capture was killed with them still queued) leave the book past the spread to start
+    at: it is turned back one page to find the last of them. If the screen shows no recorded
+    spread, and none was recorded from the spread to start at on, the book is assumed to be
+    open at it already
+    Returns (hash of the spread before it, screenshot of it if one was grabbed) for the capture loop
+    Raises RuntimeError if the book can't be found
+    """
+    shown, screenshot, page_hash = locate_screen(session, grab)
+    if shown is None and max(session.hashes, default=0) >= spread:
+        # The capture turns the page after recording a spread, so the book is at most one past
+        print("📖 The screen shows no captured spread, turning back one page...")
+        turn_page(page_hash, 'left')
+        shown, screenshot, page_hash = locate_screen(session, grab)
+        if shown is None:
+            raise RuntimeError("the screen shows none of the captured spreads, open the book at "
+                               f"spread {spread} and resume again")
+
+    if shown is None:
+        print(f"📖 The screen shows no captured spread, assuming the book is open at spread {spread}")
+        return None, screenshot
+    if shown == spread:
+        print(f"📖 The book is at spread {spread} already")
+        return session.hashes.get(spread - 1), screenshot
+
+    settled_screenshot = None
+    if shown > spread:
+        print(f"📖 The book is at spread {shown}, turning back to spread {spread}...")
+        for turned in range(shown, spread, -1):
+            settled_screenshot = turn_page(session.hashes.get(turned), 'left')
+    else:
+        print(f"📖 The book is at spread {shown}, turning to spread {spread}...")
+        for turned in range(shown, spread):
+            settled_screenshot = turn_page(session.hashes.get(turned))
+    return session.hashes.get(spread - 1), settled_screenshot
+
+
+def capture_pages(screenshots_dir, total_pages, iterations, grab=None, press_key=None,
+                  sleep=time.sleep, clock=time.monotonic, grab_preview=None, adaptive=True,
+                  save_workers=SAVE_WORKERS, raw=False, pipeline=None, session=None, first_spread=1):
+    """
+    Capture all page spreads into screenshots_dir
+    grab, press_key, sleep and clock can be replaced to run without a real screen and keyboard
+    With adaptive=True the page-turn wait polls grab_preview (a cheap grab of part of the page,
+    see backends.PreviewCapture; otherwise grab) until the screen settles, instead of sleeping
+    DELAY_TIMEOUT
+    Screenshots are saved as PNG by save_workers background threads, or with raw=True
+    appended uncompressed to the folder's raw store (see raw_store)
+    With a pipeline (see pipeline.CapturePipeline) every spread is also cropped and added
+    to the PDF during capture; it is closed here once the last spread is in
+    With a session (see session.CaptureSession) every captured spread is recorded in the
+    folder; capturing starts at first_spread, and when that is past the first spread the
+    book is first turned to it from the captured spread the screen shows
+    Every stage is timed; the trace is written to screenshots_dir and summarized at the end
+    (reset the tracer at the start of the run, it also holds the pipeline's events)
+    Returns the number of screenshots saved
+    """
+    poll = _timed('poll', grab_preview or grab or get_active_window_screenshot)
+    grab = _timed('grab', grab or get_active_window_screenshot)
+    press_key = _timed('press', press_key or pyautogui.press)
+    sleep = _timed('sleep', sleep)
+
+    previous_hash = None
+    settled_screenshot = None
+    retried = 0
+    settle_times = []
+    timeouts = 0
+    raw_store = RawStore(os.path.join(screenshots_dir, RAW_STORE_NAME)) if raw else None
+    save_queue = SaveQueue(workers=save_workers, raw_store=raw_store)
+
+    def turn_page(previous_hash, key='right'):
+        """Press right (or left) and wait for the spread; returns its screenshot if polling grabbed it"""
+        nonlocal timeouts
+        if adaptive and grab_preview is not None:
+            # Previews are compared with previews: a full screenshot's hash never matches one
+            preview = poll()
+            with tracer.stage('hash'):
+                previous_hash = dhash(preview)
+        press_key(key)
+        print("➡️  Moving to next page spread..." if key == 'right' else "⬅️  Moving back a page spread...")
+        if adaptive:
+            image, waited, settled = wait_for_settle(poll, previous_hash, sleep, clock)
+            settle_times.append(waited)
+            tracer.record('settle', waited)
+            if not settled:
+                timeouts += 1
+            print(f"⏳ Page settled after {waited:.2f} seconds" if settled
+                  else f"⏳ Page still changing after {waited:.2f} seconds")
+            # When polling used the full grab, the settled image is already the screenshot
+            if settled and grab_preview is None:
+                return image
+        else:
+            print(f"⏳ Waiting {DELAY_TIMEOUT} seconds for page to load...")
+            sleep(DELAY_TIMEOUT)
+            tracer.record('settle', DELAY_TIMEOUT)
+        return None
+
+    if session and first_spread > 1:
+        try:
+            previous_hash, settled_screenshot = return_to_spread(session, first_spread, grab, turn_page)
+        except RuntimeError as e:
+            print(f"❌ Not resuming: {e}")
+            # Capture nothing, the spreads would be saved under the wrong names
+            first_spread = iterations + 1
+
+    for i in range(first_spread, iterations + 1):
         try:
             # Calculate which pages this screenshot represents
             page_start = (i - 1) * 2 + 1
@@ -216,21 +393,29 @@ def main():
             print(f"📸 Screenshot {i}/{iterations} ({page_info})", end=" - ")
 
             # Take screenshot first (before pressing key for next iteration)
-            screenshot = get_active_window_screenshot()
+            screenshot, page_hash, retries = grab_new_page(grab, previous_hash, sleep, settled_screenshot)
+            settled_screenshot = None
+            retried += retries
+            if screenshot is None:
+                print(f"\n❌ The page did not change after {DUPLICATE_RETRIES} retries, stopping capture")
+                print("   Check that the book window is focused and the right arrow key turns the page")
+                break
 
             # Save screenshot with descriptive filename
-            filename = f"pages_{page_start:03d}-{page_end:03d}.png"
+            filename = spread_filename(i, total_pages)
             filepath = os.path.join(screenshots_dir, filename)
-            screenshot.save(filepath)
+            save_queue.put(screenshot, filepath)
+            if pipeline:
+                pipeline.put(screenshot, filename)
+            if session:
+                session.record(i, page_hash)
+            previous_hash = page_hash
 
-            print(f"Saved: {filename}")
+            print(f"Captured: {filename}")
 
             # Press right arrow key to go to next page spread (except on last iteration)
             if i < iterations:
-                pyautogui.press('right')
-                print("➡️  Moving to next page spread...")
-                print(f"⏳ Waiting {DELAY_TIMEOUT} seconds for page to load...")
-                time.sleep(DELAY_TIMEOUT)
+                settled_screenshot = turn_page(previous_hash)
 
         except KeyboardInterrupt:
             print(f"\n⚠️  Script interrupted by user at screenshot {i}")
@@ -239,10 +424,172 @@ def main():
             print(f"❌ Error at screenshot {i}: {e}")
             continue
 
+    # Make sure every captured page reaches the disk, also after Ctrl+C
+    print("\n💾 Finishing saving screenshots...")
+    save_queue.close()
+    save_queue.print_summary()
+    if session:
+        first_missing = session.next_spread()
+        if first_missing > iterations:
+            session.finish()
+        else:
+            print(f"\n⏸️  Capture stopped before spread {first_missing}/{iterations}, "
+                  f"continue it with: capture.py --resume {screenshots_dir}")
+    if pipeline:
+        print("📄 Finishing the PDF...")
+        pipeline.close()
+        pipeline.print_summary()
+
+    if retried:
+        print(f"\n🔁 {retried} extra wait(s) for slow page turns, no duplicate spreads saved")
+    print_settle_summary(settle_times, timeouts)
+    tracer.print_summary("Capture")
+    tracer.write(os.path.join(screenshots_dir, CAPTURE_TRACE))
+    return save_queue.saved
+
+
+def main(argv=None):
+    """Main function to execute the book screenshot process"""
+    parser = argparse.ArgumentParser(description="Capture book page spreads from the active window")
+    parser.add_argument('--backend', choices=BACKEND_NAMES, default='auto',
+                        help="screen grab backend (default: mss if installed, else pyautogui)")
+    parser.add_argument('--replay-dir', help="folder of screenshots to play back with --backend replay")
+    parser.add_argument('--crop', type=parse_crop_box, metavar='auto|L,T,R,B',
+                        help="grab only this box of the window (window screenshot pixels), "
+                             "or 'auto' to detect the reading frame; files are ready-cropped page frames")
+    parser.add_argument('--pages', type=parse_page_count,
+                        help="total number of pages in the book (skips the questions)")
+    parser.add_argument('--start-delay', type=float, default=15,
+                        help="seconds to wait before the first screenshot (default: 15)")
+    parser.add_argument('--output-dir', metavar='DIR',
+                        help="create the book_<timestamp> folder here (default: ~/Documents/ebook_suite)")
+    parser.add_argument('--pdf', metavar='DIR',
+                        help="crop the pages and write the PDF into DIR while capturing")
+    parser.add_argument('--title', help="book title for the PDF written with --pdf")
+    parser.add_argument('--split', action='store_true',
+                        help="with --pdf, split spreads into single pages trimmed to their content")
+    parser.add_argument('--compact', action='store_true',
+                        help="with --pdf, encode each page to match its content (black and white, gray or color)")
+    parser.add_argument('--raw', action='store_true',
+                        help="keep screenshots uncompressed in one screenshots.raw file (much less CPU, "
+                             "several times the disk space; convert with storage.py --to-png)")
+    parser.add_argument('--resume', nargs='?', const=True, metavar='FOLDER',
+                        help="continue an interrupted capture in its folder from the next spread, with "
+                             "its page count and settings (default: the latest unfinished one)")
+    args = parser.parse_args(argv)
+
+    system = get_platform()
+    print(f"📚 Book Screenshot Tool ({system})")
+    print("=" * 40)
+    print("This script will help you capture screenshots of book pages")
+    print("from a browser where each screenshot shows 2 pages.")
+    print()
+
+    # Check if required modules are available (replaying needs no screen or keyboard)
+    try:
+        from PIL import Image
+        if args.backend != 'replay':
+            import pyautogui
+    except ImportError as e:
+        print(f"Error: Required module not found - {e}")
+        print("Please install required modules:")
+        print("pip install pyautogui pillow")
+        sys.exit(1)
+
+    # Continue an interrupted capture with its own settings
+    session = None
+    first_spread = 1
+    if args.resume:
+        session = load_session(args.resume, args.output_dir)
+        total_pages, iterations = session.total_pages, session.iterations
+        first_spread = session.next_spread()
+        if first_spread > iterations:
+            session.finish()
+            print(f"✅ All {iterations} spreads of {session.screenshots_dir} are captured already")
+            return
+        for name in ('raw', 'pdf', 'title', 'split', 'compact'):
+            setattr(args, name, session.settings.get(name))
+        args.crop = tuple(session.settings['crop']) if session.settings.get('crop') else None
+        print(f"⏯️  Resuming {session.screenshots_dir} at spread {first_spread}/{iterations}")
+    # Get user input
+    elif args.pages:
+        total_pages, iterations = args.pages, (args.pages + 1) // 2
+    else:
+        total_pages, iterations = get_user_input()
+
+    # Setup
+    if args.backend != 'replay':
+        setup_pyautogui()
+    window_capture = create_window_capture(args.backend, args.replay_dir)
+    press_key = getattr(window_capture.backend, 'press', None)
+    print(f"🖥️  Screen grab backend: {window_capture.backend.name}")
+    if session:
+        screenshots_dir = session.screenshots_dir
+        print(f"\n📁 Screenshots will be added to: {screenshots_dir}")
+        print("🌐 Make sure your browser window is active and on the last captured page...")
+    else:
+        screenshots_dir = create_screenshots_directory(total_pages, args.output_dir)
+        print(f"\n📁 Screenshots will be saved to: {screenshots_dir}")
+        print("🌐 Make sure your browser window is active and on the first page...")
+    print(f"⏰ Starting in {args.start_delay:g} seconds...")
+    time.sleep(args.start_delay)
+
+    # Grab only the reading frame if requested
+    page_capture = window_capture
+    crop_box = args.crop
+    if crop_box == 'auto':
+        crop_box = detect_crop_box(window_capture)
+        if crop_box is None:
+            print("⚠️  Could not detect the reading frame, capturing the whole window")
+    if crop_box:
+        left, top, right, bottom = crop_box
+        print(f"✂️  Capturing only the frame: Left: {left}, Top: {top}, Right: {right}, Bottom: {bottom}")
+        page_capture = CroppedCapture(window_capture, crop_box)
+    # Page turns are watched on a strip through the middle of the pages
+    grab_preview = PreviewCapture(page_capture).grab
+
+    # Record the progress so an interrupted capture can be resumed
+    if session is None:
+        pdf_dir = os.path.abspath(os.path.expanduser(args.pdf)) if args.pdf else None
+        settings = {'crop': list(crop_box) if crop_box else None, 'raw': args.raw, 'pdf': pdf_dir,
+                    'title': args.title, 'split': args.split, 'compact': args.compact}
+        session = CaptureSession(screenshots_dir, total_pages, settings)
+        session.save()
+
+    # The trace covers the whole run, also the spreads a resumed pipeline catches up on
+    tracer.reset()
+
+    # Process the spreads while capturing if a PDF was asked for
+    pipeline = None
+    if args.pdf:
+        pdf_dir = os.path.expanduser(args.pdf)
+        os.makedirs(pdf_dir, exist_ok=True)
+        # A grab of only the frame needs no further cropping
+        frame_box = (0, 0, crop_box[2] - crop_box[0], crop_box[3] - crop_box[1]) if crop_box else None
+        # A resumed capture continues its PDF
+        pipeline = CapturePipeline(get_pdf_path(screenshots_dir, pdf_dir, args.title), args.title,
+                                   frame_box, split=args.split, compact=args.compact,
+                                   append=first_spread > 1)
+        if first_spread > 1:
+            add_missing_spreads(pipeline, session, first_spread)
+
+    # Main loop
+    try:
+        captured = capture_pages(screenshots_dir, total_pages, iterations,
+                                 grab=page_capture.grab, grab_preview=grab_preview, press_key=press_key,
+                                 raw=args.raw, pipeline=pipeline, session=session, first_spread=first_spread)
+    finally:
+        window_capture.backend.close()
+        if pipeline:
+            pipeline.close()
+
     print(f"\n✅ Book screenshot process completed!")
-    print(f"📊 Captured {min(i, iterations)} screenshots covering {total_pages} pages")
+    if first_spread > 1:
+        print(f"📊 Captured {captured} more screenshots of the {total_pages} pages")
+    else:
+        print(f"📊 Captured {captured} screenshots covering {total_pages} pages")
     print(f"📁 All files saved in: {screenshots_dir}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Capture Queue
+Captures a list of books one after another without any prompts, and processes each
+captured book into a PDF on a worker pool while the next one is being captured
+The queue's progress is saved next to the book list, so a stopped queue carries on
+where it was when it is started again: finished books are skipped, and a book that
+was stopped mid-capture is resumed from its next spread (see session.py)
+
+Usage: python3 src/capture_queue.py books.json [--jobs 1] [--start-delay 5]
+
+books.json lists the books in capture order; only "title" and "pages" are required:
+[
+  {"title": "First Book", "pages": 320, "window": "Kindle"},
+  {"title": "Second Book", "pages": 180, "window": "Chrome", "tab": 2,
+   "output": "~/Documents/ebooks/shop", "split": true, "compact": true}
+]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from backends import BACKEND_NAMES, PreviewCapture, activate_window
+from batch import process_book
+from capture import capture_pages, create_screenshots_directory, create_window_capture, setup_pyautogui
+from instrument import tracer
+from ocr import tesseract_available
+from process import parse_crop_box
+from session import CaptureSession
+
+BASE_DIR = "~/Documents/ebook_suite"
+DEFAULT_OUTPUT = "~/Documents/ebooks"
+STATE_VERSION = 1
+
+# Book settings besides title and pages, with their defaults
+BOOK_DEFAULTS = {
+    'window': None,
+    'tab': None,
+    'output': DEFAULT_OUTPUT,
+    'crop': 'auto',
+    'split': False,
+    'compact': False,
+    'ocr': None,
+    'track_frame': False,
+    'raw': False,
+}
+
+# Book states
+PENDING = 'pending'
+CAPTURING = 'capturing'
+PROCESSING = 'processing'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def load_books(path):
+    """
+    Read and check the book list, filling in the defaults
+    Raises ValueError describing the first problem found
+    """
+    try:
+        with open(path) as f:
+            entries = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Can't read {path}: {e}")
+    if not isinstance(entries, list):
+        raise ValueError(f"{path} should contain a list of books")
+
+    books = []
+    titles = set()
+    for number, entry in enumerate(entries, 1):
+        if not isinstance(entry, dict) or not entry.get('title'):
+            raise ValueError(f"Book {number} needs a title")
+        unknown = set(entry) - set(BOOK_DEFAULTS) - {'title', 'pages'}
+        if unknown:
+            raise ValueError(f"{entry['title']}: unknown setting(s) {', '.join(sorted(unknown))}")
+        if entry['title'] in titles:
+            raise ValueError(f"{entry['title']}: titles must be unique, they identify the books")
+        if not isinstance(entry.get('pages'), int) or entry['pages'] <= 0:
+            raise ValueError(f"{entry['title']}: 'pages' must be a positive number")
+
+        book = dict(BOOK_DEFAULTS, **entry)
+        book['output'] = os.path.expanduser(book['output'])
+        try:
+            book['crop'] = parse_crop_box(book['crop'])
+        except argparse.ArgumentTypeError as e:
+            raise ValueError(f"{entry['title']}: crop: {e}")
+        if book['ocr'] is True:
+            book['ocr'] = 'eng'
+        titles.add(book['title'])
+        books.append(book)
+    return books
+
+
+class QueueState:
+    """Progress of every book in the queue, by title, saved after every change"""
+
+    def __init__(self, path):
+        self.path = path
+        self.books = {}
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if data.get('version') == STATE_VERSION:
+                self.books = data['books']
+        except (OSError, ValueError):
+            pass
+
+    def get(self, title):
+        return self.books.setdefault(title, {'status': PENDING, 'folder': None})
+
+    def update(self, title, **fields):
+        entry = self.get(title)
+        entry.update(fields, updated=time.strftime('%Y-%m-%dT%H:%M:%S'))
+        self.save()
+
+    def save(self):
+        """Write the state atomically"""
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'version': STATE_VERSION, 'books': self.books}, f, indent=1)
+        os.replace(temp_path, self.path)
+
+
+def state_path(queue_path):
+    """Where the progress of a book list is kept: books.json -> books.state.json"""
+    return os.path.splitext(queue_path)[0] + ".state.json"
+
+
+def open_session(book, folder, base_dir):
+    """The book's capture session: the one started before, or a new one in a new folder"""
+    session = CaptureSession.load(folder) if folder else None
+    if session is None:
+        folder = create_screenshots_directory(book['pages'], base_dir)
+        settings = {'crop': None, 'raw': book['raw'], 'pdf': None, 'title': book['title'],
+                    'split': book['split'], 'compact': book['compact']}
+        session = CaptureSession(folder, book['pages'], settings)
+        session.save()
+    return session
+
+
+def capture_book(book, session, backend='auto', replay_dir=None, start_delay=5):
+    """
+    Bring the book's window to the front and capture it, or the rest of it
+    Returns True if every spread was captured
+    Raises RuntimeError if the window can't be found
+    """
+    if backend != 'replay' and (book['window'] or book['tab']):
+        if not activate_window(book['window'], book['tab']):
+            raise RuntimeError(f"Window '{book['window']}' not found")
+
+    window_capture = create_window_capture(backend, replay_dir)
+    press_key = getattr(window_capture.backend, 'press', None)
+    try:
+        if start_delay:
+            print(f"⏰ Starting in {start_delay:g} seconds...")
+            time.sleep(start_delay)
+        tracer.reset()
+        # Page turns are watched on a strip through the middle of the pages, like capture.py does
+        capture_pages(session.screenshots_dir, session.total_pages, session.iterations,
+                      grab=window_capture.grab, grab_preview=PreviewCapture(window_capture).grab,
+                      press_key=press_key, raw=book['raw'],
+                      session=session, first_spread=session.next_spread())
+    finally:
+        window_capture.backend.close()
+    return session.finished
+
+
+def processing_options(book):
+    """batch.process_book options for a book"""
+    return {
+        'crop': book['crop'],
+        'output': book['output'],
+        'title': book['title'],
+        'keep_frames': False,
+        'split': book['split'],
+        'compact': book['compact'],
+        'ocr': book['ocr'],
+        'track_frame': book['track_frame'],
+        'workers': 1,
+        'summary_dir': None,
+    }
+
+
+def collect_processed(running, state, wait=False):
+    """Record the books whose processing finished (all of them with wait=True)"""
+    finished = as_completed(list(running)) if wait else [future for future in list(running) if future.done()]
+    for future in finished:
+        title = running.pop(future)
+        try:
+            summary = future.result()
+        except Exception as e:
+            summary = {'status': 'failed', 'error': str(e), 'timings': {}}
+
+        if summary['status'] == 'failed':
+            state.update(title, status=FAILED, error=summary.get('error'))
+            print(f"\n❌ {title}: processing failed: {summary.get('error')}")
+            continue
+
+        state.update(title, status=DONE, error=None, pdf=summary['pdf'], summary=summary['summary_path'],
+                     process_seconds=summary['timings']['total'])
+        failed = f", {len(summary['failed'])} screenshots failed" if summary['failed'] else ""
+        print(f"\n{'✅' if summary['status'] == 'ok' else '⚠️ '} {title}: {summary['pages']} PDF pages "
+              f"in {summary['timings']['total']:.1f}s{failed}: {summary['pdf']}")
+
+
+def run_queue(books, state, base_dir=BASE_DIR, backend='auto', replay_dir=None, jobs=1, start_delay=5):
+    """
+    Capture the books in order and process each one on a pool of `jobs` worker processes
+    while the next one is captured
+    Books that are done are skipped; failed ones are tried again. The queue stops at a
+    capture that didn't finish (Ctrl+C, or the page stopped turning), after waiting for
+    the books being processed
+    Returns the number of books done
+    """
+    base_dir = os.path.expanduser(base_dir)
+    running = {}
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        try:
+            for number, book in enumerate(books, 1):
+                title = book['title']
+                entry = state.get(title)
+                if entry['status'] == DONE:
+                    print(f"⏭️  {title}: done already ({entry.get('pdf')})")
+                    continue
+
+                session = CaptureSession.load(entry['folder']) if entry['folder'] else None
+                if session is None or not session.finished:
+                    session = open_session(book, entry['folder'], base_dir)
+                    print(f"\n📚 Book {number}/{len(books)}: {title} ({book['pages']} pages)")
+                    print(f"📁 {session.screenshots_dir}")
+                    state.update(title, status=CAPTURING, folder=session.screenshots_dir)
+                    start = time.perf_counter()
+                    try:
+                        finished = capture_book(book, session, backend, replay_dir, start_delay)
+                    except RuntimeError as e:
+                        print(f"❌ {title}: {e}, skipping it")
+                        state.update(title, status=FAILED, error=str(e))
+                        continue
+                    state.update(title, capture_seconds=round(entry.get('capture_seconds', 0) +
+                                                              time.perf_counter() - start, 3))
+                    collect_processed(running, state)
+                    if not finished:
+                        print(f"\n⏸️  {title} was not captured completely, "
+                              f"run the queue again to continue it")
+                        break
+
+                # The PDF is written in the background while the next book is captured
+                print(f"\n🔄 {title}: processing in the background")
+                state.update(title, status=PROCESSING, error=None)
+                running[executor.submit(process_book, session.screenshots_dir, processing_options(book))] = title
+        except KeyboardInterrupt:
+            print("\n⚠️  Queue interrupted, run it again to continue")
+        finally:
+            if running:
+                print(f"\n⏳ Waiting for {len(running)} book(s) still processing...")
+            collect_processed(running, state, wait=True)
+
+    return sum(state.get(book['title'])['status'] == DONE for book in books)
+
+
+def print_status(books, state):
+    """Print the state of every book in the queue"""
+    for book in books:
+        entry = state.get(book['title'])
+        details = entry.get('pdf') or entry.get('error') or entry.get('folder') or ""
+        print(f"   {entry['status']:<11} {book['title']}  {details}")
+
+
+def main(argv=None):
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Capture and process a list of books without prompts")
+    parser.add_argument('queue', help="JSON file listing the books (title, pages, window, tab, output, ...)")
+    parser.add_argument('--backend', choices=BACKEND_NAMES, default='auto',
+                        help="screen grab backend (default: mss if installed, else pyautogui)")
+    parser.add_argument('--replay-dir', help="folder of screenshots to play back with --backend replay")
+    parser.add_argument('--base-dir', default=BASE_DIR,
+                        help=f"create the book_<timestamp> folders here (default: {BASE_DIR})")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="number of books processed at the same time (default: 1)")
+    parser.add_argument('--start-delay', type=float, default=5,
+                        help="seconds to wait after bringing a book to the front (default: 5)")
+    parser.add_argument('--status', action='store_true', help="only show the state of the queue")
+    args = parser.parse_args(argv)
+
+    try:
+        books = load_books(args.queue)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    state = QueueState(state_path(args.queue))
+
+    if args.status:
+        print_status(books, state)
+        return
+
+    if any(book['ocr'] for book in books) and not tesseract_available():
+        print("❌ Error: tesseract not found, needed for the books with OCR")
+        sys.exit(1)
+    if args.backend != 'replay':
+        try:
+            import pyautogui
+        except ImportError as e:
+            print(f"Error: Required module not found - {e}")
+            print("pip install pyautogui pillow")
+            sys.exit(1)
+        setup_pyautogui()
+
+    print(f"📚 Capture queue: {len(books)} books, processing {max(1, args.jobs)} at a time")
+    print("🌐 Open every book at its first page in its own window or tab")
+    start = time.perf_counter()
+    done = run_queue(books, state, args.base_dir, args.backend, args.replay_dir,
+                     max(1, args.jobs), args.start_delay)
+
+    print(f"\n📊 {done}/{len(books)} books done in {time.perf_counter() - start:.0f}s")
+    print_status(books, state)
+    sys.exit(0 if done == len(books) else 1)
+
+
+if __name__ == "__main__":
+    main()
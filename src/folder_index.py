@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Screenshot Folder Index
+Keeps a small index of the book folders in ~/Documents/ebook_suite (screenshot
+count, page range, screenshot size and how much of it was processed), so listing
+hundreds of folders on a slow or network drive doesn't read every one of them
+The base folder is scanned once; a book folder is only read again when its
+modification time, its raw store or its output folder changed
+"""
+
+import json
+import os
+
+from PIL import Image
+
+from manifest import Manifest
+from raw_store import RAW_STORE_NAME, list_screenshots, open_store
+from spread import parse_page_range
+
+BASE_DIR = "~/Documents/ebook_suite"
+INDEX_FILENAME = ".folder_index.json"
+INDEX_VERSION = 1
+
+
+def read_folder(folder_path, output_dir):
+    """Screenshot count, page range, screenshot size and processed count of one book folder"""
+    image_files = list_screenshots(folder_path)
+    page_ranges = [parse_page_range(os.path.basename(path)) for path in image_files]
+    page_ranges = [page_range for page_range in page_ranges if page_range]
+
+    size = None
+    store = open_store(folder_path)
+    if store is not None and store.size:
+        size = list(store.size)
+    elif image_files:
+        try:
+            # Only the PNG header is read
+            with Image.open(image_files[0]) as img:
+                size = list(img.size)
+        except OSError:
+            pass
+
+    processed = 0
+    if os.path.isdir(output_dir):
+        names = {os.path.basename(path) for path in image_files}
+        processed = len(names.intersection(Manifest(output_dir).entries))
+
+    return {
+        'images': len(image_files),
+        'first_page': min(first for first, _ in page_ranges) if page_ranges else None,
+        'last_page': max(last for _, last in page_ranges) if page_ranges else None,
+        'size': size,
+        'processed': processed,
+        'raw': store is not None,
+    }
+
+
+def describe_folder(folder):
+    """One-line summary of an index entry, e.g. for the folder menu"""
+    parts = [f"{folder['images']} screenshots"]
+    if folder['first_page'] is not None:
+        parts.append(f"pages {folder['first_page']}-{folder['last_page']}")
+    if folder['size']:
+        parts.append(f"{folder['size'][0]}x{folder['size'][1]}")
+    if folder['images']:
+        if folder['processed'] >= folder['images']:
+            parts.append("processed")
+        elif folder['processed']:
+            parts.append(f"{folder['processed']}/{folder['images']} processed")
+        else:
+            parts.append("not processed")
+    return ", ".join(parts)
+
+
+class FolderIndex:
+    """Cached details of the book folders in the base folder, see refresh()"""
+
+    def __init__(self, base_dir=BASE_DIR):
+        self.base_dir = os.path.expanduser(base_dir)
+        self.path = os.path.join(self.base_dir, INDEX_FILENAME)
+        self.folders = {}
+
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                self.folders = data.get('folders', {})
+        except (OSError, ValueError):
+            pass
+
+    def _change_key(self, name, entries, previous):
+        """Modification times that change whenever the folder's details may have changed"""
+        output_name = f"pdf_{name}"
+        key = [entries[name].stat().st_mtime_ns,
+               entries[output_name].stat().st_mtime_ns if output_name in entries else None]
+        # Appending to a raw store doesn't touch the folder, so the store itself is checked
+        if previous and previous['raw']:
+            try:
+                key.append(os.path.getsize(os.path.join(self.base_dir, name, RAW_STORE_NAME)))
+            except OSError:
+                key.append(None)
+        return key
+
+    def refresh(self):
+        """
+        Scan the base folder and re-read the book folders that changed
+        Returns the book folders (dicts with a 'name' and read_folder's details), oldest first
+        """
+        if not os.path.isdir(self.base_dir):
+            return []
+        with os.scandir(self.base_dir) as scan:
+            entries = {entry.name: entry for entry in scan if entry.is_dir()}
+
+        folders = {}
+        changed = False
+        for name in sorted(entries):
+            if not name.startswith('book_'):
+                continue
+            previous = self.folders.get(name)
+            key = self._change_key(name, entries, previous)
+            if previous and previous['key'] == key:
+                folders[name] = previous
+                continue
+
+            # The output folder is the one process.get_output_dir uses
+            folder = read_folder(os.path.join(self.base_dir, name), os.path.join(self.base_dir, f"pdf_{name}"))
+            folder['key'] = self._change_key(name, entries, folder)
+            folders[name] = folder
+            changed = True
+
+        if changed or folders.keys() != self.folders.keys():
+            self.folders = folders
+            self.save()
+        return [dict(folder, name=name) for name, folder in sorted(folders.items())]
+
+    def save(self):
+        """Write the index atomically; a read-only base folder just means no caching"""
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump({'version': INDEX_VERSION, 'folders': self.folders}, f, indent=1)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Reading Frame Detection
+Finds the gray frame around the book pages using NumPy row/column projections
+on a downsampled copy of the screenshot, then refines the edges at full resolution
+"""
+
+import numpy as np
+
+# Width of the downsampled copy used for the coarse search
+DETECT_WIDTH = 720
+
+# Gray levels the reading frame can have (excludes white pages, text and dark chrome)
+FRAME_GRAY_RANGE = (100, 244)
+
+# How far a pixel may be from the frame gray and still count as frame
+FRAME_TOLERANCE = 6
+
+# Minimum share of a row/column that must be frame gray for it to belong to the frame
+MIN_LINE_FRACTION = 0.02
+
+# A detected frame smaller than this share of the screenshot is rejected
+MIN_AREA_FRACTION = 0.25
+
+# How far (in pixels) detect_frame_near looks on both sides of an expected edge
+TRACK_MARGIN = 12
+
+
+def _longest_run(flags):
+    """Return (start, end) of the longest run of True values (end inclusive), or None"""
+    if not flags.any():
+        return None
+
+    padded = np.concatenate(([False], flags, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    starts, ends = edges[0::2], edges[1::2]
+    longest = np.argmax(ends - starts)
+    return int(starts[longest]), int(ends[longest]) - 1
+
+
+def _frame_gray(gray):
+    """Most common gray level inside FRAME_GRAY_RANGE, or None if there is none"""
+    low, high = FRAME_GRAY_RANGE
+    histogram = np.bincount(gray.ravel(), minlength=256)[low:high + 1]
+    if not histogram.any():
+        return None
+    return low + int(np.argmax(histogram))
+
+
+def _edge_band(img, start, stop, axis, span):
+    """Grayscale band of the full-resolution image between start and stop on one axis"""
+    # Only the band is converted to grayscale, never the whole screenshot
+    if axis == 0:
+        return np.asarray(img.crop((start, span[0], stop, span[1])).convert('L'))[::4]
+    return np.asarray(img.crop((span[0], start, span[1], stop)).convert('L'))[:, ::4]
+
+
+def _band_hits(band, frame_gray, axis):
+    """Positions along the band's axis whose line holds enough frame gray"""
+    mask = np.abs(band.astype(np.int16) - frame_gray) <= FRAME_TOLERANCE
+    return np.flatnonzero(mask.mean(axis=axis) >= MIN_LINE_FRACTION)
+
+
+def _refine_edge(img, frame_gray, coarse, scale, axis, span, first):
+    """
+    Find the exact full-resolution edge near a coarse estimate
+    Only a narrow band of the full-resolution image around the edge is examined;
+    span limits the band on the other axis to the frame
+    """
+    size = img.size[axis]
+    start = max(0, coarse - scale)
+    stop = min(size, coarse + scale)
+    if stop <= start:
+        return coarse
+
+    hits = _band_hits(_edge_band(img, start, stop, axis, span), frame_gray, axis)
+    if not len(hits):
+        return coarse
+
+    return start + int(hits[0] if first else hits[-1] + 1)
+
+
+def detect_frame(img):
+    """
+    Detect the gray reading frame in a PIL image
+    Returns (left, top, right, bottom) in full-resolution pixels, or None if no frame is found
+    """
+    if img.mode not in ('L', 'RGB'):
+        img = img.convert('RGB')
+    width, height = img.size
+    scale = max(1, width // DETECT_WIDTH)
+    small = np.asarray((img.reduce(scale) if scale > 1 else img).convert('L'))
+
+    frame_gray = _frame_gray(small)
+    if frame_gray is None:
+        return None
+
+    # Coarse search: rows and columns that contain enough frame gray
+    mask = np.abs(small.astype(np.int16) - frame_gray) <= FRAME_TOLERANCE
+    rows = _longest_run(mask.mean(axis=1) >= MIN_LINE_FRACTION)
+    if rows is None:
+        return None
+    cols = _longest_run(mask[rows[0]:rows[1] + 1].mean(axis=0) >= MIN_LINE_FRACTION)
+    if cols is None:
+        return None
+
+    left, right = cols[0] * scale, (cols[1] + 1) * scale
+    top, bottom = rows[0] * scale, (rows[1] + 1) * scale
+
+    # Refine every edge on a narrow full-resolution band around the coarse estimate
+    if scale > 1:
+        rows_span, cols_span = (top, bottom), (left, right)
+        left = _refine_edge(img, frame_gray, left, scale, 0, rows_span, True)
+        right = _refine_edge(img, frame_gray, right, scale, 0, rows_span, False)
+        top = _refine_edge(img, frame_gray, top, scale, 1, cols_span, True)
+        bottom = _refine_edge(img, frame_gray, bottom, scale, 1, cols_span, False)
+
+    if (right - left) * (bottom - top) < MIN_AREA_FRACTION * width * height:
+        return None
+
+    return left, top, right, bottom
+
+
+def detect_frame_near(img, expected, margin=TRACK_MARGIN):
+    """
+    Detect the reading frame of a screenshot when it is expected at (or within margin
+    pixels of) a known box, as on consecutive pages of a book
+    Only narrow bands around the expected edges are examined, several times faster than
+    detect_frame, which is used instead when an edge isn't found inside its band
+    """
+    if img.mode not in ('L', 'RGB'):
+        img = img.convert('RGB')
+    width, height = img.size
+    left, top, right, bottom = expected
+    edges = ((left, 0, (top, bottom), True), (right, 0, (top, bottom), False),
+             (top, 1, (left, right), True), (bottom, 1, (left, right), False))
+
+    bands = []
+    for edge, axis, span, first in edges:
+        start, stop = edge - margin, edge + margin
+        if start < 0 or stop > img.size[axis]:
+            return detect_frame(img)
+        bands.append(_edge_band(img, start, stop, axis, span))
+
+    # Half of every band lies inside the frame, so the frame gray is the most common gray
+    frame_gray = _frame_gray(np.concatenate([band.ravel() for band in bands]))
+    if frame_gray is None:
+        return detect_frame(img)
+
+    found = []
+    for (edge, axis, _, first), band in zip(edges, bands):
+        hits = _band_hits(band, frame_gray, axis)
+        # A band that is all frame or has no frame at all means the edge moved out of it
+        if not len(hits) or (hits[0] == 0 if first else hits[-1] == 2 * margin - 1):
+            return detect_frame(img)
+        found.append(edge - margin + int(hits[0] if first else hits[-1] + 1))
+
+    left, right, top, bottom = found
+    if (right - left) * (bottom - top) < MIN_AREA_FRACTION * width * height:
+        return detect_frame(img)
+    return left, top, right, bottom
+
+
+def consensus_frame(boxes):
+    """Combine several detected boxes into one by taking the median of every coordinate"""
+    boxes = [box for box in boxes if box is not None]
+    if not boxes:
+        return None
+    return tuple(int(value) for value in np.median(np.array(boxes), axis=0))
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Stage Instrumentation
+Records how long every stage of a capture or processing run takes (grab, sleep,
+save, decode, crop, encode, PDF writing, ...), how many bytes it handled and
+the peak memory so far. A run's trace is written as JSON and CSV and summarized
+with percentiles at the end
+Recording an event costs about a microsecond, so tracing is always on; set
+EBOOK_TRACE=0 to switch it off
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+TRACE_FIELDS = ['stage', 'start', 'seconds', 'bytes', 'peak_rss']
+
+
+def peak_rss():
+    """Peak resident memory of this process in bytes, or None where it can't be measured"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def percentile(ordered, fraction):
+    """Value at a fraction (0-1) of an already sorted list"""
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Tracer:
+    """
+    Collects (stage, start, seconds, bytes, peak_rss) events
+    start is wall-clock time, so events recorded in worker processes can be merged in
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.events = []
+
+    def reset(self):
+        """Forget all events, at the start of a run"""
+        self.events = []
+
+    @contextmanager
+    def stage(self, name, nbytes=None):
+        """Time the code in a with block as one event of a stage"""
+        if not self.enabled:
+            yield
+            return
+        wall = time.time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.events.append((name, wall, time.perf_counter() - start, nbytes, peak_rss()))
+
+    def record(self, name, seconds, nbytes=None):
+        """Add an event measured elsewhere (list.append is safe from several threads)"""
+        if self.enabled:
+            self.events.append((name, time.time() - seconds, seconds, nbytes, peak_rss()))
+
+    def drain(self):
+        """Return and forget the events so far, to send them from a worker to the main process"""
+        events, self.events = self.events, []
+        return events
+
+    def extend(self, events):
+        """Add events drained from a worker process"""
+        self.events.extend(events)
+
+    def summary(self):
+        """Per-stage statistics: count, total, percentiles and max in seconds, bytes, peak memory"""
+        stages = {}
+        for name, _, seconds, nbytes, rss in self.events:
+            stats = stages.setdefault(name, {'times': [], 'bytes': 0, 'peak_rss': 0})
+            stats['times'].append(seconds)
+            stats['bytes'] += nbytes or 0
+            stats['peak_rss'] = max(stats['peak_rss'], rss or 0)
+
+        summary = {}
+        for name, stats in stages.items():
+            ordered = sorted(stats['times'])
+            summary[name] = {
+                'count': len(ordered),
+                'total': sum(ordered),
+                'p50': percentile(ordered, 0.5),
+                'p90': percentile(ordered, 0.9),
+                'p99': percentile(ordered, 0.99),
+                'max': ordered[-1],
+                'bytes': stats['bytes'],
+                'peak_rss': stats['peak_rss'],
+            }
+        return summary
+
+    def write(self, path_prefix):
+        """Write the events to <path_prefix>.json (with the summary) and <path_prefix>.csv"""
+        if not self.events:
+            return
+        events = sorted(self.events, key=lambda event: event[1])
+        with open(path_prefix + ".json", 'w') as f:
+            json.dump({'summary': self.summary(),
+                       'events': [dict(zip(TRACE_FIELDS, event)) for event in events]}, f, indent=1)
+        with open(path_prefix + ".csv", 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(TRACE_FIELDS)
+            writer.writerows(events)
+
+    def print_summary(self, title):
+        """Print a percentile table of the stages, slowest total first"""
+        summary = self.summary()
+        if not summary:
+            return
+
+        print(f"\n📈 {title} time per stage (ms):")
+        print(f"   {'stage':<12} {'count':>6} {'total s':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8} {'MB':>8}")
+        for name, stats in sorted(summary.items(), key=lambda item: -item[1]['total']):
+            print(f"   {name:<12} {stats['count']:>6} {stats['total']:>8.2f} "
+                  f"{1000 * stats['p50']:>8.1f} {1000 * stats['p90']:>8.1f} {1000 * stats['p99']:>8.1f} "
+                  f"{1000 * stats['max']:>8.1f} {stats['bytes'] / 1e6:>8.1f}")
+        peak = max(stats['peak_rss'] for stats in summary.values())
+        if peak:
+            print(f"   peak memory {peak / 1e6:.0f} MB")
+
+
+# One tracer per process, shared by all modules of a run
+tracer = Tracer(enabled=os.environ.get('EBOOK_TRACE', '1') != '0')
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Processing Manifest
+Remembers, per output folder, which screenshots were already processed:
+the content hash of every source image, the settings used (crop box, spread
+splitting, OCR) and the outputs produced
+Encoded PDF pages are cached next to it, so a re-run only crops new or changed
+screenshots and rebuilds the PDF from the cached page streams
+"""
+
+import hashlib
+import json
+import os
+
+from ocr import OCR_CACHE_DIR, OcrResult, load_cached
+from pdf_writer import EncodedPage
+from raw_store import stored_digest
+
+MANIFEST_FILENAME = "manifest.json"
+PAGE_CACHE_DIR = "page_cache"
+MANIFEST_VERSION = 4
+
+
+def file_digest(path):
+    """SHA-1 of a file's content"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _file_stat(path):
+    """(size, mtime_ns) of a source file; (None, None) for screenshots kept in a raw store"""
+    if not os.path.exists(path):
+        return None, None
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+class Manifest:
+    """Per-folder record of processed screenshots and their cached outputs"""
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_FILENAME)
+        self.cache_dir = os.path.join(output_dir, PAGE_CACHE_DIR)
+        self.ocr_cache_dir = os.path.join(output_dir, OCR_CACHE_DIR)
+        self.entries = {}
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION:
+                    self.entries = data.get('images', {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Ignoring unreadable manifest {self.path}: {e}")
+
+    def digest(self, image_path):
+        """
+        Content hash of a source image
+        The stored hash is reused while the file's size and modification time are unchanged
+        Screenshots in a raw store carry the hash of their pixels, so they are never read
+        """
+        if not os.path.exists(image_path):
+            return stored_digest(image_path)
+        stat = os.stat(image_path)
+        entry = self.entries.get(os.path.basename(image_path))
+        if entry and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+            return entry['hash']
+        return file_digest(image_path)
+
+    def lookup(self, image_path, digest, settings, need_frame, need_page):
+        """
+        Return the entry for an image if its cached outputs are still valid, else None
+        settings is a JSON-compatible dict of everything that affects the output
+        """
+        entry = self.entries.get(os.path.basename(image_path))
+        if not entry or entry['hash'] != digest or entry['settings'] != settings:
+            return None
+        if need_frame and not (entry['frames'] and all(
+                os.path.exists(os.path.join(self.output_dir, frame)) for frame in entry['frames'])):
+            return None
+        if need_page and not (entry['pages'] and all(
+                os.path.exists(os.path.join(self.cache_dir, page['file'])) and
+                (not page['text'] or os.path.exists(os.path.join(self.ocr_cache_dir, f"{page['text']}.json")))
+                for page in entry['pages'])):
+            return None
+        return entry
+
+    def record(self, image_path, digest, settings, frame_files, pages, box=None):
+        """
+        Store the outputs for a processed image, caching the encoded PDF pages if there are any
+        box is the crop box the image was cut at, kept so drift reports work on cached pages
+        """
+        size, mtime_ns = _file_stat(image_path)
+        name = os.path.basename(image_path)
+
+        # Outputs from an earlier run of the same image and settings stay valid
+        previous = self.entries.get(name)
+        if not previous or previous['hash'] != digest or previous['settings'] != settings:
+            previous = {}
+
+        entry = {
+            'hash': digest,
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'settings': settings,
+            'frames': frame_files or previous.get('frames', []),
+            'pages': previous.get('pages', []),
+            'box': list(box) if box else previous.get('box'),
+        }
+
+        if pages:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            entry['pages'] = []
+            for number, page in enumerate(pages, 1):
+                page_file = f"{digest}_{number}.page"
+                with open(os.path.join(self.cache_dir, page_file), 'wb') as f:
+                    f.write(page.data)
+                entry['pages'].append({
+                    'file': page_file,
+                    'width': page.width,
+                    'height': page.height,
+                    'color_space': page.color_space,
+                    'bits': page.bits,
+                    'filter': page.filter,
+                    'params': page.params.decode('ascii') if page.params else None,
+                    'dpi': page.dpi,
+                    'text': page.text.key if page.text else None,
+                })
+
+        self.entries[name] = entry
+
+    def update_source(self, image_path, old_digest, new_digest):
+        """
+        Keep an entry valid after its source was re-encoded without changing any pixel
+        (see storage.py); entries for other content are left alone
+        """
+        entry = self.entries.get(os.path.basename(image_path))
+        if entry and entry['hash'] == old_digest:
+            size, mtime_ns = _file_stat(image_path)
+            entry.update(hash=new_digest, size=size, mtime_ns=mtime_ns)
+
+    def load_pages(self, entry):
+        """Read the cached encoded pages of an entry back from disk"""
+        pages = []
+        for info in entry['pages']:
+            with open(os.path.join(self.cache_dir, info['file']), 'rb') as f:
+                data = f.read()
+            params = info['params'].encode('ascii') if info['params'] else None
+            text = None
+            if info['text']:
+                text = OcrResult(load_cached(self.ocr_cache_dir, info['text']) or [], info['text'], True, 0.0)
+            pages.append(EncodedPage(data, info['width'], info['height'], info['color_space'],
+                                     info['bits'], info['filter'], params, info['dpi'], text))
+        return pages
+
+    def prune(self, image_files):
+        """Forget screenshots that no longer exist and delete their cached pages"""
+        keep = {os.path.basename(path) for path in image_files}
+        for name in list(self.entries):
+            if name not in keep:
+                entry = self.entries.pop(name)
+                in_use = {page['file'] for other in self.entries.values() for page in other['pages']}
+                for page in entry['pages']:
+                    if page['file'] not in in_use:
+                        try:
+                            os.remove(os.path.join(self.cache_dir, page['file']))
+                        except OSError:
+                            pass
+
+    def save(self):
+        """Write the manifest atomically"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'images': self.entries}, f, indent=1)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+OCR Text Layer
+Recognizes the words on a cropped page with the local Tesseract engine (run as
+a subprocess) and keeps their positions, so the PDF writer can lay invisible
+text over the page image and the PDF becomes searchable
+Results are cached per page content hash, so re-runs skip pages already done
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from collections import namedtuple
+
+TESSERACT = "tesseract"
+OCR_CACHE_DIR = "ocr_cache"
+
+# Words recognized with a lower confidence (0-100) are left out of the text layer
+MIN_CONFIDENCE = 30
+
+# Recognized words of a page: list of (text, left, top, width, height) in image pixels
+# key is the cache key of the page, cached tells if it came from the cache
+OcrResult = namedtuple('OcrResult', 'words key cached seconds')
+
+
+def tesseract_available():
+    """True if the tesseract command can be found"""
+    return shutil.which(TESSERACT) is not None
+
+
+def page_key(img, lang):
+    """Cache key for a page: hash of its pixels and the OCR language"""
+    digest = hashlib.sha1(img.tobytes())
+    digest.update(f"{img.mode} {img.size} {lang}".encode('ascii'))
+    return digest.hexdigest()
+
+
+def parse_tsv(tsv):
+    """Words with their boxes from Tesseract's TSV output"""
+    words = []
+    lines = tsv.splitlines()
+    if not lines:
+        return words
+    columns = lines[0].split('\t')
+    for line in lines[1:]:
+        values = line.split('\t')
+        if len(values) != len(columns):
+            continue
+        row = dict(zip(columns, values))
+        text = row['text'].strip()
+        if row['level'] != '5' or not text or float(row['conf']) < MIN_CONFIDENCE:
+            continue
+        words.append((text, int(row['left']), int(row['top']), int(row['width']), int(row['height'])))
+    return words
+
+
+def run_tesseract(img, lang='eng'):
+    """Recognize the words on an image, returns a list of (text, left, top, width, height)"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        image_path = os.path.join(temp_dir, "page.png")
+        img.save(image_path)
+        result = subprocess.run([TESSERACT, image_path, 'stdout', '-l', lang, 'tsv'],
+                                capture_output=True, text=True, encoding='utf-8')
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"tesseract exited with {result.returncode}")
+    return parse_tsv(result.stdout)
+
+
+def load_cached(cache_dir, key):
+    """Words cached under key, or None"""
+    try:
+        with open(os.path.join(cache_dir, f"{key}.json"), encoding='utf-8') as f:
+            return [tuple(word) for word in json.load(f)]
+    except (OSError, ValueError):
+        return None
+
+
+def ocr_page(img, cache_dir, lang='eng'):
+    """
+    Recognize a page, using the cache in cache_dir when the same page was done before
+    Returns an OcrResult; on errors the page simply gets no text (and nothing is cached)
+    """
+    start = time.perf_counter()
+    key = page_key(img, lang)
+    words = load_cached(cache_dir, key)
+    if words is not None:
+        return OcrResult(words, key, True, time.perf_counter() - start)
+
+    try:
+        words = run_tesseract(img, lang)
+    except Exception as e:
+        print(f"⚠️  OCR failed: {e}")
+        return OcrResult([], None, False, time.perf_counter() - start)
+
+    # Written under a temporary name first, as several workers share the cache
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = os.path.join(cache_dir, f"{key}.{os.getpid()}.tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(words, f, ensure_ascii=False)
+    os.replace(temp_path, os.path.join(cache_dir, f"{key}.json"))
+    return OcrResult(words, key, False, time.perf_counter() - start)
+
+
+class OcrStats:
+    """Counts OCR'd pages and cache hits for the end-of-run report"""
+
+    def __init__(self):
+        self.pages = 0
+        self.hits = 0
+        self.seconds = 0.0
+        self.start = time.perf_counter()
+
+    def add(self, result):
+        self.pages += 1
+        self.hits += result.cached
+        self.seconds += result.seconds
+
+    def print_summary(self):
+        if not self.pages:
+            return
+        elapsed = time.perf_counter() - self.start
+        print(f"🔤 OCR: {self.pages} pages at {self.pages / elapsed:.1f} pages/s, "
+              f"cache hit rate {100 * self.hits / self.pages:.0f}% "
+              f"({self.seconds:.1f}s of recognition across workers)")
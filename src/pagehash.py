@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Perceptual Page Hash
+Difference hash (dHash) of a screenshot, used to notice when a page turn
+did not happen yet and the screen still shows the previous spread
+"""
+
+from PIL import Image, ImageChops
+
+# 16x16 gradients: 8x8 is too coarse to tell two pages of plain text apart
+HASH_SIZE = 16
+
+# Pixels sampled per hash cell in each direction
+SAMPLES = 8
+
+# Point-sampled thumbnail used to check that the screen has stopped changing
+SIGNATURE_SIZE = (128, 80)
+
+# Largest per-pixel gray difference between two signatures of a still screen
+STILL_TOLERANCE = 8
+
+
+def dhash(img, hash_size=HASH_SIZE):
+    """
+    Compute the difference hash of a PIL image as an integer
+    Each bit says whether a pixel is brighter than its right neighbour
+    on a (hash_size + 1) x hash_size grayscale thumbnail
+    """
+    # Point-sample a SAMPLES x SAMPLES grid per cell, then average it: much cheaper than
+    # filtering every pixel of a 5K screenshot and still sensitive to page changes
+    grid = img.resize(((hash_size + 1) * SAMPLES, hash_size * SAMPLES), Image.NEAREST)
+    small = grid.resize((hash_size + 1, hash_size), Image.BOX).convert('L')
+    pixels = small.tobytes()
+
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(offset, offset + hash_size):
+            value = (value << 1) | (pixels[col] > pixels[col + 1])
+    return value
+
+
+def hamming(hash_a, hash_b):
+    """Number of differing bits between two hashes"""
+    return bin(hash_a ^ hash_b).count('1')
+
+
+def signature(img, size=SIGNATURE_SIZE):
+    """
+    Small grayscale thumbnail sampled at fixed points of the image
+    Unlike the hash it changes with any visible change, e.g. mid-way through a page turn animation
+    """
+    return img.resize(size, Image.NEAREST).convert('L')
+
+
+def is_still(signature_a, signature_b, tolerance=STILL_TOLERANCE):
+    """True if two signatures of the same screen region show no visible change"""
+    if signature_a.size != signature_b.size:
+        return False
+    return ImageChops.difference(signature_a, signature_b).getextrema()[1] <= tolerance
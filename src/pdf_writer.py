@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""
+Streaming PDF Writer
+Writes a PDF one page at a time: every page is encoded, written to disk and
+released before the next one is loaded, so memory use stays flat no matter
+how many pages the book has
+The cross-reference table is written in pieces as incremental updates, so a
+run that stops midway leaves a valid PDF of the pages written so far, and
+more pages can be appended to an existing PDF later
+"""
+
+import io
+import os
+import re
+from collections import namedtuple
+
+import numpy as np
+from PIL import Image, features
+
+
+# Encoded image stream for one page, ready to be written into the PDF
+# params holds the /DecodeParms dictionary (if any), dpi the page's resolution (None: writer default)
+# text is an ocr.OcrResult whose words become an invisible, searchable text layer
+EncodedPage = namedtuple('EncodedPage', 'data width height color_space bits filter params dpi text',
+                         defaults=(None, None, None))
+
+# Pages written between two checkpoints (see PdfWriter), each one a complete PDF on disk
+CHECKPOINT_PAGES = 20
+
+# Block size for searching an existing PDF backwards for its last complete update
+_SCAN_BLOCK = 65536
+
+# Document info entry with a string value, as written by _pdf_string
+_INFO_ENTRY = re.compile(rb'/(\w+)\s*(\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f]*>)', re.S)
+
+# Escape sequences of PDF literal strings besides octal codes and line continuations
+_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f'}
+
+# Average Helvetica glyph width in text space units, used to stretch words to their boxes
+_AVERAGE_GLYPH_WIDTH = 0.5
+
+# Pages are classified on a copy point-sampled down by this factor
+CLASSIFY_SCALE = 4
+
+# A page is color if more than this share of its pixels is clearly colored
+COLOR_PIXEL_FRACTION = 0.005
+
+# Channel spread (max - min of R, G, B) above which a pixel counts as colored
+COLOR_CHROMA = 24
+
+# A gray page is bilevel (black text on white) if at most this share of pixels is mid-gray
+BILEVEL_MIDTONE_FRACTION = 0.06
+
+# Gray levels between these count as mid-gray; bilevel pages are thresholded at their middle
+BILEVEL_RANGE = (64, 192)
+
+# Lookup table turning a grayscale page into black and white
+_BILEVEL_LUT = [255 if value >= sum(BILEVEL_RANGE) // 2 else 0 for value in range(256)]
+
+
+def classify_page(img):
+    """
+    Classify a page as 'bilevel' (black text on white), 'gray' or 'color'
+    Works on a point-sampled copy: a chroma check for color, then the share of mid-gray pixels
+    Point sampling (instead of averaging) keeps the sharp edges of text from turning gray
+    """
+    width, height = img.size
+    sample = img.resize((max(1, width // CLASSIFY_SCALE), max(1, height // CLASSIFY_SCALE)),
+                        Image.NEAREST)
+    if sample.mode not in ('1', 'L'):
+        pixels = np.asarray(sample.convert('RGB'))
+        chroma = pixels.max(axis=2).astype(np.int16) - pixels.min(axis=2)
+        if (chroma > COLOR_CHROMA).mean() > COLOR_PIXEL_FRACTION:
+            return 'color'
+
+    histogram = sample.convert('L').histogram()
+    low, high = BILEVEL_RANGE
+    midtones = sum(histogram[low:high + 1])
+    if midtones <= BILEVEL_MIDTONE_FRACTION * sample.width * sample.height:
+        return 'bilevel'
+    return 'gray'
+
+
+def _encode_jpeg(img, color_space, dpi):
+    buffer = io.BytesIO()
+    img.save(buffer, 'JPEG')
+    width, height = img.size
+    return EncodedPage(buffer.getvalue(), width, height, color_space, 8, 'DCTDecode', None, dpi)
+
+
+def _encode_ccitt(img, dpi):
+    """Encode a page as black and white with CCITT Group 4, like fax machines and scanners do"""
+    bilevel = img.convert('L').point(_BILEVEL_LUT, '1')
+    width, height = bilevel.size
+
+    # Let libtiff do the Group 4 encoding, then take the single strip out of the TIFF
+    buffer = io.BytesIO()
+    bilevel.save(buffer, 'TIFF', compression='group4', strip_size=(width + 7) // 8 * height)
+    with Image.open(buffer) as tiff:
+        offset = tiff.tag_v2[273][0]
+        length = tiff.tag_v2[279][0]
+    data = buffer.getvalue()[offset:offset + length]
+
+    params = b'<< /K -1 /Columns %d /Rows %d /BlackIs1 true >>' % (width, height)
+    return EncodedPage(data, width, height, 'DeviceGray', 1, 'CCITTFaxDecode', params, dpi)
+
+
+def encode_page(img, compact=False, dpi=None):
+    """
+    Encode a PIL image as a PDF image stream
+    By default pages are stored as RGB JPEG (DCTDecode), like Pillow's own PDF plugin does
+    With compact=True each page gets the encoding that fits its content: CCITT Group 4
+    for black and white text, grayscale JPEG for gray pages and RGB JPEG for color pages
+    dpi is the page's resolution, used for its physical size in the PDF
+    """
+    if compact:
+        kind = classify_page(img)
+        if kind == 'bilevel' and features.check('libtiff'):
+            return _encode_ccitt(img, dpi)
+        if kind != 'color':
+            return _encode_jpeg(img.convert('L'), 'DeviceGray', dpi)
+
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    return _encode_jpeg(img, 'DeviceRGB', dpi)
+
+
+def _pdf_string(text):
+    """Format text as a PDF string object (UTF-16 hex string for non-ASCII text)"""
+    try:
+        raw = text.encode('ascii')
+    except UnicodeEncodeError:
+        return b'<FEFF' + text.encode('utf-16-be').hex().upper().encode('ascii') + b'>'
+
+    escaped = raw.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+    return b'(' + escaped + b')'
+
+
+def _text_layer(words, image_height, scale):
+    """
+    Content stream drawing OCR words invisibly (render mode 3) over the page image
+    Each word is scaled to cover its box, so selecting text highlights the right spot
+    """
+    commands = [b'BT 3 Tr']
+    for text, left, top, width, height in words:
+        raw = text.encode('cp1252', errors='replace')
+        escaped = raw.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+        size = max(1.0, height * scale)
+        stretch = 100.0 * width * scale / (_AVERAGE_GLYPH_WIDTH * size * len(raw))
+        # The baseline sits a little above the bottom of the box, where descenders end
+        baseline = (image_height - top - height) * scale + 0.2 * size
+        commands.append(b'/F1 %.2f Tf %.2f Tz 1 0 0 1 %.2f %.2f Tm (%s) Tj' % (
+            size, stretch, left * scale, baseline, escaped))
+    commands.append(b'ET')
+    return b'\n'.join(commands)
+
+
+def _unescape(match):
+    """Bytes of one escape sequence of a PDF literal string"""
+    escape = match.group(1)
+    if escape[:1].isdigit():
+        return bytes([int(escape, 8) & 0xFF])
+    if escape in (b'\r\n', b'\r', b'\n'):
+        # A backslash at the end of a line continues the string on the next one
+        return b''
+    return _ESCAPES.get(escape, escape)
+
+
+def _read_pdf_string(raw):
+    """
+    Text of a PDF string object: a hex string, as _pdf_string writes non-ASCII text, or
+    a literal string with escapes (e.g. Pillow's PDFs); UTF-16 if it starts with a BOM
+    """
+    if raw.startswith(b'<'):
+        data = bytes.fromhex(raw[1:-1].decode('ascii'))
+    else:
+        data = re.sub(rb'\\([0-7]{1,3}|\r\n|.)', _unescape, raw[1:-1], flags=re.S)
+    if data.startswith(b'\xfe\xff'):
+        return data[2:].decode('utf-16-be')
+    return data.decode('latin-1')
+
+
+def _ref(body, key):
+    """Object number of an indirect reference entry (/Key N 0 R) of a dictionary, or None"""
+    match = re.search(rb'/' + key + rb'\s+(\d+)\s+\d+\s+R', body)
+    return int(match.group(1)) if match else None
+
+
+def _last_update(fp):
+    """
+    Find the last complete update of a PDF: its last %%EOF whose startxref points at a
+    cross-reference table. Anything after it is a page that was cut short
+    Returns (offset just past that %%EOF, offset of its cross-reference table)
+    """
+    fp.seek(0, os.SEEK_END)
+    end = fp.tell()
+    while end > 0:
+        start = max(0, end - _SCAN_BLOCK)
+        fp.seek(start)
+        block = fp.read(end - start)
+        found = block.rfind(b'%%EOF')
+        while found != -1:
+            eof = start + found
+            fp.seek(max(0, eof - 64))
+            match = re.search(rb'startxref\s+(\d+)\s*$', fp.read(eof - max(0, eof - 64)))
+            if match:
+                fp.seek(int(match.group(1)))
+                if fp.read(4) == b'xref':
+                    fp.seek(eof + 5)
+                    newline = fp.read(2)
+                    return eof + 5 + len(newline) - len(newline.lstrip(b'\r\n')), int(match.group(1))
+            found = block.rfind(b'%%EOF', 0, found)
+        if start == 0:
+            break
+        # Overlap the blocks so a marker split between them is found
+        end = start + 4
+    raise ValueError("no complete cross-reference table found")
+
+
+def _read_xref(fp, xref_offset):
+    """Offsets of the objects in use and the latest trailer, following the /Prev chain of updates"""
+    offsets = {}
+    trailer = None
+    seen = set()
+    while xref_offset is not None and xref_offset not in seen:
+        seen.add(xref_offset)
+        fp.seek(xref_offset)
+        if fp.readline().strip() != b'xref':
+            raise ValueError("cross-reference streams are not supported")
+        while True:
+            line = fp.readline()
+            if not line:
+                raise ValueError("cross-reference table without trailer")
+            if line.startswith(b'trailer'):
+                break
+            first, count = map(int, line.split())
+            for obj_id in range(first, first + count):
+                entry = fp.read(20)
+                # The newest update is read first and wins
+                if entry[17:18] == b'n':
+                    offsets.setdefault(obj_id, int(entry[:10]))
+        section = line + fp.read(4096)
+        section = section[:section.find(b'startxref')]
+        trailer = trailer or section
+        prev = re.search(rb'/Prev\s+(\d+)', section)
+        xref_offset = int(prev.group(1)) if prev else None
+    return offsets, trailer
+
+
+def _read_object(fp, offset):
+    """Bytes of an object, from its 'N 0 obj' line to its 'endobj'"""
+    fp.seek(offset)
+    data = b''
+    while b'endobj' not in data:
+        chunk = fp.read(_SCAN_BLOCK)
+        if not chunk:
+            break
+        data += chunk
+    return data[:data.find(b'endobj')]
+
+
+class PdfWriter:
+    """
+    Minimal PDF writer that writes every page as soon as it is added
+    Only the byte offsets of the written objects are kept in memory
+    Every checkpoint_pages pages (and on close) a checkpoint appends the page tree and a
+    cross-reference table for the pages written since the last one, as an incremental
+    update: the file on disk is a complete PDF of the pages up to the last checkpoint,
+    even if the run is killed halfway through a page
+    With append=True the pages are added to an existing PDF the same way, after its
+    last complete update, without rewriting it
+    """
+
+    def __init__(self, output_path, title=None, author=None, subject=None, resolution=100.0,
+                 append=False, checkpoint_pages=CHECKPOINT_PAGES):
+        self.output_path = output_path
+        self.resolution = resolution
+        self.checkpoint_pages = checkpoint_pages
+        self.info = {}
+        self.page_count = 0
+        self.existing_pages = 0
+        self.checkpoints = 0
+
+        # Objects written since the last checkpoint, and the pages they added
+        self._offsets = {}
+        self._new_page_ids = []
+        self._group_id = None
+        self._kids = []
+        self._font_id = None
+        self._prev_xref = None
+
+        if append and os.path.exists(output_path) and os.path.getsize(output_path):
+            self._fp = open(output_path, 'r+b')
+            try:
+                self._load()
+            except (ValueError, IndexError, KeyError) as e:
+                self._fp.close()
+                raise ValueError(f"Can't append to {output_path}: {e}")
+        else:
+            self._fp = open(output_path, 'wb')
+            self._next_id = 1
+            # Catalog and page tree are written at the first checkpoint, but pages need to reference them
+            self._catalog_id = self._reserve_id()
+            self._pages_id = self._reserve_id()
+            self._info_id = None
+            self._fp.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+        for key, value in (('Title', title), ('Author', author), ('Subject', subject)):
+            if value:
+                self.info[key] = value
+
+    def _load(self):
+        """Read the page tree and document info of the existing PDF and cut off an unfinished page"""
+        end, xref_offset = _last_update(self._fp)
+        offsets, trailer = _read_xref(self._fp, xref_offset)
+        self._fp.seek(end)
+        self._fp.truncate()
+        self._fp.seek(end - 1)
+        if self._fp.read(1) != b'\n':
+            self._fp.write(b'\n')
+
+        self._next_id = int(re.search(rb'/Size\s+(\d+)', trailer).group(1))
+        self._catalog_id = _ref(trailer, b'Root')
+        self._pages_id = _ref(_read_object(self._fp, offsets[self._catalog_id]), b'Pages')
+        pages = _read_object(self._fp, offsets[self._pages_id])
+        kids = re.search(rb'/Kids\s*\[(.*?)\]', pages, re.S).group(1)
+        self._kids = [int(kid) for kid in re.findall(rb'(\d+)\s+\d+\s+R', kids)]
+        self.existing_pages = int(re.search(rb'/Count\s+(\d+)', pages).group(1))
+
+        self._info_id = _ref(trailer, b'Info')
+        if self._info_id in offsets:
+            body = _read_object(self._fp, offsets[self._info_id])
+            body = body[body.find(b'<<'):]
+            for key, value in _INFO_ENTRY.findall(body):
+                self.info[key.decode('ascii')] = _read_pdf_string(value)
+        self._prev_xref = xref_offset
+        self._fp.seek(0, os.SEEK_END)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def bytes_written(self):
+        """Number of bytes written to the output file so far"""
+        return self._fp.tell()
+
+    @property
+    def total_pages(self):
+        """Pages in the PDF: the existing ones when appending and the ones added since"""
+        return self.existing_pages + self.page_count
+
+    def _reserve_id(self):
+        obj_id = self._next_id
+        self._next_id += 1
+        return obj_id
+
+    def _write_object(self, obj_id, body, stream=None):
+        self._offsets[obj_id] = self._fp.tell()
+        self._fp.write(b'%d 0 obj\n' % obj_id)
+        self._fp.write(body)
+        if stream is not None:
+            self._fp.write(b'\nstream\n')
+            self._fp.write(stream)
+            self._fp.write(b'\nendstream')
+        self._fp.write(b'\nendobj\n')
+
+    def _text_font(self):
+        """Object id of the font used by the OCR text layers, written once on first use"""
+        if self._font_id is None:
+            self._font_id = self._reserve_id()
+            self._write_object(self._font_id, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica '
+                                              b'/Encoding /WinAnsiEncoding >>')
+        return self._font_id
+
+    def add_encoded_page(self, page):
+        """Append a page from an already encoded image stream"""
+        # The pages between two checkpoints get their own node of the page tree
+        if self._group_id is None:
+            self._group_id = self._reserve_id()
+        image_id = self._reserve_id()
+        contents_id = self._reserve_id()
+        page_id = self._reserve_id()
+
+        params = b' /DecodeParms ' + page.params if page.params else b''
+        self._write_object(
+            image_id,
+            b'<< /Type /XObject /Subtype /Image /Width %d /Height %d '
+            b'/ColorSpace /%s /BitsPerComponent %d /Filter /%s%s /Length %d >>' % (
+                page.width, page.height, page.color_space.encode('ascii'),
+                page.bits, page.filter.encode('ascii'), params, len(page.data)),
+            page.data
+        )
+
+        # Page size in points, based on the image resolution
+        resolution = page.dpi or self.resolution
+        page_width = page.width * 72.0 / resolution
+        page_height = page.height * 72.0 / resolution
+
+        contents = b'q %.4f 0 0 %.4f 0 0 cm /image Do Q' % (page_width, page_height)
+        fonts = b''
+        if page.text and page.text.words:
+            contents += b'\n' + _text_layer(page.text.words, page.height, 72.0 / resolution)
+            fonts = b' /Font << /F1 %d 0 R >>' % self._text_font()
+        self._write_object(contents_id, b'<< /Length %d >>' % len(contents), contents)
+
+        self._write_object(
+            page_id,
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.4f %.4f] '
+            b'/Resources << /XObject << /image %d 0 R >>%s >> /Contents %d 0 R >>' % (
+                self._group_id, page_width, page_height, image_id, fonts, contents_id)
+        )
+
+        self._new_page_ids.append(page_id)
+        self.page_count += 1
+        if self.checkpoint_pages and len(self._new_page_ids) >= self.checkpoint_pages:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """
+        Append the page tree, document info and a cross-reference table for everything
+        written since the last checkpoint, making the file a complete PDF of the pages so far
+        """
+        if self._prev_xref is not None and not self._offsets:
+            return
+
+        if self._new_page_ids:
+            kids = b' '.join(b'%d 0 R' % page_id for page_id in self._new_page_ids)
+            self._write_object(
+                self._group_id,
+                b'<< /Type /Pages /Parent %d 0 R /Kids [' % self._pages_id + kids +
+                b'] /Count %d >>' % len(self._new_page_ids)
+            )
+            self._kids.append(self._group_id)
+
+        # The page tree's root and the document info replace the ones of the last checkpoint
+        kids = b' '.join(b'%d 0 R' % kid for kid in self._kids)
+        self._write_object(
+            self._pages_id,
+            b'<< /Type /Pages /Kids [' + kids + b'] /Count %d >>' % self.total_pages
+        )
+        if self._prev_xref is None:
+            self._write_object(self._catalog_id, b'<< /Type /Catalog /Pages %d 0 R >>' % self._pages_id)
+        if self._info_id is None:
+            self._info_id = self._reserve_id()
+        entries = [b'/%s %s' % (key.encode('ascii'), _pdf_string(value))
+                   for key, value in self.info.items() if value]
+        self._write_object(self._info_id, b'<< ' + b' '.join(entries) + b' >>')
+
+        # The head of the free list, then one subsection per run of consecutive object numbers
+        xref_offset = self._fp.tell()
+        self._fp.write(b'xref\n0 1\n0000000000 65535 f \n')
+        ids = sorted(self._offsets)
+        first = 0
+        for i in range(1, len(ids) + 1):
+            if i == len(ids) or ids[i] != ids[i - 1] + 1:
+                self._fp.write(b'%d %d\n' % (ids[first], i - first))
+                for obj_id in ids[first:i]:
+                    self._fp.write(b'%010d 00000 n \n' % self._offsets[obj_id])
+                first = i
+
+        prev = b' /Prev %d' % self._prev_xref if self._prev_xref is not None else b''
+        self._fp.write(
+            b'trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R%s >>\nstartxref\n%d\n%%%%EOF\n' % (
+                self._next_id, self._catalog_id, self._info_id, prev, xref_offset)
+        )
+        self._fp.flush()
+
+        self._prev_xref = xref_offset
+        self._offsets = {}
+        self._new_page_ids = []
+        self._group_id = None
+        self.checkpoints += 1
+
+    def close(self):
+        """Write the last checkpoint and close the file"""
+        if self._fp.closed:
+            return
+        try:
+            self.checkpoint()
+        finally:
+            self._fp.close()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Capture Pipeline
+Crops every screenshot and appends it to the PDF while the capture is still
+turning pages: the capture loop hands each spread to a background thread, which
+uses the page-turn waits for cropping and encoding instead of leaving the CPU idle
+The PDF is finished a moment after the last page turn
+A resumed capture appends to the PDF it started; the PDF's document info records the
+last screenshot in it, so the spreads that never made it in can be added first
+"""
+
+import os
+import queue
+import threading
+import time
+
+from frame_detect import detect_frame, detect_frame_near
+from instrument import tracer
+from pdf_writer import PdfWriter
+from process import DEFAULT_CROP_COORDS, frame_outputs
+
+# Spreads that may wait for processing before the capture loop has to wait
+MAX_PENDING = 8
+
+# Spreads searched for the reading frame before the default frame is used (the first
+# ones are often covers without a frame); they are held in memory until it is found
+FRAME_SEARCH_SPREADS = 5
+
+# Spreads between two PDF checkpoints; a killed capture leaves a valid PDF up to the last one
+CHECKPOINT_SPREADS = 5
+
+# Document info entry holding the file name of the last screenshot in the PDF
+LAST_SCREENSHOT_KEY = 'LastScreenshot'
+
+
+class CapturePipeline:
+    """
+    Bounded queue of captured spreads that a background thread crops and writes to a
+    streaming PDF, in capture order
+    put() blocks while the queue is full (backpressure), close() finishes the PDF
+    With crop_coords=None the frame is detected on the first spreads and then followed
+    from page to page; pass a box to crop every spread the same way
+    With append=True the pages are added to the PDF at pdf_path if there is one (see
+    last_screenshot); if it can't be appended to, it is started again
+    """
+
+    def __init__(self, pdf_path, book_title=None, crop_coords=None, split=False, compact=False,
+                 max_pending=MAX_PENDING, append=False):
+        self.pdf_path = pdf_path
+        self.crop_coords = crop_coords
+        self.track_frame = crop_coords is None
+        self.split = split
+        self.compact = compact
+
+        self.spreads = 0
+        self.failed = []
+        self.process_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.finish_seconds = 0.0
+
+        self._last_put = None
+        self._writer = self._open_writer(pdf_path, book_title, append)
+        # File name of the last screenshot in the PDF, None for a new PDF
+        self.last_screenshot = self._writer.info.get(LAST_SCREENSHOT_KEY)
+        self._waiting = []
+        self._closed = False
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def page_count(self):
+        return self._writer.page_count
+
+    @property
+    def total_pages(self):
+        return self._writer.total_pages
+
+    @staticmethod
+    def _open_writer(pdf_path, book_title, append):
+        """PDF writer that appends to the PDF if asked and possible; spreads are checkpointed by _add"""
+        if append and os.path.exists(pdf_path):
+            try:
+                writer = PdfWriter(pdf_path, title=book_title, append=True, checkpoint_pages=None)
+                if LAST_SCREENSHOT_KEY in writer.info:
+                    return writer
+                writer.close()
+                print(f"⚠️  {pdf_path} wasn't written during a capture, starting it again")
+            except ValueError as e:
+                print(f"⚠️  {e}, starting the PDF again")
+        return PdfWriter(pdf_path, title=book_title, checkpoint_pages=None)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            try:
+                self._handle(*item)
+            except Exception as e:
+                self.failed.append((item[1], e))
+
+        # The capture ended before any spread showed a frame
+        if self._waiting:
+            self._use_frame(DEFAULT_CROP_COORDS)
+
+    def _handle(self, image, filename):
+        if self.crop_coords is not None:
+            self._add(image, filename)
+            return
+
+        with tracer.stage('detect'):
+            box = detect_frame(image)
+        self._waiting.append((image, filename))
+        if box is not None or len(self._waiting) >= FRAME_SEARCH_SPREADS:
+            self._use_frame(box or DEFAULT_CROP_COORDS)
+
+    def _use_frame(self, box):
+        """Set the book's frame and process the spreads that waited for it"""
+        self.crop_coords = box
+        waiting, self._waiting = self._waiting, []
+        for image, filename in waiting:
+            self._add(image, filename)
+
+    def _add(self, image, filename):
+        """Crop one spread and write its pages to the PDF"""
+        start = time.perf_counter()
+        try:
+            crop_coords = self.crop_coords
+            if self.track_frame:
+                with tracer.stage('detect'):
+                    crop_coords = detect_frame_near(image, crop_coords) or crop_coords
+            with tracer.stage('crop'):
+                content_frame = image.crop(crop_coords)
+            _, pages = frame_outputs(content_frame, None, None, os.path.splitext(filename)[0],
+                                     save_frame=False, encode=True, split=self.split, compact=self.compact)
+            for page in pages:
+                with tracer.stage('pdf_write', len(page.data)):
+                    self._writer.add_encoded_page(page)
+            self.spreads += 1
+            self._writer.info[LAST_SCREENSHOT_KEY] = filename
+            if self.spreads % CHECKPOINT_SPREADS == 0:
+                self._writer.checkpoint()
+        except Exception as e:
+            self.failed.append((filename, e))
+        self.process_seconds += time.perf_counter() - start
+
+    def put(self, image, filename):
+        """Queue a captured spread, waiting while the queue is full"""
+        start = time.perf_counter()
+        self._queue.put((image, filename))
+        self._last_put = time.perf_counter()
+        self.blocked_seconds += self._last_put - start
+
+    def close(self):
+        """Process everything that was queued and finish the PDF"""
+        if self._closed:
+            return
+        self._closed = True
+
+        self._queue.put(None)
+        self._thread.join()
+        self._writer.close()
+        if not self.total_pages:
+            os.remove(self.pdf_path)
+        if self._last_put is not None:
+            self.finish_seconds = time.perf_counter() - self._last_put
+
+    def print_summary(self):
+        """Print what was written and how little of it was left after the last page turn"""
+        if self.page_count:
+            added = f" ({self.page_count} added)" if self._writer.existing_pages else ""
+            print(f"\n📄 PDF with {self.total_pages} pages{added} from {self.spreads} spreads: {self.pdf_path}")
+            print(f"⚡ {self.process_seconds:.1f}s of cropping and encoding during capture, "
+                  f"finished {self.finish_seconds:.1f}s after the last page turn")
+            if self.blocked_seconds > 0.1:
+                print(f"   Capture waited {self.blocked_seconds:.1f}s for processing to catch up")
+        else:
+            print("\n⚠️  No pages could be added to the PDF")
+        if self.crop_coords and self.track_frame:
+            print(f"🎯 Frame: {', '.join(map(str, self.crop_coords))}")
+        for filename, error in self.failed:
+            print(f"❌ Could not add {filename} to the PDF: {error}")
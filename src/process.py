@@ -7,25 +7,24 @@ Keeps only the main book content area (the actual book pages)
 
 import os
 import sys
+import argparse
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image, ImageDraw
-import glob
-from datetime import datetime
 
+from instrument import tracer
+from manifest import Manifest
+from ocr import OCR_CACHE_DIR, OcrStats, ocr_page, tesseract_available
+from folder_index import FolderIndex, describe_folder
+from frame_detect import detect_frame, detect_frame_near, consensus_frame
+from pdf_writer import PdfWriter, encode_page
+from raw_store import is_stored, list_screenshots, open_screenshot, screenshot_bytes, stored_crop
+from spread import parse_page_range, screenshot_sort_key, split_spread
 
-def find_screenshot_folders():
-    """Find all book screenshot folders in ebook_suite directory"""
-    base_dir = os.path.expanduser("~/Documents/ebook_suite")
-
-    # Create base directory if it doesn't exist
-    if not os.path.exists(base_dir):
-        return []
 
-    folders = []
-    for item in os.listdir(base_dir):
-        item_path = os.path.join(base_dir, item)
-        if os.path.isdir(item_path) and item.startswith('book_'):
-            folders.append(item)
-    return sorted(folders)
+def find_screenshot_folders():
+    """Find all book screenshot folders in ebook_suite directory (details from the folder index)"""
+    return FolderIndex().refresh()
 
 
 def select_folder():
@@ -40,18 +39,18 @@ def select_folder():
         sys.exit(1)
 
     if len(folders) == 1:
-        print(f"📁 Found screenshot folder: {folders[0]}")
-        return os.path.join(base_dir, folders[0])
+        print(f"📁 Found screenshot folder: {folders[0]['name']} ({describe_folder(folders[0])})")
+        return os.path.join(base_dir, folders[0]['name'])
 
     print("📁 Found multiple screenshot folders:")
     for i, folder in enumerate(folders, 1):
-        print(f"  {i}. {folder}")
+        print(f"  {i}. {folder['name']} ({describe_folder(folder)})")
 
     while True:
         try:
             choice = int(input("\nSelect folder number: ")) - 1
             if 0 <= choice < len(folders):
-                return os.path.join(base_dir, folders[choice])
+                return os.path.join(base_dir, folders[choice]['name'])
             else:
                 print("Invalid selection. Please try again.")
         except (ValueError, KeyboardInterrupt):
@@ -59,40 +58,217 @@ def select_folder():
             sys.exit(0)
 
 
+# Frame used when detection fails (2880x1800 screenshot of the default reader layout)
+DEFAULT_CROP_COORDS = (215, 48, 2785, 1660)
+
+# Number of screenshots sampled for the consensus frame
+FRAME_SAMPLES = 5
+
+# A page's frame counts as drifted if an edge is further than this share of the frame
+# width from the book-wide median frame
+DRIFT_TOLERANCE = 0.01
+
+# Previews are drawn on thumbnails about this wide instead of full-resolution screenshots
+PREVIEW_WIDTH = 960
+
+# Screenshots per row of the contact sheet
+CONTACT_SHEET_COLUMNS = 3
+
+# Reduced copy of a screenshot kept for previews: image, full (width, height), detected frame box
+Thumbnail = namedtuple('Thumbnail', 'image full_size box')
+
+# Stage timings of a processing run are written to the output folder (.json and .csv)
+PROCESS_TRACE = "process_trace"
+
+
 def analyze_content_frame(image_path):
     """
     Analyze the image to find the gray frame boundaries
     Returns the crop coordinates (left, top, right, bottom) for the content frame
     """
+    try:
+        with open_screenshot(image_path) as img:
+            crop_coords = detect_frame(img)
+    except Exception as e:
+        print(f"⚠️  Frame detection failed for {image_path}: {e}")
+        crop_coords = None
+
+    if crop_coords is None:
+        print("⚠️  Could not detect the gray frame, using default coordinates")
+        return DEFAULT_CROP_COORDS
+    return crop_coords
+
+
+def make_thumbnail(img, box=None):
+    """Reduced copy of a decoded screenshot for previews (integer reduce, which is fast)"""
+    factor = max(1, img.width // PREVIEW_WIDTH)
+    return Thumbnail(img.convert('RGB').reduce(factor), img.size, box)
+
+
+def load_thumbnail(image_path):
+    """Thumbnail of a screenshot file; JPEGs are decoded directly at reduced size (draft mode)"""
+    with open_screenshot(image_path) as img:
+        full_size = img.size
+        img.draft('RGB', (img.width // max(1, img.width // PREVIEW_WIDTH), img.height))
+        thumbnail = make_thumbnail(img)
+    return thumbnail._replace(full_size=full_size)
+
+
+def analyze_content_frame_consensus(image_files, samples=FRAME_SAMPLES, thumbnails=None):
+    """
+    Detect the frame on up to `samples` evenly spaced screenshots and take the consensus box
+    The first and last screenshot are skipped when possible (covers often have no frame)
+    If a thumbnails dict is given, a Thumbnail of every sampled screenshot is stored in it
+    (keyed by path) while the image is decoded anyway, so previews need no second decode
+    """
+    candidates = image_files[1:-1] if len(image_files) > 2 else image_files
+    step = max(1, len(candidates) // samples)
+    sampled = candidates[::step][:samples]
+
+    boxes = []
+    for image_path in sampled:
+        try:
+            with open_screenshot(image_path) as img:
+                img.load()
+                boxes.append(detect_frame(img))
+                if thumbnails is not None:
+                    thumbnails[image_path] = make_thumbnail(img, boxes[-1])
+        except Exception as e:
+            print(f"⚠️  Frame detection failed for {image_path}: {e}")
+
+    crop_coords = consensus_frame(boxes)
+    if crop_coords is None:
+        print("⚠️  Could not detect the gray frame, using default coordinates")
+        return DEFAULT_CROP_COORDS
 
-    left_x=215
-    top_y=48
-    right_x=2785
-    bottom_y=1660
-    return left_x, top_y, right_x, bottom_y
+    found = sum(1 for box in boxes if box is not None)
+    print(f"🔎 Frame detected on {found}/{len(sampled)} sampled screenshots")
+    return crop_coords
 
 
 def crop_content_frame(image_path, crop_coords, output_dir, base_filename):
     """
     Crop the image to keep only the content inside the gray frame
     """
-    try:
-        img = Image.open(image_path)
-        left_x, top_y, right_x, bottom_y = crop_coords
-
-        # Crop to the frame boundaries
-        content_frame = img.crop((left_x, top_y, right_x, bottom_y))
+    frame_files, _, _ = crop_and_encode(image_path, crop_coords, output_dir, base_filename)
+    return frame_files[0] if frame_files else None
 
-        # Save the cropped frame content
-        output_filename = f"{base_filename}_frame.png"
-        output_path = os.path.join(output_dir, output_filename)
-        content_frame.save(output_path, 'PNG')
 
-        return output_filename
+def crop_and_encode(image_path, crop_coords, output_dir, base_filename, save_frame=True, encode=False,
+                    split=False, compact=False, ocr_lang=None, track_frame=False):
+    """
+    Crop one screenshot, optionally split the spread into single pages,
+    then save the frame PNGs and/or encode them as PDF pages
+    With track_frame=True the frame is detected on this screenshot itself (crop_coords
+    is only used if none is found), so layout changes mid-book are followed
+    With compact=True every page is encoded to match its content (see pdf_writer.encode_page)
+    With an ocr_lang every encoded page also gets its recognized words for the text layer
+    Returns (list of frame filenames, list of EncodedPages, crop box used); all None on error
+    """
+    try:
+        if is_stored(image_path) and not track_frame:
+            # Raw pixels need no decoding; only the frame is copied out of the memory map
+            with tracer.stage('crop', screenshot_bytes(image_path)):
+                content_frame = stored_crop(image_path, crop_coords)
+            dpi = None
+        else:
+            with open_screenshot(image_path) as img:
+                with tracer.stage('decode', screenshot_bytes(image_path)):
+                    img.load()
+                if track_frame:
+                    # The screenshot is decoded already; the frame is looked for around the book's
+                    # frame first, a full detection only runs if it moved
+                    with tracer.stage('detect'):
+                        crop_coords = detect_frame_near(img, crop_coords) or crop_coords
+                # Crop to the frame boundaries
+                with tracer.stage('crop'):
+                    content_frame = img.crop(crop_coords)
+                dpi = source_dpi(img)
+
+        frame_files, pages = frame_outputs(content_frame, dpi, output_dir, base_filename, save_frame,
+                                           encode, split, compact, ocr_lang)
+        return frame_files, pages, tuple(crop_coords)
 
     except Exception as e:
         print(f"❌ Error cropping {image_path}: {e}")
-        return None
+        return None, None, None
+
+
+def frame_outputs(content_frame, dpi, output_dir, base_filename, save_frame=True, encode=False,
+                  split=False, compact=False, ocr_lang=None):
+    """
+    Turn one cropped frame into its outputs: frame PNGs in output_dir and/or encoded PDF pages
+    Returns (list of frame filenames, list of EncodedPages)
+    """
+    if split:
+        first_page, last_page = parse_page_range(base_filename) or (None, None)
+        pieces = []
+        with tracer.stage('split'):
+            spread_pages = split_spread(content_frame, first_page, last_page)
+        for number, page_img in spread_pages:
+            # Pages without a number (e.g. unnamed files) get a suffix instead
+            name = f"page_{number:03d}" if number is not None else f"{base_filename}_{len(pieces) + 1}"
+            pieces.append((name, page_img))
+    else:
+        pieces = [(base_filename, content_frame)]
+
+    frame_files = []
+    pages = []
+    for name, piece in pieces:
+        if save_frame:
+            # Save the cropped frame content
+            output_filename = f"{name}_frame.png"
+            with tracer.stage('save_frame'):
+                piece.save(os.path.join(output_dir, output_filename), 'PNG')
+            frame_files.append(output_filename)
+        if encode:
+            with tracer.stage('encode'):
+                page = encode_page(piece, compact, dpi)
+            if ocr_lang:
+                with tracer.stage('ocr'):
+                    text = ocr_page(piece, os.path.join(output_dir, OCR_CACHE_DIR), ocr_lang)
+                page = page._replace(text=text)
+            pages.append(page)
+    return frame_files, pages
+
+
+def source_dpi(img):
+    """Resolution stored in an image file, or None if it has none"""
+    dpi = img.info.get('dpi')
+    if dpi and dpi[0] > 1:
+        return float(dpi[0])
+    return None
+
+
+def _crop_task(args):
+    """Process pool entry point for crop_and_encode, also returns the worker's stage timings"""
+    return crop_and_encode(*args) + (tracer.drain(),)
+
+
+def crop_images(image_files, crop_coords, output_dir, workers=1, save_frames=True, encode=False,
+                split=False, compact=False, ocr_lang=None, track_frame=False):
+    """
+    Crop all images, optionally on a pool of worker processes
+    With encode=True every frame is also encoded as a PDF page in memory (fused mode),
+    so it never has to be read back from disk; with split=True spreads become single pages
+    Yields (image_path, frame filenames, EncodedPages, crop box) in the same order as
+    image_files; all but the path are None for images that failed
+    """
+    tasks = [(image_path, crop_coords, output_dir, os.path.splitext(os.path.basename(image_path))[0],
+              save_frames, encode, split, compact, ocr_lang, track_frame)
+             for image_path in image_files]
+
+    if workers <= 1:
+        for task in tasks:
+            yield (task[0],) + crop_and_encode(*task)
+        return
+
+    # Forked workers start with a copy of this process's events, which must not be sent back
+    with ProcessPoolExecutor(max_workers=workers, initializer=tracer.reset) as executor:
+        # map() returns results in submission order, so output stays deterministic
+        for task, (frame_files, pages, box, events) in zip(tasks, executor.map(_crop_task, tasks)):
+            tracer.extend(events)
+            yield task[0], frame_files, pages, box
 
 
 def get_book_title():
@@ -131,9 +307,23 @@ def get_pdf_output_directory():
         return default_dir
 
 
-def create_pdf_from_images(image_files, output_path, book_title=None):
+def get_pdf_path(folder_path, pdf_output_dir, book_title=None):
+    """Build the PDF output path from the book title or the screenshot folder name"""
+    pdf_filename = f"{os.path.basename(folder_path)}_book.pdf"
+    if book_title:
+        # Clean title for filename
+        clean_title = "".join(c for c in book_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        if clean_title:
+            pdf_filename = f"{clean_title.replace(' ', '_')}.pdf"
+
+    return os.path.join(pdf_output_dir, pdf_filename)
+
+
+def create_pdf_from_images(image_files, output_path, book_title=None, compact=False):
     """
     Create a single PDF from all cropped images
+    Pages are streamed into the PDF one at a time, so only one image is held in memory
+    With compact=True every page is encoded to match its content (see pdf_writer.encode_page)
     """
     try:
         if not image_files:
@@ -141,45 +331,34 @@ def create_pdf_from_images(image_files, output_path, book_title=None):
             return False
 
         print(f"\n📄 Creating PDF with {len(image_files)} pages...")
+        print(f"💾 Saving PDF: {output_path}")
 
-        # Load and prepare images
-        images = []
-        for i, image_path in enumerate(image_files, 1):
-            try:
-                print(f"📖 Adding page {i}/{len(image_files)}: {os.path.basename(image_path)}")
-                img = Image.open(image_path)
-
-                # Convert to RGB if necessary (PDF requires RGB)
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-
-                images.append(img)
-
-            except Exception as e:
-                print(f"⚠️  Error loading {image_path}: {e}")
-                continue
-
-        if not images:
+        tracer.reset()
+        with PdfWriter(output_path, title=book_title or "Book", author="Book Scanner",
+                       subject="Scanned Book Content") as writer:
+            for i, image_path in enumerate(image_files, 1):
+                try:
+                    print(f"📖 Adding page {i}/{len(image_files)}: {os.path.basename(image_path)}")
+                    with Image.open(image_path) as img:
+                        with tracer.stage('decode', os.path.getsize(image_path)):
+                            img.load()
+                        with tracer.stage('encode'):
+                            page = encode_page(img, compact, source_dpi(img))
+                    with tracer.stage('pdf_write', len(page.data)):
+                        writer.add_encoded_page(page)
+
+                except Exception as e:
+                    print(f"⚠️  Error loading {image_path}: {e}")
+                    continue
+
+        if writer.page_count == 0:
             print("❌ No valid images to create PDF")
+            os.remove(output_path)
             return False
 
-        # Create PDF
-        print(f"💾 Saving PDF: {output_path}")
-
-        # Save the first image as PDF and append the rest
-        images[0].save(
-            output_path,
-            "PDF",
-            resolution=100.0,
-            save_all=True,
-            append_images=images[1:] if len(images) > 1 else [],
-            title=book_title or "Book",
-            author="Book Scanner",
-            subject="Scanned Book Content"
-        )
-
         print(f"✅ PDF created successfully!")
-        print(f"📊 Total pages in PDF: {len(images)}")
+        print(f"📊 Total pages in PDF: {writer.page_count}")
+        tracer.print_summary("PDF creation")
         return True
 
     except Exception as e:
@@ -187,22 +366,30 @@ def create_pdf_from_images(image_files, output_path, book_title=None):
         return False
 
 
-def create_preview_image(original_path, crop_coords, output_dir):
-    """Create a preview image showing the crop rectangle"""
+def _scaled_box(box, thumbnail):
+    """A box in full screenshot pixels scaled to thumbnail pixels"""
+    scale = thumbnail.image.width / thumbnail.full_size[0]
+    return [round(value * scale) for value in box]
+
+
+def create_preview_image(original_path, crop_coords, output_dir, thumbnail=None):
+    """
+    Create a preview image showing the crop rectangle
+    Drawn on a thumbnail (loaded if none is given), so it takes milliseconds instead of
+    decoding and writing a full-resolution screenshot
+    """
     try:
-        img = Image.open(original_path)
-        preview_img = img.copy()
+        thumbnail = thumbnail or load_thumbnail(original_path)
+        preview_img = thumbnail.image.copy()
         draw = ImageDraw.Draw(preview_img)
 
-        left_x, top_y, right_x, bottom_y = crop_coords
-
         # Draw a green rectangle indicating the crop area
-        draw.rectangle([left_x, top_y, right_x, bottom_y], outline='green', width=3)
+        draw.rectangle(_scaled_box(crop_coords, thumbnail), outline='green', width=3)
 
         # Save preview
         preview_filename = "crop_preview.png"
         preview_path = os.path.join(output_dir, preview_filename)
-        preview_img.save(preview_path)
+        preview_img.save(preview_path, compress_level=1)
 
         return preview_filename
     except Exception as e:
@@ -210,37 +397,270 @@ def create_preview_image(original_path, crop_coords, output_dir):
         return None
 
 
-def process_screenshots(folder_path):
+def create_contact_sheet(thumbnails, crop_coords, output_dir):
+    """
+    One image with all sampled screenshots side by side: the frame detected on each
+    in orange, the frame that will be used in green, so outliers are easy to spot
+    """
+    try:
+        if not thumbnails:
+            return None
+        items = [thumbnails[path] for path in sorted(thumbnails, key=screenshot_sort_key)]
+        cell_width = max(item.image.width for item in items)
+        cell_height = max(item.image.height for item in items)
+        columns = min(CONTACT_SHEET_COLUMNS, len(items))
+        rows = (len(items) + columns - 1) // columns
+        gap = 8
+
+        sheet = Image.new('RGB', (columns * (cell_width + gap) + gap, rows * (cell_height + gap) + gap), 'white')
+        draw = ImageDraw.Draw(sheet)
+        for i, item in enumerate(items):
+            x = gap + (i % columns) * (cell_width + gap)
+            y = gap + (i // columns) * (cell_height + gap)
+            sheet.paste(item.image, (x, y))
+            for box, color in ((item.box, 'orange'), (crop_coords, 'green')):
+                if box:
+                    left, top, right, bottom = _scaled_box(box, item)
+                    draw.rectangle([x + left, y + top, x + right, y + bottom], outline=color, width=2)
+
+        sheet_filename = "crop_contact_sheet.png"
+        sheet.save(os.path.join(output_dir, sheet_filename), compress_level=1)
+        return sheet_filename
+    except Exception as e:
+        print(f"⚠️  Could not create contact sheet: {e}")
+        return None
+
+
+def parse_crop_box(text):
+    """Parse 'left,top,right,bottom' into a tuple of ints, or return 'auto'"""
+    if text == 'auto':
+        return text
+    try:
+        left, top, right, bottom = (int(value) for value in text.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected 'auto' or left,top,right,bottom")
+    if right <= left or bottom <= top:
+        raise argparse.ArgumentTypeError("right/bottom must be larger than left/top")
+    return left, top, right, bottom
+
+
+def parse_page_count(text):
+    """Parse a book's page count for argparse; it must be at least 1"""
+    try:
+        pages = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number of pages, got '{text}'")
+    if pages < 1:
+        raise argparse.ArgumentTypeError("a book has at least 1 page")
+    return pages
+
+
+def get_output_dir(folder_path):
+    """Folder for the cropped frames, preview and manifest of a screenshot folder"""
+    base_dir = os.path.expanduser("~/Documents/ebook_suite")
+    return os.path.join(base_dir, f"pdf_{os.path.basename(folder_path.rstrip(os.sep))}")
+
+
+def find_drifted_pages(boxes):
+    """
+    Compare per-page crop boxes against the book-wide median box
+    boxes is a list of (image_path, box); returns (median box, list of runs of consecutive
+    drifted pages as (first path, last path, box of the first drifted page))
+    """
+    median = consensus_frame([box for _, box in boxes])
+    if median is None:
+        return None, []
+    tolerance = DRIFT_TOLERANCE * (median[2] - median[0])
+
+    runs = []
+    previous_drifted = False
+    for image_path, box in boxes:
+        drifted = max(abs(a - b) for a, b in zip(box, median)) > tolerance
+        if drifted and previous_drifted:
+            runs[-1][1] = image_path
+        elif drifted:
+            runs.append([image_path, image_path, box])
+        previous_drifted = drifted
+    return median, [tuple(run) for run in runs]
+
+
+def screenshot_name(path):
+    """A screenshot's file name without the extension, e.g. pages_001-002"""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def print_drift_report(boxes):
+    """Tell which pages were cropped with a frame that differs from the rest of the book"""
+    median, runs = find_drifted_pages(boxes)
+    if not runs:
+        print(f"\n🎯 Frame stayed in place on all {len(boxes)} screenshots")
+        return []
+
+    print(f"\n⚠️  The frame moved on some screenshots (book-wide frame: {', '.join(map(str, median))}):")
+    drifted = []
+    for first, last, box in runs:
+        first, last = screenshot_name(first), screenshot_name(last)
+        span = first if first == last else f"{first} … {last}"
+        print(f"   {span}: cropped at {', '.join(map(str, box))}")
+        drifted.append(first if first == last else [first, last])
+    print("   Check these pages; a single drifted screenshot may be a picture page the frame wasn't found on")
+    return drifted
+
+
+def extract_book(image_files, crop_coords, output_dir, pdf_path=None, book_title=None,
+                 save_frames=True, workers=1, split=False, compact=False, ocr_lang=None,
+                 track_frame=False):
+    """
+    Crop every screenshot of a book and stream the pages into a PDF, without asking anything
+    pdf_path=None skips the PDF; unchanged screenshots are reused through the manifest
+    With an ocr_lang (e.g. 'eng') the PDF pages get an invisible OCR text layer
+    With track_frame=True every screenshot is cropped at its own detected frame and
+    pages whose frame drifted from the rest of the book are reported
+    Returns a summary dict: image/page counts, failed screenshots and the PDF path (None if none)
+    """
+    tracer.reset()
+    create_pdf = pdf_path is not None
+    writer = None
+    if create_pdf:
+        writer = PdfWriter(pdf_path, title=book_title or "Book", author="Book Scanner",
+                           subject="Scanned Book Content")
+
+    # Reuse the results of earlier runs for screenshots that haven't changed
+    manifest = Manifest(output_dir)
+    manifest.prune(image_files)
+    ocr_lang = ocr_lang if create_pdf else None
+    settings = {'crop': list(crop_coords), 'split': split, 'compact': compact, 'ocr': ocr_lang,
+                'track_frame': track_frame}
+    digests = {}
+    cached = {}
+    for image_path in image_files:
+        with tracer.stage('hash_source'):
+            digests[image_path] = manifest.digest(image_path)
+            entry = manifest.lookup(image_path, digests[image_path], settings,
+                                    need_frame=save_frames, need_page=create_pdf)
+        if entry:
+            cached[image_path] = entry
+    pending = [image_path for image_path in image_files if image_path not in cached]
+
+    # Process all images
+    if cached:
+        print(f"\n♻️  {len(cached)} unchanged images reused from the previous run")
+    if workers > 1:
+        print(f"\n🔄 Processing {len(pending)} images with {workers} workers...")
+    else:
+        print(f"\n🔄 Processing {len(pending)} images...")
+    successful = 0
+    failed = []
+    boxes = []
+    ocr_stats = OcrStats()
+
+    results = crop_images(pending, crop_coords, output_dir, workers,
+                          save_frames=save_frames, encode=create_pdf, split=split,
+                          compact=compact, ocr_lang=ocr_lang, track_frame=track_frame)
+    try:
+        for i, image_path in enumerate(image_files, 1):
+            base_name = os.path.splitext(os.path.basename(image_path))[0]
+            print(f"📄 Processing {i}/{len(image_files)}: {base_name}", end=" - ")
+
+            entry = cached.get(image_path)
+            if entry:
+                frame_files = entry['frames'] if save_frames else []
+                with tracer.stage('cache_load'):
+                    pages = manifest.load_pages(entry) if create_pdf else []
+                box = entry.get('box')
+            else:
+                _, frame_files, pages, box = next(results)
+                if frame_files or pages:
+                    manifest.record(image_path, digests[image_path], settings, frame_files, pages, box)
+            if box:
+                boxes.append((image_path, tuple(box)))
+
+            for page in pages or []:
+                with tracer.stage('pdf_write', len(page.data)):
+                    writer.add_encoded_page(page)
+                if page.text:
+                    ocr_stats.add(page.text)
+
+            if entry:
+                print("♻️  Unchanged, reused")
+                successful += 1
+            elif frame_files:
+                print(f"✅ Created: {', '.join(frame_files)}")
+                successful += 1
+            elif pages and len(pages) == 1:
+                print(f"✅ Added to PDF as page {writer.page_count}")
+                successful += 1
+            elif pages:
+                print(f"✅ Added to PDF as pages {writer.page_count - len(pages) + 1}-{writer.page_count}")
+                successful += 1
+            else:
+                print("❌ Failed")
+                failed.append(os.path.basename(image_path))
+    finally:
+        results.close()
+        manifest.save()
+        if writer:
+            writer.close()
+
+    drifted = print_drift_report(boxes) if track_frame else []
+    ocr_stats.print_summary()
+    tracer.print_summary("Processing")
+    tracer.write(os.path.join(output_dir, PROCESS_TRACE))
+    page_count = writer.page_count if writer else 0
+    if writer and not page_count:
+        os.remove(pdf_path)
+        pdf_path = None
+
+    return {
+        'images': len(image_files),
+        'processed': successful,
+        'reused': len(cached),
+        'failed': failed,
+        'drifted': drifted,
+        'pages': page_count,
+        'ocr_pages': ocr_stats.pages,
+        'ocr_cache_hits': ocr_stats.hits,
+        'pdf': pdf_path,
+        'output_dir': output_dir,
+    }
+
+
+def process_screenshots(folder_path, workers=1, split=False, compact=False, ocr_lang=None,
+                        track_frame=False):
     """Process all screenshots in the folder"""
 
     # Create output directory in the same base location
-    base_dir = os.path.expanduser("~/Documents/ebook_suite")
-    folder_name = os.path.basename(folder_path)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_dir = os.path.join(base_dir, f"pdf_{folder_name}")
+    output_dir = get_output_dir(folder_path)
     os.makedirs(output_dir, exist_ok=True)
 
     # Find all PNG files in the folder
-    image_files = glob.glob(os.path.join(folder_path, "*.png"))
-    image_files.sort()
+    image_files = list_screenshots(folder_path)
 
     if not image_files:
-        print(f"❌ No PNG files found in {folder_path}")
+        print(f"❌ No screenshots found in {folder_path}")
         return
 
     print(f"📊 Found {len(image_files)} images to process")
 
-    # Process first image to show preview and get confirmation
-    first_image = image_files[1]
-    print(f"\n🔍 Analyzing gray frame boundaries using: {os.path.basename(first_image)}")
+    # Detect the frame on a sample of screenshots and preview it on the first content page
+    first_image = image_files[1] if len(image_files) > 1 else image_files[0]
+    print(f"\n🔍 Analyzing gray frame boundaries on up to {FRAME_SAMPLES} screenshots")
 
-    crop_coords = analyze_content_frame(first_image)
+    thumbnails = {}
+    crop_coords = analyze_content_frame_consensus(image_files, thumbnails=thumbnails)
     left_x, top_y, right_x, bottom_y = crop_coords
-    preview_file = create_preview_image(first_image, crop_coords, output_dir)
+
+    # The preview page was decoded during detection; its thumbnail is reused for every preview
+    preview_thumbnail = thumbnails.get(first_image) or load_thumbnail(first_image)
+    preview_file = create_preview_image(first_image, crop_coords, output_dir, preview_thumbnail)
+    sheet_file = create_contact_sheet(thumbnails, crop_coords, output_dir) if len(thumbnails) > 1 else None
 
     if preview_file:
         print(f"📸 Preview saved as: {os.path.join(output_dir, preview_file)}")
         print("🔍 Check the preview - green rectangle shows what will be kept, red areas will be removed")
+    if sheet_file:
+        print(f"🗂️  All sampled pages: {os.path.join(output_dir, sheet_file)} "
+              f"(orange: detected on that page, green: used for all)")
 
     print(f"📏 Detected frame boundaries:")
     print(f"   Left: {left_x}, Top: {top_y}, Right: {right_x}, Bottom: {bottom_y}")
@@ -255,8 +675,7 @@ def process_screenshots(folder_path):
         print("Enter new coordinates for the frame:")
         while True:
             try:
-                img = Image.open(first_image)
-                w, h = img.size
+                w, h = preview_thumbnail.full_size
                 print(f"Image size: {w} x {h}")
 
                 left_x = int(input(f"Left edge (0-{w}): "))
@@ -265,7 +684,7 @@ def process_screenshots(folder_path):
                 bottom_y = int(input(f"Bottom edge ({top_y}-{h}): "))
 
                 crop_coords = (left_x, top_y, right_x, bottom_y)
-                preview_file = create_preview_image(first_image, crop_coords, output_dir)
+                preview_file = create_preview_image(first_image, crop_coords, output_dir, preview_thumbnail)
                 if preview_file:
                     print(f"📸 Updated preview saved as: {os.path.join(output_dir, preview_file)}")
 
@@ -279,56 +698,58 @@ def process_screenshots(folder_path):
     create_pdf = input("\n📄 Do you want to create a single PDF file? (y/n): ").lower().strip() == 'y'
     book_title = None
     pdf_output_dir = None
+    save_frames = True
     if create_pdf:
         book_title = get_book_title()
         pdf_output_dir = get_pdf_output_directory()
         if pdf_output_dir is None:
             print("⚠️  PDF creation cancelled")
             create_pdf = False
-
-    # Process all images
-    print(f"\n🔄 Processing {len(image_files)} images...")
-    successful = 0
-    cropped_files = []
-
-    for i, image_path in enumerate(image_files, 1):
-        base_name = os.path.splitext(os.path.basename(image_path))[0]
-        print(f"📄 Processing {i}/{len(image_files)}: {base_name}", end=" - ")
-
-        content_file = crop_content_frame(image_path, crop_coords, output_dir, base_name)
-
-        if content_file:
-            print(f"✅ Created: {content_file}")
-            successful += 1
-            cropped_files.append(os.path.join(output_dir, content_file))
         else:
-            print("❌ Failed")
+            # Pages go straight from the crop into the PDF, so frame PNGs are optional
+            save_frames = input("💾 Also keep the cropped frame images? (y/n): ").lower().strip() == 'y'
+
+    pdf_path = get_pdf_path(folder_path, pdf_output_dir, book_title) if create_pdf else None
+    summary = extract_book(image_files, crop_coords, output_dir, pdf_path, book_title,
+                           save_frames, workers, split, compact, ocr_lang, track_frame)
+    successful = summary['processed']
 
     print(f"\n✅ Frame cropping completed!")
     print(f"📊 Successfully processed: {successful}/{len(image_files)} images")
-    print(f"📁 Frame content saved in: {output_dir}")
+    if save_frames:
+        print(f"📁 Frame content saved in: {output_dir}")
     print(f"🎯 Clean book content extracted from gray frames!")
 
-    # Create PDF if requested
-    if create_pdf and cropped_files and pdf_output_dir:
-        pdf_filename = f"{os.path.basename(folder_path)}_book.pdf"
-        if book_title:
-            # Clean title for filename
-            clean_title = "".join(c for c in book_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            if clean_title:
-                pdf_filename = f"{clean_title.replace(' ', '_')}.pdf"
-
-        pdf_path = os.path.join(pdf_output_dir, pdf_filename)
-
-        if create_pdf_from_images(cropped_files, pdf_path, book_title):
-            print(f"\n🎉 PDF created: {pdf_filename}")
+    # Report the PDF that was written alongside the crops
+    if create_pdf:
+        if summary['pdf']:
+            print(f"\n🎉 PDF created: {os.path.basename(pdf_path)}")
             print(f"📍 Location: {pdf_path}")
+            print(f"📊 Total pages in PDF: {summary['pages']}")
         else:
-            print("\n⚠️  PDF creation failed, but individual images are available")
+            print("\n⚠️  PDF creation failed, no pages could be added")
 
 
-def main():
+def main(argv=None):
     """Main function"""
+    parser = argparse.ArgumentParser(description="Crop book screenshots and build a PDF")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="number of worker processes for cropping (default: 1)")
+    parser.add_argument('--split', action='store_true',
+                        help="split two-page spreads into single pages trimmed to their content")
+    parser.add_argument('--compact', action='store_true',
+                        help="encode each PDF page to match its content (black and white, gray or color)")
+    parser.add_argument('--ocr', nargs='?', const='eng', metavar='LANG',
+                        help="add a searchable text layer with Tesseract (language, default: eng)")
+    parser.add_argument('--track-frame', action='store_true',
+                        help="detect the frame on every screenshot and report pages where it moved")
+    args = parser.parse_args(argv)
+
+    if args.ocr and not tesseract_available():
+        print("❌ Error: tesseract not found, needed for --ocr")
+        print("Please install it: brew install tesseract (macOS) or see github.com/tesseract-ocr/tesseract")
+        sys.exit(1)
+
     print("📚 Book Frame Extraction & PDF Tool")
     print("=" * 40)
     print("This tool will:")
@@ -352,7 +773,8 @@ def main():
     print(f"\n📂 Selected folder: {folder_path}")
 
     # Process the screenshots
-    process_screenshots(folder_path)
+    process_screenshots(folder_path, workers=max(1, args.workers), split=args.split,
+                        compact=args.compact, ocr_lang=args.ocr, track_frame=args.track_frame)
 
     print("\n🎉 All done! Your book content has been extracted from the frames and is ready!")
 
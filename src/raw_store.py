@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Raw Screenshot Store
+Keeps a book's screenshots as uncompressed pixels in one file instead of PNGs:
+capture appends a screenshot with a plain write (no zlib), and processing reads
+it back through a memory map, copying only the pixels of the crop box
+Every record has the same size, so record i is found by arithmetic; its header
+holds the screenshot's file name and a hash of its pixels
+The rest of the suite sees stored screenshots under their usual PNG paths
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import threading
+
+import numpy as np
+from PIL import Image
+
+from spread import screenshot_sort_key
+
+RAW_STORE_NAME = "screenshots.raw"
+
+# File header: magic, width, height, PIL mode (padded to HEADER_SIZE bytes)
+MAGIC = b"EBRAW001"
+HEADER = struct.Struct('<8sII8s')
+HEADER_SIZE = 64
+
+# Record header: file name, SHA-1 of the pixels (padded to RECORD_HEADER_SIZE bytes)
+MAX_NAME_BYTES = 64
+RECORD_HEADER = struct.Struct(f'<{MAX_NAME_BYTES}s40s')
+RECORD_HEADER_SIZE = 128
+
+# Bytes per pixel of the modes a store can hold
+MODE_BANDS = {'L': 1, 'RGB': 3, 'RGBA': 4}
+
+
+class RawStore:
+    """
+    Append-only file of same-size screenshots, read through a memory map
+    A record cut short (e.g. by a crash during capture) is ignored and overwritten by the
+    next append; a name stored twice refers to its last record
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.size = None
+        self.mode = None
+        self.stride = None
+        self.names = []
+        self.digests = []
+        self.index = {}
+        self._map = None
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                magic, width, height, mode = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a raw screenshot store")
+            self._set_format((width, height), mode.rstrip(b'\0').decode('ascii'))
+            self.refresh()
+
+    def _set_format(self, size, mode):
+        self.size = size
+        self.mode = mode
+        self.stride = RECORD_HEADER_SIZE + size[0] * size[1] * MODE_BANDS[mode]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def _offset(self, number):
+        return HEADER_SIZE + number * self.stride
+
+    def refresh(self):
+        """Pick up records appended since the store was opened (e.g. by a running capture)"""
+        if self.stride is None:
+            return
+        count = (os.path.getsize(self.path) - HEADER_SIZE) // self.stride
+        with open(self.path, 'rb') as f:
+            for number in range(len(self.names), count):
+                f.seek(self._offset(number))
+                name, digest = RECORD_HEADER.unpack(f.read(RECORD_HEADER.size))
+                self._add(name.rstrip(b'\0').decode('utf-8'), digest.decode('ascii'))
+
+    def _add(self, name, digest):
+        self.index[name] = len(self.names)
+        self.names.append(name)
+        self.digests.append(digest)
+
+    def append(self, name, img):
+        """
+        Add a screenshot, returns the hash of its pixels
+        Raises ValueError if its size or mode differs from the screenshots already stored
+        """
+        if img.mode not in MODE_BANDS:
+            raise ValueError(f"Can't store {img.mode} images")
+        encoded_name = name.encode('utf-8')
+        if len(encoded_name) > MAX_NAME_BYTES:
+            raise ValueError(f"File name too long for the raw store: {name}")
+
+        # Hashing releases the GIL, so it runs outside the lock
+        data = img.tobytes()
+        digest = hashlib.sha1(data).hexdigest()
+
+        with self._lock:
+            if self.stride is None:
+                self._set_format(img.size, img.mode)
+                with open(self.path, 'wb') as f:
+                    f.write(HEADER.pack(MAGIC, img.width, img.height, img.mode.encode('ascii'))
+                            .ljust(HEADER_SIZE, b'\0'))
+            elif img.size != self.size or img.mode != self.mode:
+                raise ValueError(f"{name} is {img.mode} {img.size[0]}x{img.size[1]}, the store holds "
+                                 f"{self.mode} {self.size[0]}x{self.size[1]}")
+
+            with open(self.path, 'r+b') as f:
+                f.seek(self._offset(len(self.names)))
+                f.write(RECORD_HEADER.pack(encoded_name, digest.encode('ascii'))
+                        .ljust(RECORD_HEADER_SIZE, b'\0'))
+                f.write(data)
+            self._add(name, digest)
+        return digest
+
+    def _view(self, end):
+        """Memory map of the file covering at least `end` bytes (remapped when the file grew)"""
+        if self._map is None or len(self._map) < end:
+            with open(self.path, 'rb') as f:
+                # Images made from the old map keep it alive until they are gone
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def array(self, name):
+        """Zero-copy NumPy view of a stored screenshot's pixels (rows, columns[, bands])"""
+        number = self.index[name]
+        start = self._offset(number) + RECORD_HEADER_SIZE
+        width, height = self.size
+        bands = MODE_BANDS[self.mode]
+        pixels = np.frombuffer(self._view(start + self.stride - RECORD_HEADER_SIZE), dtype=np.uint8,
+                               count=width * height * bands, offset=start)
+        return pixels.reshape((height, width, bands) if bands > 1 else (height, width))
+
+    def image(self, name, box=None):
+        """A stored screenshot, or only the box (left, top, right, bottom) of it, as a PIL image"""
+        pixels = self.array(name)
+        if box:
+            left, top, right, bottom = box
+            pixels = pixels[top:bottom, left:right]
+        return Image.fromarray(np.ascontiguousarray(pixels), self.mode)
+
+    def digest(self, name):
+        return self.digests[self.index[name]]
+
+    def close(self):
+        self._map = None
+
+
+# Stores opened for reading, by folder, shared by everything in a process
+_stores = {}
+
+
+def open_store(folder_path):
+    """The folder's raw store with its latest records, or None if it has none"""
+    path = os.path.join(folder_path, RAW_STORE_NAME)
+    if not os.path.exists(path):
+        _stores.pop(folder_path, None)
+        return None
+    store = _stores.get(folder_path)
+    if store is None:
+        store = _stores[folder_path] = RawStore(path)
+    else:
+        store.refresh()
+    return store
+
+
+def _stored(image_path):
+    """(store, name) for a screenshot path that only exists in its folder's raw store, or None"""
+    if os.path.exists(image_path):
+        return None
+    folder_path, name = os.path.split(image_path)
+    store = _stores.get(folder_path)
+    if store is None or name not in store:
+        store = open_store(folder_path)
+    if store is None or name not in store:
+        return None
+    return store, name
+
+
+def list_screenshots(folder_path):
+    """
+    Paths of a folder's screenshots in page order: its PNG files and the screenshots in
+    its raw store, found with a single directory scan
+    """
+    if not os.path.isdir(folder_path):
+        return []
+    with os.scandir(folder_path) as entries:
+        names = {entry.name for entry in entries if entry.name.endswith('.png') and entry.is_file()}
+    store = open_store(folder_path)
+    if store is not None:
+        names.update(store.names)
+    return sorted((os.path.join(folder_path, name) for name in names), key=screenshot_sort_key)
+
+
+def is_stored(image_path):
+    """True if the screenshot is kept in a raw store rather than as a file"""
+    return _stored(image_path) is not None
+
+
+def open_screenshot(image_path):
+    """Open a screenshot as a PIL image, from its file or its folder's raw store"""
+    stored = _stored(image_path)
+    if stored is None:
+        return Image.open(image_path)
+    store, name = stored
+    return store.image(name)
+
+
+def stored_crop(image_path, box):
+    """The box of a screenshot in a raw store, copied straight from the memory map"""
+    store, name = _stored(image_path)
+    return store.image(name, box)
+
+
+def screenshot_bytes(image_path):
+    """Size of a screenshot on disk: its file, or its record in the raw store"""
+    stored = _stored(image_path)
+    return os.path.getsize(image_path) if stored is None else stored[0].stride
+
+
+def stored_digest(image_path):
+    """Hash of the pixels of a screenshot in a raw store"""
+    store, name = _stored(image_path)
+    return store.digest(name)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Background Screenshot Saving
+PNG encoding of a full-resolution screenshot takes hundreds of milliseconds;
+a bounded queue lets background threads do it while the capture loop moves on
+(zlib releases the GIL, so the threads really run in parallel)
+With a raw store the threads append raw pixels instead, which needs no encoding
+"""
+
+import os
+import queue
+import threading
+import time
+
+from instrument import tracer
+
+# Number of background threads encoding PNGs
+SAVE_WORKERS = 2
+
+# Screenshots that may wait in memory before the capture loop has to wait
+MAX_PENDING = 4
+
+
+class SaveQueue:
+    """
+    Bounded queue of screenshots that are saved by background threads
+    put() blocks while the queue is full (backpressure), close() waits until
+    every queued screenshot has been written
+    With a raw_store (see raw_store.RawStore) screenshots are appended to it under their
+    file name; one that doesn't match the store's size is still saved as a PNG
+    """
+
+    def __init__(self, workers=SAVE_WORKERS, max_pending=MAX_PENDING, raw_store=None):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self.raw_store = raw_store
+        self._lock = threading.Lock()
+        self._threads = []
+        self._closed = False
+
+        self.saved = 0
+        self.errors = []
+        self.encode_seconds = 0.0
+        self.blocked_seconds = 0.0
+
+        for _ in range(max(1, workers)):
+            thread = threading.Thread(target=self._run, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            image, filepath = item
+            start = time.perf_counter()
+            nbytes = None
+            try:
+                nbytes = self._save(image, filepath)
+                error = None
+            except Exception as e:
+                error = (filepath, e)
+            elapsed = time.perf_counter() - start
+            tracer.record('save', elapsed, nbytes)
+
+            with self._lock:
+                self.encode_seconds += elapsed
+                if error:
+                    self.errors.append(error)
+                else:
+                    self.saved += 1
+
+    def _save(self, image, filepath):
+        """Write one screenshot, returns the bytes written"""
+        if self.raw_store is not None:
+            try:
+                self.raw_store.append(os.path.basename(filepath), image)
+                return self.raw_store.stride
+            except ValueError:
+                # E.g. the window was resized during capture
+                pass
+        # Written under a temporary name, so an interrupted save never leaves a partial PNG
+        temp_path = filepath + ".tmp"
+        image.save(temp_path, 'PNG')
+        os.replace(temp_path, filepath)
+        return os.path.getsize(filepath)
+
+    def put(self, image, filepath):
+        """Queue a screenshot for saving, waiting while the queue is full"""
+        start = time.perf_counter()
+        self._queue.put((image, filepath))
+        blocked = time.perf_counter() - start
+        self.blocked_seconds += blocked
+        tracer.record('save_wait', blocked)
+
+    def close(self):
+        """Finish saving everything that was queued and stop the threads"""
+        if self._closed:
+            return
+        self._closed = True
+
+        start = time.perf_counter()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self.blocked_seconds += time.perf_counter() - start
+
+    @property
+    def hidden_seconds(self):
+        """Encoding time that overlapped with capturing instead of blocking it"""
+        return max(0.0, self.encode_seconds - self.blocked_seconds)
+
+    def print_summary(self):
+        """Print how much PNG encoding was moved off the capture loop"""
+        work = "raw writing" if self.raw_store is not None else "PNG encoding"
+        print(f"\n💾 Saved {self.saved} screenshots in the background: "
+              f"{self.encode_seconds:.1f}s of {work}, {self.hidden_seconds:.1f}s of it hidden "
+              f"behind page turns")
+        for filepath, error in self.errors:
+            print(f"❌ Could not save {filepath}: {error}")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Capture Session State
+Records the progress of a capture in its screenshots folder (page count,
+settings, the spreads captured so far and their page hashes), so an
+interrupted capture can carry on into the same folder with capture.py --resume
+instead of starting again from page 1
+"""
+
+import json
+import os
+import time
+
+from pagehash import hamming
+from raw_store import is_stored, list_screenshots, open_screenshot
+
+SESSION_FILENAME = "capture_session.json"
+SESSION_VERSION = 1
+
+
+def spread_filename(spread, total_pages):
+    """File name of a spread's screenshot (spreads are numbered from 1)"""
+    page_start = (spread - 1) * 2 + 1
+    page_end = min(spread * 2, total_pages)
+    return f"pages_{page_start:03d}-{page_end:03d}.png"
+
+
+def screenshot_complete(path):
+    """
+    True if a screenshot can be read back: raw store records are only indexed once fully
+    written, a PNG file must be non-empty and pass PIL's verify()
+    """
+    if is_stored(path):
+        return True
+    try:
+        if os.path.getsize(path) == 0:
+            return False
+        with open_screenshot(path) as img:
+            img.verify()
+    except Exception:
+        return False
+    return True
+
+
+class CaptureSession:
+    """
+    Progress of one capture, saved to its folder after every spread
+    hashes holds the page hash (pagehash.dhash) of every captured spread, by spread number
+    """
+
+    def __init__(self, screenshots_dir, total_pages, settings, hashes=None, finished=False, started=None):
+        self.screenshots_dir = screenshots_dir
+        self.path = os.path.join(screenshots_dir, SESSION_FILENAME)
+        self.total_pages = total_pages
+        self.settings = settings
+        self.hashes = hashes or {}
+        self.finished = finished
+        self.started = started or time.strftime('%Y-%m-%dT%H:%M:%S')
+
+    @property
+    def iterations(self):
+        return (self.total_pages + 1) // 2
+
+    @classmethod
+    def load(cls, screenshots_dir):
+        """The session saved in a folder, or None if there is none (or it can't be read)"""
+        try:
+            with open(os.path.join(screenshots_dir, SESSION_FILENAME)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != SESSION_VERSION:
+            return None
+        hashes = {int(spread): page_hash for spread, page_hash in data['hashes'].items()}
+        return cls(screenshots_dir, data['total_pages'], data['settings'], hashes,
+                   data['finished'], data['started'])
+
+    def record(self, spread, page_hash):
+        """Remember a captured spread"""
+        self.hashes[spread] = page_hash
+        self.save()
+
+    def finish(self):
+        self.finished = True
+        self.save()
+
+    def next_spread(self):
+        """
+        First spread to capture when resuming: the first one without a complete screenshot on disk
+        Spreads still waiting to be saved when the capture was killed count as missing, and so
+        do PNG files it left partly written
+        """
+        existing = {os.path.basename(path) for path in list_screenshots(self.screenshots_dir)}
+        spread = 1
+        while spread in self.hashes:
+            filename = spread_filename(spread, self.total_pages)
+            if filename not in existing or not screenshot_complete(os.path.join(self.screenshots_dir, filename)):
+                break
+            spread += 1
+        return spread
+
+    def locate(self, page_hash, threshold):
+        """
+        Recorded spread that a screen with this page hash shows, latest first, or None
+        Used to find where the book is when a capture is resumed; that can be past the first
+        spread to capture, if the capture was killed before it saved the last spreads it recorded
+        """
+        for spread in sorted(self.hashes, reverse=True):
+            if hamming(self.hashes[spread], page_hash) <= threshold:
+                return spread
+        return None
+
+    def save(self):
+        """Write the session atomically"""
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'version': SESSION_VERSION, 'total_pages': self.total_pages, 'settings': self.settings,
+                       'hashes': self.hashes, 'finished': self.finished, 'started': self.started,
+                       'updated': time.strftime('%Y-%m-%dT%H:%M:%S')}, f, indent=1)
+        os.replace(temp_path, self.path)
+
+
+def find_unfinished_session(base_dir):
+    """The most recent unfinished capture session in base_dir's book folders, or None"""
+    if not os.path.isdir(base_dir):
+        return None
+    with os.scandir(base_dir) as entries:
+        folders = sorted((entry.path for entry in entries if entry.is_dir() and entry.name.startswith('book_')),
+                         reverse=True)
+    for folder_path in folders:
+        session = CaptureSession.load(folder_path)
+        if session and not session.finished:
+            return session
+    return None
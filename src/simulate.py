@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Simulated Book Reader
+A fake screen and keyboard for running the capture loop without a display
+Time is virtual: sleep() advances the clock instantly, so a whole book
+"captures" in seconds while page turns still take realistic amounts of time
+"""
+
+import random
+from PIL import Image
+
+
+class SimulatedReader:
+    """
+    Reader window showing a list of page spreads
+    After a 'right' (or 'left') key press the screen animates from the old spread to the new
+    one for turn_time seconds (plus random jitter), then shows the new spread
+    """
+
+    def __init__(self, pages, turn_time=0.4, turn_jitter=0.0, grab_time=0.0, seed=0):
+        self.pages = pages
+        self.turn_time = turn_time
+        self.turn_jitter = turn_jitter
+        self.grab_time = grab_time
+        self.rng = random.Random(seed)
+
+        self.now = 0.0
+        self.index = 0
+        self.turn_from = 0
+        self.turn_start = 0.0
+        self.turn_duration = 0.0
+        self.grabs = 0
+        self.presses = 0
+
+    def clock(self):
+        """Current virtual time in seconds"""
+        return self.now
+
+    def sleep(self, seconds):
+        """Advance the virtual clock"""
+        self.now += seconds
+
+    def press(self, key):
+        """Turn the page forward on 'right' and back on 'left'; other keys are ignored"""
+        self.presses += 1
+        if key == 'right' and self.index < len(self.pages) - 1:
+            step = 1
+        elif key == 'left' and self.index > 0:
+            step = -1
+        else:
+            return
+
+        self.turn_from = self.index
+        self.index += step
+        self.turn_start = self.now
+        self.turn_duration = self.turn_time + self.rng.uniform(0, self.turn_jitter)
+
+    def grab(self, region=None):
+        """Return what is on screen right now, optionally only a (left, top, width, height) region"""
+        self.grabs += 1
+        self.now += self.grab_time
+
+        progress = (self.now - self.turn_start) / self.turn_duration if self.turn_duration else 1.0
+        if progress >= 1.0:
+            screen = self.pages[self.index]
+        else:
+            screen = Image.blend(self.pages[self.turn_from], self.pages[self.index], max(0.0, progress))
+
+        if region:
+            left, top, width, height = region
+            screen = screen.crop((left, top, left + width, top + height))
+        return screen
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Spread Splitting
+Every screenshot shows two book pages side by side. This finds the gutter
+between them with a column profile of the ink, splits the spread into single
+pages, and trims each page to its own content margins
+"""
+
+import os
+import re
+
+import numpy as np
+
+# Profiles are computed on a copy shrunk by this factor
+PROFILE_SCALE = 4
+
+# Gray levels below this count as ink (text, lines, pictures)
+INK_THRESHOLD = 160
+
+# A column with at most this share of ink pixels counts as empty
+EMPTY_COLUMN_FRACTION = 0.002
+
+# The gutter is searched for in this horizontal band of the spread
+GUTTER_BAND = (0.3, 0.7)
+
+# Margin kept around the trimmed content, as a share of the page size
+TRIM_PADDING = 0.03
+
+PAGE_RANGE_PATTERN = re.compile(r'pages?_(\d+)(?:-(\d+))?')
+
+
+def parse_page_range(filename):
+    """Return (first page, last page) from a 'pages_XXX-YYY' filename, or None"""
+    match = PAGE_RANGE_PATTERN.search(filename)
+    if not match:
+        return None
+    first = int(match.group(1))
+    last = int(match.group(2)) if match.group(2) else first
+    return first, last
+
+
+def screenshot_sort_key(path):
+    """
+    Sort key putting screenshots in page order, also past page 999 where the
+    zero-padded 'pages_XXX-YYY' names stop sorting as text; other names go last
+    """
+    name = os.path.basename(path)
+    page_range = parse_page_range(name)
+    return (0,) + page_range + (name,) if page_range else (1, 0, 0, name)
+
+
+# Lookup table marking ink pixels white, everything else black
+_INK_LUT = [255 if value < INK_THRESHOLD else 0 for value in range(256)]
+
+
+def _ink_blocks(img, scale):
+    """
+    Ink mask of an image shrunk by scale: a block counts as ink if any of its pixels is ink
+    Thresholding before shrinking keeps thin text strokes from fading into the background
+    """
+    marked = img.convert('L').point(_INK_LUT)
+    if scale > 1:
+        marked = marked.reduce(scale)
+    return np.asarray(marked) > 0
+
+
+def find_gutter(ink):
+    """
+    Find the gutter column in an ink mask of a spread
+    Returns the middle of the widest run of empty columns inside GUTTER_BAND, or None
+    """
+    height, width = ink.shape
+    empty = ink.mean(axis=0) <= EMPTY_COLUMN_FRACTION
+
+    band_start = int(width * GUTTER_BAND[0])
+    band_stop = int(width * GUTTER_BAND[1])
+    band = np.concatenate(([False], empty[band_start:band_stop], [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(band))
+    if not len(edges):
+        return None
+
+    starts, stops = edges[0::2], edges[1::2]
+    widest = np.argmax(stops - starts)
+    return band_start + int(starts[widest] + stops[widest]) // 2
+
+
+def content_box(ink, padding=TRIM_PADDING):
+    """
+    Bounding box (left, top, right, bottom) of the ink in a mask, with padding
+    Returns None for a page without any ink
+    """
+    rows = np.flatnonzero(ink.any(axis=1))
+    cols = np.flatnonzero(ink.any(axis=0))
+    if not len(rows):
+        return None
+
+    height, width = ink.shape
+    pad_x, pad_y = int(width * padding), int(height * padding)
+    return (max(0, int(cols[0]) - pad_x), max(0, int(rows[0]) - pad_y),
+            min(width, int(cols[-1]) + 1 + pad_x), min(height, int(rows[-1]) + 1 + pad_y))
+
+
+def _trimmed(img, ink, left, right, scale):
+    """Crop img to the ink inside columns [left, right) of the profile mask"""
+    box = content_box(ink[:, left:right])
+    if box is None:
+        box = (0, 0, right - left, ink.shape[0])
+    box_left, top, box_right, bottom = box
+    return img.crop(((left + box_left) * scale, top * scale,
+                     min(img.width, (left + box_right) * scale), min(img.height, bottom * scale)))
+
+
+def split_spread(img, first_page=None, last_page=None):
+    """
+    Split a two-page spread into single pages trimmed to their content
+    Returns a list of (page number, image); page numbers come from first/last_page
+    A spread without a gutter stays one page; for a single last page the empty half is dropped
+    """
+    scale = PROFILE_SCALE
+    ink = _ink_blocks(img, scale)
+    width = ink.shape[1]
+
+    gutter = find_gutter(ink)
+    if gutter is None:
+        return [(first_page, _trimmed(img, ink, 0, width, scale))]
+
+    # The last screenshot of a book with an odd page count shows only the left page
+    if first_page is not None and first_page == last_page and not ink[:, gutter:].any():
+        return [(first_page, _trimmed(img, ink, 0, gutter, scale))]
+
+    right_page = last_page if last_page != first_page else None
+    return [(first_page, _trimmed(img, ink, 0, gutter, scale)),
+            (right_page, _trimmed(img, ink, gutter, width, scale))]
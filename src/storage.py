@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Storage Footprint Tool
+Shrinks a book's screenshot and frame folders without losing a single pixel:
+every PNG is re-encoded at the highest compression level, as grayscale or
+with an exact palette when it has few colors, and only replaced if the new
+file is smaller and decodes to the same pixels
+Optionally packs the screenshots into one archive next to the folder
+Also converts a book's screenshots between PNG files and the raw store that
+capture.py --raw writes (see raw_store.py)
+"""
+
+import argparse
+import glob
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from manifest import Manifest, file_digest
+from process import get_output_dir, select_folder
+from raw_store import RAW_STORE_NAME, RawStore
+
+
+def _exact_palette(img):
+    """
+    The RGB image as a palette image with exactly its own colors, or None if it has more than 256
+    Unlike quantize(), this never changes a pixel
+    """
+    if img.getcolors(256) is None:
+        return None
+    pixels = np.asarray(img, dtype=np.uint32)
+    codes = (pixels[..., 0] << 16) | (pixels[..., 1] << 8) | pixels[..., 2]
+    colors, indices = np.unique(codes, return_inverse=True)
+
+    palette_img = Image.fromarray(indices.reshape(codes.shape).astype(np.uint8), 'P')
+    palette = np.stack([colors >> 16, (colors >> 8) & 255, colors & 255], axis=1)
+    palette_img.putpalette(palette.astype(np.uint8).tobytes())
+    return palette_img
+
+
+def _smallest_mode(img):
+    """Losslessly convert an image to the most compact PNG mode for its content"""
+    if img.mode not in ('RGB', 'RGBA', 'L', 'P'):
+        return img
+    if img.mode == 'RGBA':
+        if img.getextrema()[3][0] < 255:
+            return img
+        img = img.convert('RGB')
+    if img.mode == 'RGB':
+        red, green, blue = (np.asarray(band) for band in img.split())
+        if np.array_equal(red, green) and np.array_equal(green, blue):
+            img = img.convert('L')
+        else:
+            return _exact_palette(img) or img
+    return img
+
+
+def _same_pixels(first, second):
+    """True if both images decode to exactly the same RGBA pixels"""
+    return (first.size == second.size and
+            np.array_equal(np.asarray(first.convert('RGBA')), np.asarray(second.convert('RGBA'))))
+
+
+def recompress_png(path):
+    """
+    Re-encode one PNG losslessly, replacing it only if the result is smaller and pixel-identical
+    Returns (path, bytes before, bytes after, old digest, new digest); digests are None if unchanged
+    """
+    before = os.path.getsize(path)
+    try:
+        with Image.open(path) as original:
+            original.load()
+        info = {'dpi': original.info['dpi']} if 'dpi' in original.info else {}
+
+        temp_path = path + ".tmp"
+        _smallest_mode(original).save(temp_path, 'PNG', optimize=True, **info)
+        after = os.path.getsize(temp_path)
+
+        with Image.open(temp_path) as candidate:
+            identical = _same_pixels(original, candidate)
+        if after >= before or not identical:
+            os.remove(temp_path)
+            return path, before, before, None, None
+
+        old_digest = file_digest(path)
+        stat = os.stat(path)
+        os.replace(temp_path, path)
+        # Keep the capture time, which some tools use to order screenshots
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        return path, before, after, old_digest, file_digest(path)
+
+    except Exception as e:
+        print(f"❌ Error recompressing {path}: {e}")
+        if os.path.exists(path + ".tmp"):
+            os.remove(path + ".tmp")
+        return path, before, before, None, None
+
+
+def recompress_folder(paths, workers=1):
+    """Recompress PNGs, optionally on a pool of worker processes; yields recompress_png results"""
+    if workers <= 1:
+        for path in paths:
+            yield recompress_png(path)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(recompress_png, paths)
+
+
+def archive_screenshots(folder_path):
+    """
+    Pack a folder's screenshots into <folder>.zip and remove the loose files
+    PNGs are already compressed, so they are stored as they are
+    """
+    image_files = sorted(glob.glob(os.path.join(folder_path, "*.png")))
+    if not image_files:
+        return None
+
+    archive_path = folder_path.rstrip(os.sep) + ".zip"
+    with zipfile.ZipFile(archive_path, 'a', zipfile.ZIP_STORED) as archive:
+        existing = set(archive.namelist())
+        for path in image_files:
+            if os.path.basename(path) not in existing:
+                archive.write(path, os.path.basename(path))
+
+    # Only delete what is readable back from the archive
+    with zipfile.ZipFile(archive_path) as archive:
+        if archive.testzip() is not None:
+            raise zipfile.BadZipFile(f"{archive_path} failed its integrity check")
+        archived = set(archive.namelist())
+    for path in image_files:
+        if os.path.basename(path) in archived:
+            os.remove(path)
+    return archive_path
+
+
+def unpack_screenshots(folder_path):
+    """Restore screenshots from <folder>.zip into the folder, so they can be processed again"""
+    archive_path = folder_path.rstrip(os.sep) + ".zip"
+    if not os.path.exists(archive_path):
+        return 0
+    os.makedirs(folder_path, exist_ok=True)
+    with zipfile.ZipFile(archive_path) as archive:
+        names = archive.namelist()
+        archive.extractall(folder_path)
+    os.remove(archive_path)
+    return len(names)
+
+
+def _store_image(img, mode=None):
+    """
+    The image in a mode a raw store holds, without changing any pixel: palette and grayscale
+    PNGs (see _smallest_mode) go back to RGB, or RGBA if they have transparency, or to the
+    store's mode if it has one. Returns None if that would change pixels
+    """
+    if mode is None:
+        transparent = img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info
+        mode = 'RGBA' if transparent else 'RGB'
+    if img.mode == mode:
+        return img
+    converted = img.convert(mode)
+    return converted if _same_pixels(img, converted) else None
+
+
+def png_to_raw(folder_path):
+    """
+    Move a folder's PNG screenshots into its raw store, so processing needs no decoding
+    Recompressed (palette or grayscale) screenshots are stored with the capture's colors
+    Screenshots of another size than the first one stay PNG files
+    Returns the number of screenshots moved
+    """
+    store = RawStore(os.path.join(folder_path, RAW_STORE_NAME))
+    manifest = Manifest(get_output_dir(folder_path))
+    moved = 0
+    for path in sorted(glob.glob(os.path.join(folder_path, "*.png"))):
+        name = os.path.basename(path)
+        try:
+            with Image.open(path) as img:
+                img.load()
+                converted = _store_image(img, store.mode)
+                if converted is None:
+                    raise ValueError(f"{img.mode} pixels don't fit the store's {store.mode} without loss")
+                new_digest = store.append(name, converted)
+        except ValueError as e:
+            print(f"⚠️  Keeping {name} as PNG: {e}")
+            continue
+        old_digest = file_digest(path)
+        os.remove(path)
+        # Processing results stay valid, the pixels are the same
+        manifest.update_source(path, old_digest, new_digest)
+        moved += 1
+    if manifest.entries:
+        manifest.save()
+    return moved
+
+
+def raw_to_png(folder_path):
+    """Write the screenshots of a folder's raw store back as PNG files and remove the store"""
+    store_path = os.path.join(folder_path, RAW_STORE_NAME)
+    if not os.path.exists(store_path):
+        return 0
+    store = RawStore(store_path)
+    manifest = Manifest(get_output_dir(folder_path))
+    for name in store.index:
+        path = os.path.join(folder_path, name)
+        store.image(name).save(path, 'PNG')
+        manifest.update_source(path, store.digest(name), file_digest(path))
+    if manifest.entries:
+        manifest.save()
+
+    count = len(store.index)
+    store.close()
+    os.remove(store_path)
+    return count
+
+
+def shrink_book(folder_path, workers=1, archive=False):
+    """Recompress a book's screenshots and cropped frames, then optionally archive the screenshots"""
+    frames_dir = get_output_dir(folder_path)
+    image_files = sorted(glob.glob(os.path.join(folder_path, "*.png")))
+    frame_files = sorted(glob.glob(os.path.join(frames_dir, "*.png")))
+    paths = image_files + frame_files
+
+    if not paths:
+        print(f"❌ No PNG files found in {folder_path}")
+        return
+
+    print(f"\n🗜️  Recompressing {len(paths)} PNGs with {workers} worker(s)...")
+    manifest = Manifest(frames_dir)
+    total_before = total_after = changed = 0
+    start = time.perf_counter()
+    for i, (path, before, after, old_digest, new_digest) in enumerate(recompress_folder(paths, workers), 1):
+        total_before += before
+        total_after += after
+        if new_digest:
+            changed += 1
+            manifest.update_source(path, old_digest, new_digest)
+            print(f"📄 {i}/{len(paths)}: {os.path.basename(path)} - "
+                  f"{before / 1024:.0f} KB → {after / 1024:.0f} KB")
+        else:
+            print(f"📄 {i}/{len(paths)}: {os.path.basename(path)} - already compact")
+    elapsed = time.perf_counter() - start
+    if manifest.entries:
+        manifest.save()
+
+    saved = total_before - total_after
+    print(f"\n✅ Recompressed {changed}/{len(paths)} files, every pixel unchanged")
+    print(f"💾 {total_before / 1e6:.1f} MB → {total_after / 1e6:.1f} MB "
+          f"(saved {saved / 1e6:.1f} MB, {100 * saved / max(1, total_before):.0f}%)")
+    print(f"⚡ {len(paths) / elapsed:.1f} files/s, {total_before / 1e6 / elapsed:.1f} MB/s")
+
+    if archive:
+        archive_path = archive_screenshots(folder_path)
+        if archive_path:
+            print(f"📦 Screenshots archived to: {archive_path}")
+            print("   Restore them with: python3 src/storage.py --unpack")
+
+
+def main(argv=None):
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Losslessly shrink a book's screenshot folders")
+    parser.add_argument('folder', nargs='?',
+                        help="screenshot folder (default: choose from ~/Documents/ebook_suite)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="number of worker processes (default: 1)")
+    parser.add_argument('--archive', action='store_true',
+                        help="pack the screenshots into one .zip next to the folder afterwards")
+    parser.add_argument('--unpack', action='store_true',
+                        help="restore screenshots from the folder's .zip archive")
+    parser.add_argument('--to-raw', action='store_true',
+                        help="move the PNG screenshots into an uncompressed screenshots.raw store "
+                             "(faster processing, several times the disk space)")
+    parser.add_argument('--to-png', action='store_true',
+                        help="convert the folder's screenshots.raw store back to PNG files")
+    args = parser.parse_args(argv)
+
+    print("🗜️  Book Storage Tool")
+    print("=" * 40)
+
+    if args.folder:
+        folder_path = os.path.abspath(os.path.expanduser(args.folder))
+    else:
+        # Archived books keep their (empty) folder, so they are listed too
+        folder_path = select_folder()
+
+    print(f"\n📂 Selected folder: {folder_path}")
+    if args.unpack:
+        count = unpack_screenshots(folder_path)
+        print(f"📦 Restored {count} screenshots" if count else "❌ No archive found for this folder")
+        return
+    if args.to_raw:
+        print(f"🧱 Moved {png_to_raw(folder_path)} screenshots into {RAW_STORE_NAME}")
+        return
+    if args.to_png:
+        count = raw_to_png(folder_path)
+        print(f"🖼️  Wrote {count} screenshots as PNG" if count else f"❌ No {RAW_STORE_NAME} in this folder")
+        return
+
+    shrink_book(folder_path, workers=max(1, args.workers), archive=args.archive)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+"""Make the flat modules in src/ and the synthetic book generator importable from the tests"""
+
+import os
+import sys
+
+tests_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(tests_dir, '..', 'src'))
+sys.path.insert(0, os.path.join(tests_dir, '..', 'benchmarks'))
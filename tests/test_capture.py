@@ -0,0 +1,132 @@
+"""Duplicate spreads and page-turn waits of the capture loop (capture.py), on a simulated reader"""
+
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import capture
+import synthetic
+from capture import (DELAY_TIMEOUT, DUPLICATE_RETRIES, SETTLE_INTERVAL, SETTLE_MAX, SETTLE_POLLS,
+                     capture_pages, grab_new_page, wait_for_settle)
+from pagehash import dhash
+from session import spread_filename
+from simulate import SimulatedReader
+
+
+def spreads(count):
+    return [synthetic.make_screenshot(size=(960, 600), frame_box=(100, 30, 940, 580), seed=seed)
+            for seed in range(count)]
+
+
+def same_image(a, b):
+    return np.array_equal(np.asarray(a.convert('RGB')), np.asarray(b.convert('RGB')))
+
+
+def test_duplicate_spread_is_retried_then_reported():
+    pages = spreads(2)
+    reader = SimulatedReader(pages)
+
+    screenshot, _, retries = grab_new_page(reader.grab, dhash(pages[0]), reader.sleep)
+
+    assert screenshot is None
+    assert retries == DUPLICATE_RETRIES
+    # Waited progressively longer before each retry
+    assert reader.clock() == DELAY_TIMEOUT * sum(range(1, DUPLICATE_RETRIES + 1))
+
+
+def test_slow_page_turn_is_retried():
+    pages = spreads(2)
+    reader = SimulatedReader(pages, turn_time=DELAY_TIMEOUT - 1)
+    reader.press('right')
+
+    screenshot, _, retries = grab_new_page(reader.grab, dhash(pages[0]), reader.sleep)
+
+    assert retries == 1
+    assert same_image(screenshot, pages[1])
+
+
+def test_capture_stops_at_a_page_that_does_not_turn(tmp_path, capsys):
+    pages = spreads(2)
+    reader = SimulatedReader(pages, turn_time=0)
+    # The book ends after two spreads, the third one shows the second again
+    captured = capture_pages(str(tmp_path), 6, 3, grab=reader.grab, press_key=reader.press,
+                             sleep=reader.sleep, clock=reader.clock)
+
+    assert captured == 2
+    assert not (tmp_path / spread_filename(3, 6)).exists()
+    assert f"did not change after {DUPLICATE_RETRIES} retries" in capsys.readouterr().out
+
+
+def test_settle_returns_once_the_turn_is_done():
+    pages = spreads(2)
+    reader = SimulatedReader(pages, turn_time=0.4)
+    reader.press('right')
+
+    image, waited, settled = wait_for_settle(reader.grab, dhash(pages[0]), reader.sleep, reader.clock)
+
+    assert settled
+    assert same_image(image, pages[1])
+    # The first poll of the new spread, plus the ones confirming it holds still
+    assert 0.4 <= waited <= 0.4 + (SETTLE_POLLS - 1) * SETTLE_INTERVAL + 1e-6
+
+
+def test_settle_times_out_when_the_page_does_not_turn():
+    pages = spreads(2)
+    reader = SimulatedReader(pages)
+
+    image, waited, settled = wait_for_settle(reader.grab, dhash(pages[0]), reader.sleep, reader.clock)
+
+    assert not settled
+    assert image is None
+    assert SETTLE_MAX <= waited <= SETTLE_MAX + SETTLE_INTERVAL + 1e-6
+
+
+def strip_preview(reader):
+    """Grab of a strip through the middle of the simulated screen, like backends.PreviewCapture"""
+    return lambda: reader.grab((0, 250, 960, 150))
+
+
+@pytest.mark.parametrize('preview', [False, True])
+@pytest.mark.parametrize('turn_time', [1.5, 2.5, SETTLE_MAX - 0.1])
+def test_slow_animation_is_not_saved_half_drawn(tmp_path, turn_time, preview):
+    # Animations this slow change the screen little between two polls
+    pages = spreads(3)
+    reader = SimulatedReader(pages, turn_time=turn_time)
+
+    captured = capture_pages(str(tmp_path), 6, 3, grab=reader.grab, press_key=reader.press,
+                             sleep=reader.sleep, clock=reader.clock,
+                             grab_preview=strip_preview(reader) if preview else None)
+
+    assert captured == 3
+    for spread, page in enumerate(pages, 1):
+        with Image.open(tmp_path / spread_filename(spread, 6)) as screenshot:
+            assert same_image(screenshot, page)
+
+
+def test_preview_watches_page_turns(tmp_path):
+    pages = spreads(3)
+    reader = SimulatedReader(pages, turn_time=0.4)
+    full_grabs = []
+
+    def grab():
+        full_grabs.append(reader.clock())
+        return reader.grab()
+
+    captured = capture_pages(str(tmp_path), 6, 3, grab=grab, press_key=reader.press,
+                             sleep=reader.sleep, clock=reader.clock, grab_preview=strip_preview(reader))
+
+    assert captured == 3
+    # Only the screenshots themselves are full grabs, none was retried
+    assert len(full_grabs) == 3
+
+
+@pytest.mark.parametrize('pages', ['0', '-4', 'ten'])
+def test_page_count_below_one_is_rejected(tmp_path, pages, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        capture.main(['--backend', 'replay', '--pages', pages, '--output-dir', str(tmp_path)])
+
+    assert exit_info.value.code == 2
+    assert "--pages" in capsys.readouterr().err
+    assert not os.listdir(tmp_path)
@@ -0,0 +1,28 @@
+"""Capturing the books of a queue (capture_queue.py) with the replay backend"""
+
+import backends
+import synthetic
+from capture import SETTLE_POLLS
+from capture_queue import BOOK_DEFAULTS, capture_book, open_session
+
+
+def test_capture_book_watches_page_turns_on_a_strip(tmp_path, monkeypatch):
+    replay_dir = str(tmp_path / "replay")
+    synthetic.write_screenshots(replay_dir, 3, size=(960, 600), frame_box=(100, 30, 940, 580))
+    book = dict(BOOK_DEFAULTS, title="Book", pages=6)
+    session = open_session(book, None, str(tmp_path / "captures"))
+
+    previews = []
+    grab = backends.PreviewCapture.grab
+
+    def counted_grab(self):
+        image = grab(self)
+        previews.append(image.size)
+        return image
+
+    monkeypatch.setattr(backends.PreviewCapture, 'grab', counted_grab)
+    assert capture_book(book, session, 'replay', replay_dir, start_delay=0)
+
+    # Two page turns, each polled on a quarter-height strip of the 960x600 screen
+    assert len(previews) >= 2 * SETTLE_POLLS
+    assert set(previews) == {(960, 150)}
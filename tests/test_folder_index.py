@@ -0,0 +1,51 @@
+"""Cached listing of the book folders (folder_index.py)"""
+
+import os
+import shutil
+
+import folder_index
+import synthetic
+from folder_index import FolderIndex
+
+
+def add_book(base_dir, name, count):
+    synthetic.write_screenshots(os.path.join(base_dir, name), count, size=(960, 600),
+                                frame_box=(100, 30, 940, 580))
+
+
+def test_index_follows_added_and_deleted_books(tmp_path, monkeypatch):
+    base_dir = str(tmp_path)
+    reads = []
+    read_folder = folder_index.read_folder
+
+    def counted_read(folder_path, output_dir):
+        reads.append(os.path.basename(folder_path))
+        return read_folder(folder_path, output_dir)
+
+    monkeypatch.setattr(folder_index, 'read_folder', counted_read)
+
+    add_book(base_dir, "book_20250101_000000", 3)
+    folders = FolderIndex(base_dir).refresh()
+    assert [(folder['name'], folder['images']) for folder in folders] == [("book_20250101_000000", 3)]
+    assert folders[0]['first_page'] == 1 and folders[0]['last_page'] == 6
+    assert folders[0]['size'] == [960, 600]
+
+    # A new book is read, the unchanged one comes from the saved index
+    add_book(base_dir, "book_20250102_000000", 2)
+    folders = FolderIndex(base_dir).refresh()
+    assert [folder['name'] for folder in folders] == ["book_20250101_000000", "book_20250102_000000"]
+    assert reads == ["book_20250101_000000", "book_20250102_000000"]
+
+    shutil.rmtree(os.path.join(base_dir, "book_20250101_000000"))
+    folders = FolderIndex(base_dir).refresh()
+    assert [folder['name'] for folder in folders] == ["book_20250102_000000"]
+    assert list(FolderIndex(base_dir).folders) == ["book_20250102_000000"]
+    assert len(reads) == 2
+
+
+def test_other_folders_are_not_listed(tmp_path):
+    add_book(str(tmp_path), "book_20250101_000000", 1)
+    os.makedirs(tmp_path / "pdf_book_20250101_000000")
+    os.makedirs(tmp_path / "notes")
+
+    assert [folder['name'] for folder in FolderIndex(str(tmp_path)).refresh()] == ["book_20250101_000000"]
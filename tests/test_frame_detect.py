@@ -0,0 +1,51 @@
+"""Frame detection on synthetic screenshots with known frame positions"""
+
+import pytest
+from PIL import Image
+
+import synthetic
+from frame_detect import consensus_frame, detect_frame, detect_frame_near
+
+TOLERANCE = 2
+
+CASES = [
+    ((1920, 1080), (140, 30, 1880, 1010)),
+    ((2880, 1800), synthetic.FRAME_BOX),
+    ((3840, 2160), (520, 90, 3700, 1990)),
+]
+
+
+def max_error(found, box):
+    return max(abs(a - b) for a, b in zip(found, box))
+
+
+@pytest.mark.parametrize('size,box', CASES)
+def test_detect_frame_finds_known_box(size, box):
+    for seed in range(3):
+        found = detect_frame(synthetic.make_screenshot(size, box, seed=seed))
+        assert found is not None
+        assert max_error(found, box) <= TOLERANCE
+
+
+@pytest.mark.parametrize('size,box', CASES)
+def test_detect_frame_near_follows_a_slightly_moved_frame(size, box):
+    img = synthetic.make_screenshot(size, box, seed=7)
+    for shift in (-4, 3):
+        expected = tuple(value + shift for value in box)
+        assert max_error(detect_frame_near(img, expected), box) <= TOLERANCE
+
+
+def test_detect_frame_without_frame():
+    assert detect_frame(Image.new('RGB', (1920, 1080), (255, 255, 255))) is None
+
+
+def test_consensus_frame_rejects_outlier():
+    size, box = CASES[0]
+    boxes = [detect_frame(synthetic.make_screenshot(size, box, seed=seed)) for seed in range(4)]
+    # A picture page where something else was taken for the frame, and one without a frame
+    boxes += [(400, 300, 900, 700), None]
+    assert max_error(consensus_frame(boxes), box) <= TOLERANCE
+
+
+def test_consensus_frame_without_boxes():
+    assert consensus_frame([None, None]) is None
@@ -0,0 +1,68 @@
+"""Reuse of earlier processing results through the manifest (manifest.py, process.extract_book)"""
+
+import os
+
+from PIL import Image
+
+import synthetic
+from manifest import Manifest
+from process import extract_book
+from raw_store import list_screenshots
+
+FRAME_BOX = (100, 30, 940, 580)
+
+
+def process(folder, output_dir, pdf_path, **options):
+    return extract_book(list_screenshots(folder), FRAME_BOX, output_dir, pdf_path, **options)
+
+
+def test_unchanged_screenshots_are_reused_and_changed_ones_reprocessed(tmp_path):
+    folder = str(tmp_path / "book")
+    output_dir = str(tmp_path / "output")
+    os.makedirs(output_dir)
+    pdf_path = str(tmp_path / "book.pdf")
+    paths = synthetic.write_screenshots(folder, 4, size=(960, 600), frame_box=FRAME_BOX)
+
+    first = process(folder, output_dir, pdf_path)
+    assert first['reused'] == 0 and first['processed'] == 4 and first['pages'] == 4
+
+    second = process(folder, output_dir, pdf_path)
+    assert second['reused'] == 4 and second['pages'] == 4
+
+    # A recaptured screenshot has new content: only it is processed again
+    synthetic.make_screenshot(size=(960, 600), frame_box=FRAME_BOX, seed=99).save(paths[2])
+    third = process(folder, output_dir, pdf_path)
+    assert third['reused'] == 3 and third['processed'] == 4 and third['pages'] == 4
+    entry = Manifest(output_dir).entries[os.path.basename(paths[2])]
+    frame_path = os.path.join(output_dir, entry['frames'][0])
+    with Image.open(frame_path) as frame, Image.open(paths[2]) as screenshot:
+        assert frame.tobytes() == screenshot.crop(FRAME_BOX).tobytes()
+
+
+def test_changed_settings_reprocess_everything(tmp_path):
+    folder = str(tmp_path / "book")
+    output_dir = str(tmp_path / "output")
+    os.makedirs(output_dir)
+    pdf_path = str(tmp_path / "book.pdf")
+    synthetic.write_screenshots(folder, 3, size=(960, 600), frame_box=FRAME_BOX)
+
+    process(folder, output_dir, pdf_path)
+    split = process(folder, output_dir, pdf_path, split=True)
+
+    assert split['reused'] == 0
+    assert split['pages'] == 6
+    assert process(folder, output_dir, pdf_path, split=True)['reused'] == 3
+
+
+def test_deleted_screenshots_leave_the_manifest(tmp_path):
+    folder = str(tmp_path / "book")
+    output_dir = str(tmp_path / "output")
+    os.makedirs(output_dir)
+    paths = synthetic.write_screenshots(folder, 3, size=(960, 600), frame_box=FRAME_BOX)
+    process(folder, output_dir, None)
+
+    os.remove(paths[0])
+    result = process(folder, output_dir, None)
+
+    assert result['reused'] == 2
+    assert sorted(Manifest(output_dir).entries) == sorted(os.path.basename(path) for path in paths[1:])
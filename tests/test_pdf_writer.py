@@ -0,0 +1,133 @@
+"""PDF files written by pdf_writer.PdfWriter, read back with pypdf"""
+
+import numpy as np
+import pytest
+from PIL import features
+
+import synthetic
+from pdf_writer import PdfWriter, encode_page
+
+pypdf = pytest.importorskip('pypdf')
+
+
+def read_pdf(path):
+    return pypdf.PdfReader(path, strict=True)
+
+
+def page(seed=0):
+    return encode_page(synthetic.make_frame((800, 500), seed=seed))
+
+
+def image_filter(pdf_page):
+    return pdf_page['/Resources']['/XObject']['/image'].get_object()['/Filter']
+
+
+def test_writes_g4_and_jpeg_pages_with_metadata(tmp_path):
+    if not features.check('libtiff'):
+        pytest.skip("Group 4 encoding needs Pillow with libtiff")
+    path = str(tmp_path / "book.pdf")
+    text_page = synthetic.make_frame((800, 500), seed=1)
+    text = encode_page(text_page, compact=True)
+    photo = encode_page(synthetic.make_screenshot(size=(960, 600), frame_box=(100, 30, 940, 580)))
+    photo_200dpi = photo._replace(dpi=200)
+    assert text.filter == 'CCITTFaxDecode' and photo.filter == 'DCTDecode'
+
+    with PdfWriter(path, title="A (small) book", author="Someone", subject="Tests", resolution=100) as writer:
+        for encoded in (text, photo, photo_200dpi):
+            writer.add_encoded_page(encoded)
+
+    reader = read_pdf(path)
+    assert len(reader.pages) == 3
+    # Page size in points: pixels at the writer's resolution, or the page's own dpi
+    assert [(float(p.mediabox.width), float(p.mediabox.height)) for p in reader.pages] == \
+        [(576.0, 360.0), (691.2, 432.0), (345.6, 216.0)]
+    assert [image_filter(p) for p in reader.pages] == ['/CCITTFaxDecode', '/DCTDecode', '/DCTDecode']
+    assert reader.metadata.title == "A (small) book"
+    assert reader.metadata.author == "Someone"
+    assert reader.metadata.subject == "Tests"
+    # The Group 4 stream decodes to the page in black and white
+    decoded = reader.pages[0].images[0].image.convert('L')
+    assert np.array_equal(np.asarray(decoded) > 127, np.asarray(text_page.convert('L')) >= 128)
+
+
+def test_empty_writer_writes_a_valid_pdf(tmp_path):
+    path = str(tmp_path / "empty.pdf")
+    with PdfWriter(path, title="Nothing yet") as writer:
+        assert writer.total_pages == 0
+
+    reader = read_pdf(path)
+    assert len(reader.pages) == 0
+    assert reader.metadata.title == "Nothing yet"
+
+
+def test_append_adds_pages_and_keeps_metadata(tmp_path):
+    path = str(tmp_path / "book.pdf")
+    with PdfWriter(path, title="Café book", author="Someone") as writer:
+        writer.add_encoded_page(page(1))
+        writer.add_encoded_page(page(2))
+
+    with PdfWriter(path, append=True) as writer:
+        assert writer.existing_pages == 2
+        writer.add_encoded_page(page(3))
+        assert writer.total_pages == 3
+
+    reader = read_pdf(path)
+    assert len(reader.pages) == 3
+    assert reader.metadata.title == "Café book"
+    assert reader.metadata.author == "Someone"
+
+
+def test_append_to_pillow_pdf_keeps_its_metadata(tmp_path):
+    path = str(tmp_path / "pillow.pdf")
+    # Pillow writes the title as a UTF-16 literal string with escaped parentheses and backslashes
+    title = "Café (draft) \\ notes"
+    synthetic.make_frame((800, 500), seed=1).save(path, title=title, author="Ünsal")
+
+    with PdfWriter(path, append=True) as writer:
+        assert writer.existing_pages == 1
+        assert writer.info['Title'] == title
+        writer.add_encoded_page(page(2))
+
+    reader = read_pdf(path)
+    assert len(reader.pages) == 2
+    assert reader.metadata.title == title
+    assert reader.metadata.author == "Ünsal"
+
+
+def test_cut_file_recovers_to_its_last_checkpoint(tmp_path):
+    path = str(tmp_path / "book.pdf")
+    ends = []
+    with PdfWriter(path, title="Book", checkpoint_pages=2) as writer:
+        for seed in range(5):
+            writer.add_encoded_page(page(seed))
+            ends.append(writer.bytes_written)
+
+    # Cut the file off half-way through the fifth page, after the checkpoint of four
+    with open(path, 'r+b') as f:
+        f.truncate((ends[3] + ends[4]) // 2)
+
+    with PdfWriter(path, append=True) as writer:
+        assert writer.existing_pages == 4
+        writer.add_encoded_page(page(5))
+
+    reader = read_pdf(path)
+    assert len(reader.pages) == 5
+    assert reader.metadata.title == "Book"
+
+
+def test_append_to_missing_file_starts_a_new_pdf(tmp_path):
+    path = str(tmp_path / "new.pdf")
+    with PdfWriter(path, title="New", append=True) as writer:
+        assert writer.existing_pages == 0
+        writer.add_encoded_page(page())
+
+    assert len(read_pdf(path).pages) == 1
+
+
+def test_append_to_a_file_that_is_not_a_pdf(tmp_path):
+    path = tmp_path / "notes.pdf"
+    path.write_bytes(b"not a PDF at all")
+
+    with pytest.raises(ValueError):
+        PdfWriter(str(path), append=True)
+    assert path.read_bytes() == b"not a PDF at all"
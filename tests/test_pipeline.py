@@ -0,0 +1,59 @@
+"""Cropping and PDF writing during capture (pipeline.py), on a simulated reader"""
+
+import os
+from collections import Counter
+
+import numpy as np
+from PIL import Image
+
+import synthetic
+from capture import capture_pages
+from instrument import tracer
+from pipeline import CapturePipeline
+from session import spread_filename
+from simulate import SimulatedReader
+
+FRAME_BOX = (100, 30, 940, 580)
+
+
+def test_every_spread_is_saved_and_processed_once(tmp_path, monkeypatch):
+    pages = [synthetic.make_screenshot(size=(960, 600), frame_box=FRAME_BOX, seed=seed) for seed in range(4)]
+    reader = SimulatedReader(pages)
+    screenshots_dir = tmp_path / "book"
+    screenshots_dir.mkdir()
+
+    processed = []
+    add = CapturePipeline._add
+
+    def counted_add(self, image, filename):
+        processed.append(filename)
+        add(self, image, filename)
+
+    monkeypatch.setattr(CapturePipeline, '_add', counted_add)
+    tracer.reset()
+    pipeline = CapturePipeline(str(tmp_path / "book.pdf"), "Book")
+    captured = capture_pages(str(screenshots_dir), 8, 4, grab=reader.grab, press_key=reader.press,
+                             sleep=reader.sleep, clock=reader.clock, pipeline=pipeline)
+
+    names = [spread_filename(spread, 8) for spread in range(1, 5)]
+    assert captured == 4
+    assert sorted(os.listdir(screenshots_dir)) == sorted(names + ['capture_trace.json', 'capture_trace.csv'])
+    for name, page in zip(names, pages):
+        with Image.open(screenshots_dir / name) as screenshot:
+            assert np.array_equal(np.asarray(screenshot.convert('RGB')), np.asarray(page))
+
+    # Processed in capture order, each spread once
+    assert processed == names
+    assert pipeline.spreads == 4 and pipeline.total_pages == 4
+    assert pipeline.failed == []
+    assert tuple(pipeline.crop_coords) == FRAME_BOX
+
+    # capture_pages closed the pipeline: its thread is done and closing again does nothing
+    assert not pipeline._thread.is_alive()
+    pipeline.close()
+    assert os.path.getsize(tmp_path / "book.pdf") > 0
+
+    stages = Counter(event[0] for event in tracer.events)
+    assert stages['save'] == 4
+    assert stages['crop'] == 4
+    assert stages['pdf_write'] == 4
@@ -0,0 +1,63 @@
+"""Book processing without prompts (process.extract_book)"""
+
+import os
+
+import pytest
+from PIL import features
+
+import synthetic
+from process import extract_book
+from raw_store import list_screenshots
+
+pypdf = pytest.importorskip('pypdf')
+
+FRAME_BOX = (100, 30, 940, 580)
+
+
+def screenshot_with(frame, seed=0):
+    """Synthetic screenshot showing `frame` inside the reading frame"""
+    screenshot = synthetic.make_screenshot(size=(960, 600), frame_box=FRAME_BOX, seed=seed)
+    screenshot.paste(frame, FRAME_BOX[:2])
+    return screenshot
+
+
+def page_images(pdf_path):
+    """(filter, color space) of the image on every page of a PDF"""
+    reader = pypdf.PdfReader(pdf_path, strict=True)
+    images = [page['/Resources']['/XObject']['/image'].get_object() for page in reader.pages]
+    return [(image['/Filter'], image['/ColorSpace']) for image in images]
+
+
+def test_compact_encodes_each_page_to_its_content(tmp_path):
+    if not features.check('libtiff'):
+        pytest.skip("Group 4 encoding needs Pillow with libtiff")
+    folder = tmp_path / "book"
+    folder.mkdir()
+    size = (FRAME_BOX[2] - FRAME_BOX[0], FRAME_BOX[3] - FRAME_BOX[1])
+    frames = [synthetic.make_frame(size, seed=1),
+              synthetic.make_photo_frame(size, seed=2),
+              synthetic.make_photo_frame(size, seed=3, color=False)]
+    for number, frame in enumerate(frames):
+        screenshot_with(frame, number).save(folder / f"pages_{2 * number + 1:03d}-{2 * number + 2:03d}.png")
+    output_dir = str(tmp_path / "output")
+    os.makedirs(output_dir)
+    pdf_path = str(tmp_path / "book.pdf")
+
+    result = extract_book(list_screenshots(str(folder)), FRAME_BOX, output_dir, pdf_path, compact=True)
+
+    assert result['pages'] == 3
+    assert page_images(pdf_path) == [('/CCITTFaxDecode', '/DeviceGray'),
+                                     ('/DCTDecode', '/DeviceRGB'),
+                                     ('/DCTDecode', '/DeviceGray')]
+
+
+def test_without_compact_every_page_is_rgb_jpeg(tmp_path):
+    folder = str(tmp_path / "book")
+    synthetic.write_screenshots(folder, 2, size=(960, 600), frame_box=FRAME_BOX)
+    output_dir = str(tmp_path / "output")
+    os.makedirs(output_dir)
+    pdf_path = str(tmp_path / "book.pdf")
+
+    extract_book(list_screenshots(folder), FRAME_BOX, output_dir, pdf_path)
+
+    assert page_images(pdf_path) == [('/DCTDecode', '/DeviceRGB')] * 2
@@ -0,0 +1,125 @@
+"""Interrupted and resumed captures (session.py, capture.py --resume)"""
+
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import backends
+import capture
+import synthetic
+from capture import capture_pages
+from pagehash import dhash
+from session import CaptureSession, spread_filename
+from simulate import SimulatedReader
+
+SPREADS = 5
+FRAME_BOX = (100, 30, 940, 580)
+
+
+def replay_folder(tmp_path):
+    """Screenshots of a book to play back, one distinct spread per file"""
+    return synthetic.write_screenshots(str(tmp_path / "replay"), SPREADS, size=(960, 600), frame_box=FRAME_BOX)
+
+
+def run_capture(*args):
+    capture.main(['--backend', 'replay', '--start-delay', '0', *args])
+
+
+def test_resume_recaptures_missing_and_partial_spreads(tmp_path, monkeypatch):
+    replay = replay_folder(tmp_path)
+    output_dir = str(tmp_path / "captures")
+    replay_args = ['--replay-dir', os.path.dirname(replay[0]), '--output-dir', output_dir]
+
+    # Stop the capture (as Ctrl+C does) while turning from spread 3 to spread 4
+    press = backends.ReplayBackend.press
+
+    def interrupting_press(self, key):
+        if self.index == 2:
+            raise KeyboardInterrupt
+        press(self, key)
+
+    monkeypatch.setattr(backends.ReplayBackend, 'press', interrupting_press)
+    run_capture('--pages', str(SPREADS * 2), *replay_args)
+    monkeypatch.setattr(backends.ReplayBackend, 'press', press)
+
+    folder = os.path.join(output_dir, os.listdir(output_dir)[0])
+    session = CaptureSession.load(folder)
+    assert not session.finished
+    assert session.next_spread() == 4
+
+    # A killed save may leave a spread's file cut short: it is captured again
+    third = os.path.join(folder, spread_filename(3, SPREADS * 2))
+    with open(third, 'r+b') as f:
+        f.truncate(os.path.getsize(third) // 2)
+    assert session.next_spread() == 3
+
+    run_capture('--resume', folder, *replay_args)
+
+    session = CaptureSession.load(folder)
+    assert session.finished
+    assert session.next_spread() == SPREADS + 1
+    for spread, source in enumerate(replay, 1):
+        with Image.open(os.path.join(folder, spread_filename(spread, SPREADS * 2))) as captured, \
+                Image.open(source) as expected:
+            assert np.array_equal(np.asarray(captured.convert('RGB')), np.asarray(expected.convert('RGB')))
+
+
+def test_empty_screenshot_is_not_complete(tmp_path):
+    session = CaptureSession(str(tmp_path), 4, {})
+    session.record(1, 0)
+    synthetic.make_frame((800, 500)).save(str(tmp_path / spread_filename(1, 4)))
+    session.record(2, 1)
+    open(tmp_path / spread_filename(2, 4), 'wb').close()
+
+    assert session.next_spread() == 2
+
+
+def book_session(folder, pages, recorded, saved):
+    """Session of a capture killed with spreads recorded up to `recorded` but saved only up to `saved`"""
+    total_pages = len(pages) * 2
+    session = CaptureSession(folder, total_pages, {})
+    for spread, page in enumerate(pages[:recorded], 1):
+        session.hashes[spread] = dhash(page)
+        if spread <= saved:
+            page.save(os.path.join(folder, spread_filename(spread, total_pages)))
+    session.save()
+    return session
+
+
+@pytest.mark.parametrize('shown', [2, 3, 4, 6])
+def test_resume_finds_the_book_ahead_of_the_first_missing_spread(tmp_path, shown):
+    pages = [synthetic.make_screenshot(size=(960, 600), frame_box=FRAME_BOX, seed=seed) for seed in range(8)]
+    session = book_session(str(tmp_path), pages, recorded=5, saved=2)
+    first_spread = session.next_spread()
+    assert first_spread == 3
+    reader = SimulatedReader(pages)
+    reader.index = shown - 1
+
+    capture_pages(str(tmp_path), session.total_pages, session.iterations, grab=reader.grab,
+                  press_key=reader.press, sleep=reader.sleep, clock=reader.clock,
+                  session=session, first_spread=first_spread)
+
+    assert session.finished
+    for spread, page in enumerate(pages, 1):
+        with Image.open(tmp_path / spread_filename(spread, session.total_pages)) as screenshot:
+            assert np.array_equal(np.asarray(screenshot.convert('RGB')), np.asarray(page.convert('RGB')))
+
+
+def test_resume_refuses_a_book_it_cannot_find(tmp_path, capsys):
+    pages = [synthetic.make_screenshot(size=(960, 600), frame_box=FRAME_BOX, seed=seed) for seed in range(8)]
+    session = book_session(str(tmp_path), pages, recorded=5, saved=2)
+    other_book = [synthetic.make_screenshot(size=(960, 600), frame_box=FRAME_BOX, seed=seed)
+                  for seed in range(20, 23)]
+    reader = SimulatedReader(other_book)
+    reader.index = 2
+
+    captured = capture_pages(str(tmp_path), session.total_pages, session.iterations, grab=reader.grab,
+                             press_key=reader.press, sleep=reader.sleep, clock=reader.clock,
+                             session=session, first_spread=session.next_spread())
+
+    assert captured == 0
+    assert not session.finished
+    assert not (tmp_path / spread_filename(3, session.total_pages)).exists()
+    assert "Not resuming" in capsys.readouterr().out
@@ -0,0 +1,61 @@
+"""Splitting spreads into single pages at the gutter (spread.py)"""
+
+import pytest
+from PIL import Image
+
+import synthetic
+from spread import PROFILE_SCALE, _ink_blocks, find_gutter, parse_page_range, split_spread
+
+
+def gutter_of(size):
+    """Middle of the gap between the two pages synthetic.make_frame draws"""
+    width = size[0]
+    margin = width // 40
+    page_width = (width - 3 * margin) // 2
+    return margin + page_width + margin // 2
+
+
+@pytest.mark.parametrize('size', [(800, 500), (1680, 1100), (2400, 1500)])
+def test_gutter_is_found_between_the_pages(size):
+    spread = synthetic.make_frame(size, seed=1)
+
+    gutter = find_gutter(_ink_blocks(spread, PROFILE_SCALE))
+
+    assert gutter is not None
+    assert abs(gutter * PROFILE_SCALE - gutter_of(size)) <= 2 * PROFILE_SCALE
+
+
+def test_spread_is_split_into_two_trimmed_pages():
+    size = (1680, 1100)
+    spread = synthetic.make_frame(size, seed=2)
+
+    pages = split_spread(spread, *parse_page_range("pages_007-008.png"))
+
+    assert [number for number, _ in pages] == [7, 8]
+    for _, page in pages:
+        # Each half holds one page, trimmed to its text
+        assert page.width < gutter_of(size)
+        assert page.height < size[1]
+    left, right = pages[0][1], pages[1][1]
+    assert abs(left.width - right.width) <= 2 * PROFILE_SCALE
+
+
+def test_single_last_page_drops_the_empty_half():
+    size = (1680, 1100)
+    spread = synthetic.make_frame(size, seed=3)
+    # Blank out the right page, as on the last screenshot of a book with an odd page count
+    spread.paste((255, 255, 255), (gutter_of(size), 0, size[0], size[1]))
+
+    pages = split_spread(spread, *parse_page_range("pages_321-321.png"))
+
+    assert len(pages) == 1
+    assert pages[0][0] == 321
+
+
+def test_picture_without_gutter_stays_one_page():
+    photo = Image.new('RGB', (1680, 1100), (40, 40, 40))
+
+    pages = split_spread(photo, 9, 10)
+
+    assert len(pages) == 1
+    assert pages[0][1].size == photo.size
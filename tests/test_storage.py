@@ -0,0 +1,141 @@
+"""Lossless recompression and archiving of screenshot folders (storage.py)"""
+
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import synthetic
+from manifest import Manifest
+from process import extract_book, get_output_dir
+from raw_store import RAW_STORE_NAME, RawStore, list_screenshots
+from storage import archive_screenshots, png_to_raw, recompress_png, shrink_book, unpack_screenshots
+
+
+def pixels(path):
+    with Image.open(path) as img:
+        return np.asarray(img.convert('RGBA'))
+
+
+def save_uncompressed(img, path):
+    """Save without compression, so recompressing always makes the file smaller"""
+    img.save(path, 'PNG', compress_level=0)
+    return path
+
+
+def colored_page(seed):
+    """Text page with a few colored blocks: more than gray, but far fewer than 256 colors"""
+    img = synthetic.make_frame((800, 500), seed=seed)
+    img.paste((200, 40, 40), (100, 100, 250, 180))
+    img.paste((40, 90, 200), (500, 300, 700, 420))
+    return img
+
+
+def gradient(mode):
+    """Smooth image with far more than 256 colors"""
+    x = np.linspace(0, 255, 300, dtype=np.uint8)
+    rgb = np.stack(np.broadcast_arrays(x[None, :], x[:, None], x[::-1, None]), axis=2)
+    img = Image.fromarray(np.ascontiguousarray(rgb), 'RGB')
+    return img.convert(mode) if mode != 'RGB' else img
+
+
+@pytest.mark.parametrize('name,img,mode', [
+    ('rgb_text', synthetic.make_frame((800, 500), seed=1), 'L'),
+    ('rgb_colored', colored_page(1), 'P'),
+    ('rgb_gray', synthetic.make_frame((800, 500), seed=2).convert('L').convert('RGB'), 'L'),
+    ('gray', synthetic.make_frame((800, 500), seed=3).convert('L'), 'L'),
+    ('rgba_opaque', colored_page(4).convert('RGBA'), 'P'),
+    ('palette', colored_page(5).convert('P'), 'P'),
+])
+def test_recompress_keeps_every_pixel(tmp_path, name, img, mode):
+    path = save_uncompressed(img, str(tmp_path / f"{name}.png"))
+    before = pixels(path)
+
+    _, size_before, size_after, old_digest, new_digest = recompress_png(path)
+
+    assert size_after < size_before
+    assert old_digest != new_digest
+    assert np.array_equal(pixels(path), before)
+    with Image.open(path) as result:
+        assert result.mode == mode
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_recompress_keeps_transparency(tmp_path):
+    img = synthetic.make_frame((800, 500), seed=6).convert('RGBA')
+    img.putalpha(128)
+    path = save_uncompressed(img, str(tmp_path / "alpha.png"))
+    before = pixels(path)
+
+    recompress_png(path)
+
+    assert np.array_equal(pixels(path), before)
+
+
+def test_recompress_keeps_images_with_many_colors(tmp_path):
+    path = save_uncompressed(gradient('RGB'), str(tmp_path / "photo.png"))
+    before = pixels(path)
+
+    recompress_png(path)
+
+    with Image.open(path) as result:
+        assert result.mode == 'RGB'
+    assert np.array_equal(pixels(path), before)
+
+
+def test_recompress_leaves_compact_file_alone(tmp_path):
+    path = str(tmp_path / "compact.png")
+    synthetic.make_frame((800, 500), seed=7).convert('L').save(path, 'PNG', optimize=True)
+    recompress_png(path)
+
+    _, size_before, size_after, old_digest, new_digest = recompress_png(path)
+
+    assert size_after == size_before
+    assert old_digest is None and new_digest is None
+
+
+def test_archive_round_trip(tmp_path):
+    folder = tmp_path / "book_20250101_000000"
+    paths = synthetic.write_screenshots(str(folder), 3, size=(960, 600), frame_box=(100, 30, 940, 580))
+    originals = {os.path.basename(path): open(path, 'rb').read() for path in paths}
+
+    archive_path = archive_screenshots(str(folder))
+    assert os.path.exists(archive_path)
+    assert not any(name.endswith('.png') for name in os.listdir(folder))
+
+    assert unpack_screenshots(str(folder)) == len(originals)
+    assert not os.path.exists(archive_path)
+    for name, data in originals.items():
+        assert (folder / name).read_bytes() == data
+
+
+def test_recompressed_book_moves_to_raw_store(tmp_path, monkeypatch):
+    # Frame folders live under ~/Documents/ebook_suite
+    monkeypatch.setenv('HOME', str(tmp_path))
+    frame_box = (100, 30, 940, 580)
+    folder = str(tmp_path / "book_20250101_000000")
+    paths = synthetic.write_screenshots(folder, 3, size=(960, 600), frame_box=frame_box)
+    originals = {os.path.basename(path): pixels(path) for path in paths}
+    output_dir = get_output_dir(folder)
+    os.makedirs(output_dir)
+    extract_book(list_screenshots(folder), frame_box, output_dir, str(tmp_path / "book.pdf"))
+
+    shrink_book(folder)
+    for path in paths:
+        with Image.open(path) as img:
+            assert img.mode == 'P'
+
+    assert png_to_raw(folder) == 3
+    assert not any(name.endswith('.png') for name in os.listdir(folder))
+
+    store = RawStore(os.path.join(folder, RAW_STORE_NAME))
+    manifest = Manifest(output_dir)
+    for name, before in originals.items():
+        assert store.mode == 'RGB'
+        assert np.array_equal(np.asarray(store.image(name).convert('RGBA')), before)
+        # The processing results of the PNGs stay valid for the stored screenshots
+        assert manifest.entries[name]['hash'] == store.digest(name)
+
+    result = extract_book(list_screenshots(folder), frame_box, output_dir, str(tmp_path / "book.pdf"))
+    assert result['reused'] == 3